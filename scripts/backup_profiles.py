@@ -0,0 +1,53 @@
+"""Incremental candidate profile backups.
+
+Usage:
+    python scripts/backup_profiles.py run
+    python scripts/backup_profiles.py rebuild snapshot.ndjson.gz [--include-deleted]
+"""
+import argparse
+import sys
+import os
+
+invocation_dir = os.getcwd()
+
+# Add backend to path
+backend_path = os.path.join(os.path.dirname(__file__), '..', 'services', 'backend')
+sys.path.insert(0, backend_path)
+os.chdir(backend_path)
+
+from src.v1.db.base import SessionLocal
+from src.v1.services.backup_service import get_backup_transport, rebuild_snapshot, run_backup
+
+
+def backup():
+    """Back up profiles changed since the last run."""
+    db = SessionLocal()
+    try:
+        segment = run_backup(db, get_backup_transport())
+    finally:
+        db.close()
+    if segment is None:
+        print("No changes since the last backup")
+    else:
+        print(f"Uploaded {segment.name}: {segment.profile_count} profiles, {segment.size} bytes")
+
+
+def rebuild(output, include_deleted):
+    """Rebuild a full snapshot from all uploaded segments."""
+    count = rebuild_snapshot(get_backup_transport(), os.path.join(invocation_dir, output), include_deleted)
+    print(f"Wrote {count} profiles to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("run", help="Back up changed profiles")
+    rebuild_parser = commands.add_parser("rebuild", help="Rebuild a full snapshot by replaying segments")
+    rebuild_parser.add_argument("output")
+    rebuild_parser.add_argument("--include-deleted", action="store_true")
+    args = parser.parse_args()
+    
+    if args.command == "run":
+        backup()
+    else:
+        rebuild(args.output, args.include_deleted)
@@ -0,0 +1,408 @@
+"""Point-in-time logical snapshot and restore of the ATS database (PostgreSQL).
+
+Usage:
+    python scripts/db_snapshot.py snapshot ats.snapshot.tar [--jobs 4]
+    python scripts/db_snapshot.py restore ats.snapshot.tar [--jobs 4] [--clean]
+    python scripts/db_snapshot.py verify ats.snapshot.tar
+
+snapshot  Dumps every table with parallel COPY streams that share one exported
+          transaction snapshot, so the archive is consistent as of a single
+          point in time. Each table is a gzip member of a tar archive; the
+          manifest records dependency order, row counts and SHA-256 checksums.
+restore   Creates the schema without secondary indexes and foreign keys, loads
+          all tables in parallel, then builds the indexes (in parallel) and
+          foreign keys and resets sequences. Checksums are verified while
+          loading; a mismatching table is rolled back and the restore fails.
+verify    Compares row counts and content hashes of a live database against
+          an archive (run it after a restore drill).
+
+All commands use DATABASE_URL unless --database-url is given.
+"""
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import sys
+import tarfile
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add backend to path
+invocation_dir = os.getcwd()
+backend_path = os.path.join(os.path.dirname(__file__), '..', 'services', 'backend')
+sys.path.insert(0, backend_path)
+os.chdir(backend_path)
+
+import psycopg2
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.schema import AddConstraint, CreateIndex
+
+from src.v1.config import settings
+from src.v1.db.base import Base
+import src.v1.models  # noqa: F401  (registers every table on Base.metadata)
+
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+ALEMBIC_TABLE = "alembic_version"
+SESSION_SETUP = "SET TIME ZONE 'UTC'; SET datestyle = 'ISO, YMD'"
+
+
+class SnapshotError(Exception):
+    """Raised when an archive is corrupt or does not match the database."""
+
+
+class HashingWriter(io.RawIOBase):
+    """File-like COPY sink that hashes and counts rows before passing data on."""
+
+    def __init__(self, target=None):
+        self.target = target
+        self.sha256 = hashlib.sha256()
+        self.rows = 0
+        self.bytes = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.sha256.update(data)
+        self.rows += data.count(b"\n")  # COPY text format escapes embedded newlines
+        self.bytes += len(data)
+        if self.target is not None:
+            self.target.write(data)
+        return len(data)
+
+
+class HashingReader(io.RawIOBase):
+    """File-like COPY source that hashes and counts rows as they are read."""
+
+    def __init__(self, source):
+        self.source = source
+        self.sha256 = hashlib.sha256()
+        self.rows = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.source.read(size)
+        self.sha256.update(data)
+        self.rows += data.count(b"\n")
+        return data
+
+    def readline(self, size: int = -1) -> bytes:
+        data = self.source.readline(size)
+        self.sha256.update(data)
+        self.rows += data.count(b"\n")
+        return data
+
+
+def libpq_dsn(database_url: str) -> str:
+    """Turn a SQLAlchemy URL into a libpq connection URI."""
+    url = make_url(database_url)
+    if url.get_backend_name() != "postgresql":
+        raise SnapshotError("Snapshots use COPY and require a PostgreSQL database")
+    return url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def connect(dsn: str):
+    connection = psycopg2.connect(dsn)
+    with connection.cursor() as cursor:
+        cursor.execute(SESSION_SETUP)
+    connection.commit()
+    return connection
+
+
+def quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def table_specs(dsn: str) -> list[dict]:
+    """Tables to dump in dependency order, with their columns and ordering key."""
+    specs = [
+        {
+            "name": table.name,
+            "columns": [column.name for column in table.columns],
+            "order_by": [column.name for column in table.primary_key.columns] or [column.name for column in table.columns],
+        }
+        for table in Base.metadata.sorted_tables
+    ]
+    engine = create_engine(make_url(dsn))
+    try:
+        if inspect(engine).has_table(ALEMBIC_TABLE):
+            specs.append({"name": ALEMBIC_TABLE, "columns": ["version_num"], "order_by": ["version_num"]})
+    finally:
+        engine.dispose()
+    return specs
+
+
+def copy_out_sql(spec: dict) -> str:
+    """COPY statement producing a table's rows in a stable order, so hashes are comparable."""
+    columns = ", ".join(quote(column) for column in spec["columns"])
+    order_by = ", ".join(quote(column) for column in spec["order_by"])
+    return f"COPY (SELECT {columns} FROM {quote(spec['name'])} ORDER BY {order_by}) TO STDOUT"
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Snapshot
+
+def dump_table(dsn: str, snapshot_id: str, spec: dict, staging: str) -> dict:
+    """Dump one table inside the shared snapshot to a gzip file."""
+    path = os.path.join(staging, f"{spec['name']}.copy.gz")
+    connection = connect(dsn)
+    try:
+        connection.set_session(isolation_level="REPEATABLE READ", readonly=True)
+        with connection.cursor() as cursor, gzip.open(path, "wb", compresslevel=6) as target:
+            cursor.execute("SET TRANSACTION SNAPSHOT %s", (snapshot_id,))
+            sink = HashingWriter(target)
+            cursor.copy_expert(copy_out_sql(spec), sink)
+        connection.rollback()
+    finally:
+        connection.close()
+    return {
+        **spec,
+        "file": f"tables/{spec['name']}.copy.gz",
+        "rows": sink.rows,
+        "bytes": sink.bytes,
+        "sha256": sink.sha256.hexdigest(),
+        "file_sha256": file_sha256(path),
+    }
+
+
+def snapshot(archive: str, database_url: str, jobs: int) -> None:
+    dsn = libpq_dsn(database_url)
+    specs = table_specs(dsn)
+    started = time.monotonic()
+
+    # The coordinator holds the exported snapshot open until every table is dumped
+    coordinator = connect(dsn)
+    coordinator.set_session(isolation_level="REPEATABLE READ", readonly=True)
+    with coordinator.cursor() as cursor:
+        cursor.execute("SELECT pg_export_snapshot(), now()")
+        snapshot_id, taken_at = cursor.fetchone()
+        alembic_revision = None
+        if any(spec["name"] == ALEMBIC_TABLE for spec in specs):
+            cursor.execute(f"SELECT max(version_num) FROM {ALEMBIC_TABLE}")
+            alembic_revision = cursor.fetchone()[0]
+
+    try:
+        with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(archive))) as staging:
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                tables = list(pool.map(lambda spec: dump_table(dsn, snapshot_id, spec, staging), specs))
+            coordinator.rollback()
+
+            manifest = {
+                "format": FORMAT_VERSION,
+                "taken_at": taken_at.isoformat(),
+                "alembic_revision": alembic_revision,
+                "tables": tables,
+            }
+            with tarfile.open(archive, "w") as tar:
+                data = json.dumps(manifest, indent=2).encode("utf-8")
+                info = tarfile.TarInfo(MANIFEST)
+                info.size = len(data)
+                info.mtime = int(time.time())
+                tar.addfile(info, io.BytesIO(data))
+                for table in tables:
+                    tar.add(os.path.join(staging, os.path.basename(table["file"])), arcname=table["file"])
+    finally:
+        coordinator.close()
+
+    rows = sum(table["rows"] for table in tables)
+    print(f"Snapshot of {len(tables)} tables ({rows} rows) as of {taken_at.isoformat()} "
+          f"written to {archive} in {time.monotonic() - started:.1f}s")
+
+
+def read_manifest(archive: str) -> dict:
+    with tarfile.open(archive, "r") as tar:
+        manifest = json.load(tar.extractfile(MANIFEST))
+    if manifest.get("format") != FORMAT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot format {manifest.get('format')!r}")
+    return manifest
+
+
+# Restore
+
+def load_table(dsn: str, archive: str, table: dict) -> None:
+    """Load one table from the archive, verifying both checksums before commit."""
+    columns = ", ".join(quote(column) for column in table["columns"])
+    connection = connect(dsn)
+    try:
+        with tarfile.open(archive, "r") as tar, connection.cursor() as cursor:
+            raw = HashingReader(tar.extractfile(table["file"]))
+            source = HashingReader(gzip.GzipFile(fileobj=raw))
+            cursor.execute("SET synchronous_commit = off")
+            cursor.copy_expert(f"COPY {quote(table['name'])} ({columns}) FROM STDIN", source)
+            raw.read()  # hash any trailing bytes of the member
+            if raw.sha256.hexdigest() != table["file_sha256"] or source.sha256.hexdigest() != table["sha256"]:
+                raise SnapshotError(f"Checksum mismatch in {table['file']}")
+            if source.rows != table["rows"]:
+                raise SnapshotError(f"{table['name']}: expected {table['rows']} rows, read {source.rows}")
+        connection.commit()
+    except psycopg2.Error as exc:
+        connection.rollback()
+        raise SnapshotError(f"Loading {table['name']} failed: {exc}".strip()) from exc
+    except BaseException:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+
+def run_statements(dsn: str, statements: list[str]) -> None:
+    connection = connect(dsn)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SET maintenance_work_mem = '256MB'")
+            for statement in statements:
+                cursor.execute(statement)
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def restore(archive: str, database_url: str, jobs: int, clean: bool) -> None:
+    manifest = read_manifest(archive)
+    dsn = libpq_dsn(database_url)
+    engine = create_engine(make_url(dsn))
+    started = time.monotonic()
+    try:
+        existing = set(inspect(engine).get_table_names()) & (set(Base.metadata.tables) | {ALEMBIC_TABLE})
+        if existing and not clean:
+            raise SnapshotError(f"Target database is not empty ({len(existing)} ATS tables); use --clean")
+        if clean:
+            Base.metadata.drop_all(engine)
+            with engine.begin() as connection:
+                connection.exec_driver_sql(f"DROP TABLE IF EXISTS {ALEMBIC_TABLE}")
+
+        # Tables with primary keys and unique constraints only; secondary
+        # indexes and foreign keys are created after the bulk load.
+        Base.metadata.create_all(engine)
+        inspector = inspect(engine)
+        deferred_indexes = {}
+        with engine.begin() as connection:
+            for table in Base.metadata.sorted_tables:
+                for foreign_key in inspector.get_foreign_keys(table.name):
+                    connection.exec_driver_sql(
+                        f"ALTER TABLE {quote(table.name)} DROP CONSTRAINT {quote(foreign_key['name'])}"
+                    )
+                for index in table.indexes:
+                    connection.exec_driver_sql(f"DROP INDEX {quote(index.name)}")
+                deferred_indexes[table.name] = [
+                    str(CreateIndex(index).compile(dialect=engine.dialect)) for index in table.indexes
+                ]
+            if any(table["name"] == ALEMBIC_TABLE for table in manifest["tables"]):
+                connection.exec_driver_sql(
+                    f"CREATE TABLE {ALEMBIC_TABLE} (version_num VARCHAR(32) NOT NULL PRIMARY KEY)"
+                )
+        foreign_keys = [
+            str(AddConstraint(constraint).compile(dialect=engine.dialect))
+            for table in Base.metadata.sorted_tables
+            for constraint in table.foreign_key_constraints
+        ]
+
+        # Largest tables first keeps the workers evenly busy
+        tables = sorted(manifest["tables"], key=lambda table: table["bytes"], reverse=True)
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            for future in [pool.submit(load_table, dsn, archive, table) for table in tables]:
+                future.result()
+        loaded = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            for future in [
+                pool.submit(run_statements, dsn, statements)
+                for statements in deferred_indexes.values() if statements
+            ]:
+                future.result()
+        run_statements(dsn, foreign_keys)
+
+        sequences = []
+        for table in Base.metadata.sorted_tables:
+            key = table.autoincrement_column
+            if key is not None:
+                sequences.append(
+                    f"SELECT setval(pg_get_serial_sequence('{table.name}', '{key.name}'), "
+                    f"COALESCE(MAX({quote(key.name)}), 1), MAX({quote(key.name)}) IS NOT NULL) "
+                    f"FROM {quote(table.name)}"
+                )
+        run_statements(dsn, sequences + ["ANALYZE"])
+    finally:
+        engine.dispose()
+
+    rows = sum(table["rows"] for table in manifest["tables"])
+    print(f"Restored {len(manifest['tables'])} tables ({rows} rows) as of {manifest['taken_at']}: "
+          f"load {loaded - started:.1f}s, indexes and constraints {time.monotonic() - loaded:.1f}s")
+
+
+# Verify
+
+def hash_table(dsn: str, spec: dict) -> tuple[int, str]:
+    connection = connect(dsn)
+    try:
+        connection.set_session(readonly=True)
+        with connection.cursor() as cursor:
+            sink = HashingWriter()
+            cursor.copy_expert(copy_out_sql(spec), sink)
+        connection.rollback()
+    finally:
+        connection.close()
+    return sink.rows, sink.sha256.hexdigest()
+
+
+def verify(archive: str, database_url: str, jobs: int) -> bool:
+    manifest = read_manifest(archive)
+    dsn = libpq_dsn(database_url)
+    ok = True
+
+    with tarfile.open(archive, "r") as tar:
+        for table in manifest["tables"]:
+            digest = hashlib.sha256()
+            member = tar.extractfile(table["file"])
+            while chunk := member.read(1024 * 1024):
+                digest.update(chunk)
+            if digest.hexdigest() != table["file_sha256"]:
+                print(f"CORRUPT   {table['file']}")
+                ok = False
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        live = list(pool.map(lambda table: hash_table(dsn, table), manifest["tables"]))
+    for table, (rows, sha256) in zip(manifest["tables"], live):
+        if rows == table["rows"] and sha256 == table["sha256"]:
+            print(f"OK        {table['name']} ({rows} rows)")
+        else:
+            ok = False
+            print(f"MISMATCH  {table['name']}: archive {table['rows']} rows, database {rows} rows"
+                  + ("" if rows != table["rows"] else ", content differs"))
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["snapshot", "restore", "verify"])
+    parser.add_argument("archive")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--jobs", type=int, default=min(4, os.cpu_count() or 1), help="parallel COPY streams")
+    parser.add_argument("--clean", action="store_true", help="drop existing ATS tables before restoring")
+    args = parser.parse_args()
+    archive = os.path.join(invocation_dir, args.archive)
+
+    try:
+        if args.command == "snapshot":
+            snapshot(archive, args.database_url, args.jobs)
+        elif args.command == "restore":
+            restore(archive, args.database_url, args.jobs, args.clean)
+        elif not verify(archive, args.database_url, args.jobs):
+            sys.exit(1)
+    except SnapshotError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        sys.exit(1)
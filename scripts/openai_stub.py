@@ -0,0 +1,72 @@
+"""Local stand-in for the OpenAI chat completions API used by resume extraction.
+
+Answers each resume of a request with the heuristic parser, reports usage as
+about four characters per token, and can be slowed down or made to fail to
+exercise the timeout and fallback paths.
+
+Usage:
+    python scripts/openai_stub.py [--port 8090] [--delay 0.5] [--fail-rate 0.1]
+
+Then run the backend with AI_EXTRACTION_ENABLED=true and
+OPENAI_BASE_URL=http://localhost:8090/v1.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import os
+
+# Add backend to path
+backend_path = os.path.join(os.path.dirname(__file__), '..', 'services', 'backend')
+sys.path.insert(0, backend_path)
+os.chdir(backend_path)
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+
+from src.v1.core.resume_parser import parse_text
+
+
+def create_app(delay: float = 0.0, fail_rate: float = 0.0) -> FastAPI:
+    """The stub application; ``delay`` seconds per request, ``fail_rate`` of requests answered with 500."""
+    app = FastAPI(title="OpenAI stub")
+    app.state.requests = 0
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        app.state.requests += 1
+        body = await request.json()
+        if delay:
+            await asyncio.sleep(delay)
+        if random.random() < fail_rate:
+            raise HTTPException(status_code=500, detail="Stub failure")
+
+        messages = body["messages"]
+        resumes = json.loads(messages[-1]["content"])["resumes"]
+        answers = [{"index": resume["index"], "location": None, **parse_text(resume["text"])} for resume in resumes]
+        content = json.dumps({"resumes": answers})
+        prompt_tokens = sum(len(message["content"]) for message in messages) // 4
+        completion_tokens = len(content) // 4
+        return {
+            "object": "chat.completion",
+            "model": body.get("model"),
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds before each answer")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of requests answered with 500")
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(args.delay, args.fail_rate), host="0.0.0.0", port=args.port)
@@ -0,0 +1,109 @@
+"""Local SMTP sink for the email dispatcher.
+
+Accepts every message and writes it to a directory as an ``.eml`` file, so
+outbox delivery can be exercised without a mail provider. Sessions stay open
+across messages like a real server's. ``--fail-rate`` answers that share of
+messages with a temporary 451 to exercise retries; recipients in
+``--reject-domain`` get a permanent 550.
+
+Usage:
+    python scripts/smtp_sink.py [--port 1025] [--directory mail] [--fail-rate 0.1] [--reject-domain bounce.example.com]
+
+Then run the backend with EMAIL_ENABLED=true, EMAIL_SERVICE=smtp and
+SMTP_PORT=1025.
+"""
+import argparse
+import asyncio
+import os
+import random
+import uuid
+from typing import Optional
+
+
+class SMTPSink:
+    """A minimal SMTP server (HELO/EHLO, MAIL, RCPT, DATA, RSET, NOOP, QUIT)."""
+
+    def __init__(self, directory: str, fail_rate: float = 0.0, reject_domain: Optional[str] = None):
+        self.directory = directory
+        self.fail_rate = fail_rate
+        self.reject_domain = reject_domain
+        self.received = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        async def reply(line: str) -> None:
+            writer.write(f"{line}\r\n".encode())
+            await writer.drain()
+
+        await reply("220 smtp-sink ready")
+        recipients = []
+        try:
+            while line := await reader.readline():
+                command = line.decode(errors="replace").strip()
+                verb = command[:4].upper()
+                if verb == "EHLO":
+                    await reply("250-smtp-sink")
+                    await reply("250 8BITMIME")
+                elif verb == "HELO":
+                    await reply("250 smtp-sink")
+                elif verb == "MAIL":
+                    recipients = []
+                    await reply("250 OK")
+                elif verb == "RCPT":
+                    address = command.split(":", 1)[1].strip().strip("<>")
+                    if self.reject_domain and address.endswith("@" + self.reject_domain):
+                        await reply("550 No such user")
+                    else:
+                        recipients.append(address)
+                        await reply("250 OK")
+                elif verb == "DATA":
+                    if not recipients:
+                        await reply("503 No valid recipients")
+                        continue
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    data = []
+                    while (chunk := await reader.readline()) not in (b".\r\n", b".\n", b""):
+                        data.append(chunk[1:] if chunk.startswith(b"..") else chunk)
+                    if random.random() < self.fail_rate:
+                        await reply("451 Try again later")
+                    else:
+                        self.save(b"".join(data))
+                        await reply("250 OK")
+                    recipients = []
+                elif verb == "RSET":
+                    recipients = []
+                    await reply("250 OK")
+                elif verb == "NOOP":
+                    await reply("250 OK")
+                elif verb == "QUIT":
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("502 Command not implemented")
+        finally:
+            writer.close()
+
+    def save(self, message: bytes) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self.received += 1
+        path = os.path.join(self.directory, f"{self.received:06d}-{uuid.uuid4().hex[:8]}.eml")
+        with open(path, "wb") as file:
+            file.write(message)
+        print(f"Received {os.path.basename(path)}", flush=True)
+
+
+async def serve(port: int, sink: SMTPSink) -> None:
+    server = await asyncio.start_server(sink.handle, "0.0.0.0", port)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=1025)
+    parser.add_argument("--directory", default="mail", help="Where received messages are written")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of messages answered with 451")
+    parser.add_argument("--reject-domain", help="Recipient domain answered with 550")
+    args = parser.parse_args()
+
+    sink = SMTPSink(args.directory, args.fail_rate, args.reject_domain)
+    asyncio.run(serve(args.port, sink))
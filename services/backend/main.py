@@ -1,4 +1,5 @@
 """FastAPI application entry point."""
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
@@ -6,6 +7,11 @@ from contextlib import asynccontextmanager
 from src.v1.config import settings
 from src.v1.api import api_router
 from src.v1.db.base import engine, Base
+from src.v1.core.rate_limit import RateLimitMiddleware
+from src.v1.core.retention import run_retention_job
+from src.v1.core.scoring import run_scoring_job
+from src.v1.services.email_service import run_email_dispatcher
+from src.v1.services.preview_service import preview_cache
 
 
 @asynccontextmanager
@@ -14,9 +20,15 @@ async def lifespan(app: FastAPI):
     # Startup
     # Create tables (in production, use migrations)
     Base.metadata.create_all(bind=engine)
+    retention = asyncio.create_task(run_retention_job())
+    scoring = asyncio.create_task(run_scoring_job())
+    email = asyncio.create_task(run_email_dispatcher())
     yield
     # Shutdown
-    pass
+    retention.cancel()
+    scoring.cancel()
+    email.cancel()
+    preview_cache.shutdown()
 
 
 app = FastAPI(
@@ -26,6 +38,9 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Rate limiting (added before CORS so rejections still carry CORS headers)
+app.add_middleware(RateLimitMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -6,6 +6,9 @@ from .candidates import router as candidates_router
 from .interviews import router as interviews_router
 from .feedback import router as feedback_router
 from .health import router as health_router
+from .resumes import router as resumes_router
+from .audit import router as audit_router
+from .changes import router as changes_router
 
 api_router = APIRouter()
 
@@ -14,4 +17,7 @@ api_router.include_router(auth_router, prefix="/auth", tags=["authentication"])
 api_router.include_router(candidates_router, prefix="/candidates", tags=["candidates"])
 api_router.include_router(interviews_router, prefix="/interviews", tags=["interviews"])
 api_router.include_router(feedback_router, prefix="/feedback", tags=["feedback"])
+api_router.include_router(resumes_router, prefix="/resumes", tags=["resumes"])
+api_router.include_router(audit_router, prefix="/audit-logs", tags=["audit"])
+api_router.include_router(changes_router, prefix="/changes", tags=["changes"])
 
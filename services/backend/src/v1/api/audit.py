@@ -0,0 +1,100 @@
+"""Audit log endpoints."""
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import datetime
+
+from ..db.base import get_db
+from ..core.retention import search_archive
+from ..core.serialization import rows_to_dicts
+from ..models.audit_log import AuditLog
+from ..schemas.audit import AuditLogListResponse, AuditLogResponse
+from ..dependencies import get_admin_user, get_hr_user
+from ..models.user import User
+
+router = APIRouter()
+
+AUDIT_LOG_COLUMNS = [
+    getattr(AuditLog, name) for name in AuditLogResponse.model_fields if name != "archived"
+]
+
+# Resource types HR users may inspect; everything else is admin only
+HR_RESOURCE_TYPES = {"candidate", "interview"}
+
+
+async def search_audit_logs(
+    db: Session,
+    filters: dict,
+    since: Optional[datetime],
+    until: Optional[datetime],
+    include_archived: bool,
+    limit: int,
+) -> list[dict]:
+    """Search the hot table newest first, then archived entries once it runs out."""
+    filters = {key: value for key, value in filters.items() if value is not None}
+    
+    query = db.query(AuditLog).filter_by(**filters)
+    if since:
+        query = query.filter(AuditLog.created_at >= since)
+    if until:
+        query = query.filter(AuditLog.created_at <= until)
+    data = rows_to_dicts(
+        query.with_entities(*AUDIT_LOG_COLUMNS)
+        .order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+        .limit(limit)
+    )
+    for record in data:
+        record["archived"] = False
+    
+    if include_archived and len(data) < limit:
+        archived = await run_in_threadpool(
+            search_archive, db, AuditLog, filters, since, until, limit - len(data)
+        )
+        for record in archived:
+            record["archived"] = True
+        data.extend(archived)
+    
+    return data
+
+
+@router.get("", response_model=AuditLogListResponse)
+async def list_audit_logs(
+    user_id: Optional[int] = Query(None),
+    action: Optional[str] = Query(None),
+    resource_type: Optional[str] = Query(None),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    include_archived: bool = Query(True),
+    limit: int = Query(100, ge=1, le=500),
+    current_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Search audit logs, including archived entries (admin only)."""
+    filters = {"user_id": user_id, "action": action, "resource_type": resource_type}
+    data = await search_audit_logs(db, filters, since, until, include_archived, limit)
+    return ORJSONResponse({"data": data})
+
+
+@router.get("/{resource_type}/{resource_id}", response_model=AuditLogListResponse)
+async def get_resource_audit_logs(
+    resource_type: str,
+    resource_id: int,
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    include_archived: bool = Query(True),
+    limit: int = Query(100, ge=1, le=500),
+    current_user: User = Depends(get_hr_user),
+    db: Session = Depends(get_db)
+):
+    """Get the audit trail of one resource, including archived entries."""
+    if current_user.role != "admin" and resource_type not in HR_RESOURCE_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Insufficient permissions",
+        )
+    
+    filters = {"resource_type": resource_type, "resource_id": resource_id}
+    data = await search_audit_logs(db, filters, since, until, include_archived, limit)
+    return ORJSONResponse({"data": data})
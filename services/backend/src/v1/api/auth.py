@@ -1,29 +1,30 @@
 """Authentication endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
 
 from ..db.base import get_db
 from ..core.security import (
     verify_password,
-    get_password_hash,
     create_access_token,
-    create_refresh_token,
     decode_token,
     get_user_by_email,
 )
+from ..core.tokens import (
+    RefreshTokenReuseError,
+    issue_refresh_token,
+    revoke_user_tokens,
+    rotate_refresh_token,
+)
 from ..models.user import User
-from ..models.refresh_token import RefreshToken
 from ..schemas.auth import Token, LoginResponse
 from ..schemas.user import UserResponse
 from ..dependencies import get_current_user
-from ..config import settings
 
 router = APIRouter()
 
 
 @router.post("/login", response_model=LoginResponse)
-async def login(email: str, password: str, db: Session = Depends(get_db)):
+async def login(email: str, password: str, request: Request, db: Session = Depends(get_db)):
     """Login endpoint (OAuth will be added later)."""
     user = get_user_by_email(db, email)
     if not user or not user.password_hash or not verify_password(password, user.password_hash):
@@ -32,18 +33,14 @@ async def login(email: str, password: str, db: Session = Depends(get_db)):
             detail="Incorrect email or password",
         )
     
-    # Create tokens
+    # Create tokens (only the refresh token's hash is stored)
     access_token = create_access_token({"sub": str(user.id), "email": user.email, "role": user.role})
-    refresh_token = create_refresh_token({"sub": str(user.id)})
-    
-    # Store refresh token
-    expires_at = datetime.utcnow() + timedelta(days=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS)
-    db_refresh_token = RefreshToken(
-        user_id=user.id,
-        token=refresh_token,
-        expires_at=expires_at,
+    refresh_token, _ = issue_refresh_token(
+        db,
+        user,
+        ip_address=request.client.host if request.client else None,
+        user_agent=request.headers.get("user-agent"),
     )
-    db.add(db_refresh_token)
     db.commit()
     
     return {
@@ -55,8 +52,8 @@ async def login(email: str, password: str, db: Session = Depends(get_db)):
 
 
 @router.post("/refresh", response_model=Token)
-async def refresh_token(token: str, db: Session = Depends(get_db)):
-    """Refresh access token."""
+async def refresh_token(token: str, request: Request, db: Session = Depends(get_db)):
+    """Rotate a refresh token and issue a new access token."""
     payload = decode_token(token)
     if not payload or payload.get("type") != "refresh":
         raise HTTPException(
@@ -64,33 +61,36 @@ async def refresh_token(token: str, db: Session = Depends(get_db)):
             detail="Invalid refresh token",
         )
     
-    # Check if token exists and is not revoked
-    db_token = db.query(RefreshToken).filter(
-        RefreshToken.token == token,
-        RefreshToken.revoked == False,
-        RefreshToken.expires_at > datetime.utcnow()
-    ).first()
-    
-    
-    if not db_token:
+    try:
+        rotated = rotate_refresh_token(
+            db,
+            token,
+            ip_address=request.client.host if request.client else None,
+            user_agent=request.headers.get("user-agent"),
+        )
+    except RefreshTokenReuseError:
+        # Keep the revocation of the whole family, then refuse
+        db.commit()
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired refresh token",
+            detail="Refresh token reuse detected; all sessions have been revoked",
         )
     
-    user = db.query(User).filter(User.id == db_token.user_id).first()
-    if not user or not user.is_active:
+    if not rotated:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found or inactive",
+            detail="Invalid or expired refresh token",
         )
     
+    new_refresh_token, user = rotated
+    db.commit()
+    
     # Create new access token
     access_token = create_access_token({"sub": str(user.id), "email": user.email, "role": user.role})
     
     return {
         "access_token": access_token,
-        "refresh_token": token,
+        "refresh_token": new_refresh_token,
         "token_type": "bearer",
     }
 
@@ -102,10 +102,7 @@ async def logout(
 ):
     """Logout endpoint - revokes refresh tokens."""
     # Revoke all refresh tokens for user
-    db.query(RefreshToken).filter(
-        RefreshToken.user_id == current_user.id,
-        RefreshToken.revoked == False
-    ).update({"revoked": True, "revoked_at": datetime.utcnow()})
+    revoke_user_tokens(db, current_user.id)
     db.commit()
     
     return {"message": "Logged out successfully"}
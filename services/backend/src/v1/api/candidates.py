@@ -1,37 +1,83 @@
 """Candidate endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Request, status, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from multipart.exceptions import MultipartParseError
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, func
 from typing import Optional, List
+from dataclasses import asdict
+from datetime import datetime
 
-from ..db.base import get_db
-from ..models.candidate import Candidate, CandidateBucket, CandidateSkill
+from ..db.base import get_db, SessionLocal
+from ..db.upsert import insert_unless_exists
+from ..config import settings
+from ..core.associations import change_links, insert_links, linked_ids, replace_links
+from ..core.changes import record_changes
+from ..core.conditional import etag_headers, etag_matches, list_etag, resource_etag
+from ..core.export import (
+    EXPORT_MEDIA_TYPES,
+    EXPORT_WRITERS,
+    build_export_query,
+    iter_export_rows,
+)
+from ..core.serialization import CANDIDATE_RESPONSE_COLUMNS, candidate_rows_to_dicts
+from ..core.counting import count_rows
+from ..core.outbox import queue_upload_confirmation
+from ..core.scoring import InsufficientTrainingData, model_store, rescan_candidates, score_candidates, train_models
+from ..core.sorting import CANDIDATE_SORTS, UnsupportedSortKey
+from ..core.cache import CANDIDATES_TAG, INTERVIEWS_TAG, cache_scope, response_cache
+from ..core.transitions import transition_candidates
+from ..core.uploads import StreamingUploadParser, UploadRejected
+from ..services.extraction_service import ExtractionItem, resume_extractor
+from ..services.preview_service import preview_urls
+from ..services.storage_service import get_or_create_resume_file, replicate_to_drive, storage
+from ..models.candidate import Candidate, CandidateBucket
 from ..models.bucket import ResumeBucket
-from ..models.skill import Skill
 from ..schemas.candidate import (
     CandidateCreate,
     CandidateUpdate,
     CandidateResponse,
     CandidateListResponse,
+    CandidateAssociations,
+    CandidateAssociationsUpdate,
+    CandidateRejection,
+    CandidateStatusTransition,
+    CandidateTransitionResponse,
+    ScoringModelSummary,
 )
-from ..schemas.common import PaginationParams
-from ..dependencies import get_current_user, get_hr_user
+from ..schemas.common import PaginationParams, calculate_pagination
+from ..schemas.resume import BatchUploadResponse
+from ..dependencies import get_admin_user, get_current_user, get_hr_user
 from ..models.user import User
 
 router = APIRouter()
 
 
-def calculate_pagination(total: int, page: int, page_size: int) -> dict:
-    """Calculate pagination metadata."""
-    total_pages = (total + page_size - 1) // page_size
-    return {
-        "total": total,
-        "page": page,
-        "page_size": page_size,
-        "total_pages": total_pages,
-        "has_next": page < total_pages,
-        "has_prev": page > 1,
-    }
+def apply_candidate_filters(
+    query,
+    status_filter: Optional[str],
+    bucket_id: Optional[int],
+    search: Optional[str],
+):
+    """Apply the list filters shared by candidate listing and export."""
+    if status_filter:
+        query = query.filter(Candidate.status == status_filter)
+    
+    if bucket_id:
+        query = query.join(CandidateBucket).filter(CandidateBucket.bucket_id == bucket_id)
+    
+    if search:
+        search_term = f"%{search}%"
+        query = query.filter(
+            or_(
+                Candidate.name.ilike(search_term),
+                Candidate.email.ilike(search_term),
+                Candidate.remarks.ilike(search_term) if Candidate.remarks else False,
+            )
+        )
+    
+    return query
 
 
 @router.post("", response_model=CandidateResponse, status_code=status.HTTP_201_CREATED)
@@ -41,49 +87,203 @@ async def create_candidate(
     db: Session = Depends(get_db)
 ):
     """Create a new candidate."""
-    # Check if email already exists
-    existing = db.query(Candidate).filter(
-        Candidate.email == candidate_data.email,
-        Candidate.deleted_at == None
-    ).first()
-    if existing:
+    # A live candidate with the same email turns the insert into a no-op
+    candidate = insert_unless_exists(
+        db,
+        Candidate,
+        ["email"],
+        values={
+            **candidate_data.model_dump(exclude={"bucket_ids", "skill_ids"}),
+            "uploaded_by": current_user.id,
+        },
+        conflict_where=Candidate.deleted_at.is_(None),
+    )
+    if candidate is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Candidate with this email already exists",
         )
     
-    # Create candidate
-    candidate = Candidate(
-        **candidate_data.model_dump(exclude={"bucket_ids", "skill_ids"}),
-        uploaded_by=current_user.id,
+    response = CandidateResponse.model_validate(candidate)
+    response.bucket_ids = insert_links(db, candidate.id, "buckets", candidate_data.bucket_ids)
+    response.skill_ids = insert_links(db, candidate.id, "skills", candidate_data.skill_ids)
+    
+    # Score with the current model (a no-op until one is trained)
+    scores = score_candidates(db, [candidate.id])
+    if candidate.id in scores:
+        rating, predicted_salary = scores[candidate.id]
+        if rating is not None:
+            response.objective_rating = rating
+        response.predicted_salary = predicted_salary
+    
+    record_changes(db, "candidate", [candidate.id])
+    db.commit()
+    response_cache.invalidate(CANDIDATES_TAG)
+    
+    return response
+
+
+@router.post("/upload", response_model=BatchUploadResponse, status_code=status.HTTP_201_CREATED)
+async def upload_candidates(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_hr_user),
+    db: Session = Depends(get_db)
+):
+    """Batch upload resumes (multipart, optional ``bucket_id`` field).
+    
+    Files are streamed to storage as they arrive; the stored files are then
+    extracted together (model or heuristic parser) and a candidate is created
+    for each one with a name and a new email.
+    """
+    upload = StreamingUploadParser(
+        storage,
+        max_file_bytes=settings.MAX_FILE_SIZE_MB * 1024 * 1024,
+        max_files=settings.MAX_BATCH_SIZE,
+        allowed_types=set(settings.ALLOWED_FILE_TYPES.split(",")),
     )
-    db.add(candidate)
-    db.flush()
+    try:
+        await upload.parse(request.headers.get("content-type", ""), request.stream())
+    except UploadRejected as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.message)
+    except MultipartParseError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Malformed multipart body",
+        )
     
-    # Add buckets
-    if candidate_data.bucket_ids:
-        buckets = db.query(ResumeBucket).filter(ResumeBucket.id.in_(candidate_data.bucket_ids)).all()
-        for bucket in buckets:
-            db.add(CandidateBucket(candidate_id=candidate.id, bucket_id=bucket.id))
+    bucket_id = upload.fields.get("bucket_id")
+    if bucket_id is not None:
+        bucket = None
+        if bucket_id.isdigit():
+            bucket = db.query(ResumeBucket.id).filter(ResumeBucket.id == int(bucket_id)).first()
+        if not bucket:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Bucket not found",
+            )
     
-    # Add skills
-    if candidate_data.skill_ids:
-        skills = db.query(Skill).filter(Skill.id.in_(candidate_data.skill_ids)).all()
-        for skill in skills:
-            db.add(CandidateSkill(candidate_id=candidate.id, skill_id=skill.id))
+    resume_files = [
+        get_or_create_resume_file(db, uploaded.stored, uploaded.content_type, uploaded.filename)
+        for uploaded in upload.files
+    ]
+    extracted, extraction = await resume_extractor.extract([
+        ExtractionItem(resume_file.content_hash, uploaded.stored.path, uploaded.content_type)
+        for uploaded, resume_file in zip(upload.files, resume_files)
+    ])
     
-    db.commit()
-    db.refresh(candidate)
+    results = []
+    for uploaded, resume_file, parsed in zip(upload.files, resume_files, extracted):
+        candidate = None
+        if parsed["name"] and parsed["email"]:
+            candidate = insert_unless_exists(
+                db,
+                Candidate,
+                ["email"],
+                values={**parsed, "uploaded_by": current_user.id, "resume_file_id": resume_file.id},
+                conflict_where=Candidate.deleted_at.is_(None),
+            )
+            if candidate and bucket_id:
+                db.add(CandidateBucket(candidate_id=candidate.id, bucket_id=int(bucket_id)))
+        
+        if resume_file.drive_file_id is None:
+            background_tasks.add_task(replicate_to_drive, resume_file.id)
+        
+        results.append({
+            "filename": uploaded.filename,
+            "resume_file_id": resume_file.id,
+            "content_hash": resume_file.content_hash,
+            "size": resume_file.size,
+            "duplicate": not uploaded.stored.created,
+            "parsed": parsed,
+            "candidate_id": candidate.id if candidate else None,
+        })
     
-    # Get bucket and skill IDs
-    bucket_ids = [cb.bucket_id for cb in candidate.buckets]
-    skill_ids = [cs.skill_id for cs in candidate.skills]
+    db.flush()
+    score_candidates(db, [result["candidate_id"] for result in results if result["candidate_id"]])
+    queue_upload_confirmation(db, current_user, results)
+    record_changes(db, "candidate", [result["candidate_id"] for result in results if result["candidate_id"]])
+    db.commit()
+    response_cache.invalidate(CANDIDATES_TAG)
     
-    response = CandidateResponse.model_validate(candidate)
-    response.bucket_ids = bucket_ids
-    response.skill_ids = skill_ids
+    return {"data": results, "extraction": asdict(extraction)}
+
+
+def apply_transition(
+    db: Session,
+    request: Request,
+    current_user: User,
+    transition: CandidateStatusTransition,
+) -> dict:
+    """Apply a batch status transition, commit it and invalidate cached lists."""
+    result = transition_candidates(
+        db,
+        transition.candidate_ids,
+        transition.status,
+        current_user,
+        reason=transition.reason,
+        stage=transition.stage,
+        round_number=transition.round_number,
+        notes=transition.notes,
+        ip_address=request.client.host if request.client else None,
+        user_agent=request.headers.get("user-agent"),
+    )
+    record_changes(db, "candidate", result["updated"])
+    db.commit()
+    if result["updated"]:
+        response_cache.invalidate(CANDIDATES_TAG)
+    return result
+
+
+@router.post("/transitions", response_model=CandidateTransitionResponse)
+async def transition_candidate_status(
+    transition: CandidateStatusTransition,
+    request: Request,
+    current_user: User = Depends(get_hr_user),
+    db: Session = Depends(get_db)
+):
+    """Move a batch of candidates to a new status; disallowed moves are skipped and reported."""
+    return apply_transition(db, request, current_user, transition)
+
+
+@router.post("/reject", response_model=CandidateTransitionResponse)
+async def reject_candidates(
+    rejection: CandidateRejection,
+    request: Request,
+    current_user: User = Depends(get_hr_user),
+    db: Session = Depends(get_db)
+):
+    """Reject a batch of candidates, recording the stage and reason for each."""
+    transition = CandidateStatusTransition(**rejection.model_dump(), status="rejected")
+    return apply_transition(db, request, current_user, transition)
+
+
+@router.post("/scoring/train", response_model=ScoringModelSummary, status_code=status.HTTP_201_CREATED)
+async def train_scoring_models(
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Train a new version of the scoring models and rescore every candidate with it."""
+    try:
+        model = await run_in_threadpool(train_models, db)
+    except InsufficientTrainingData as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
     
-    return response
+    background_tasks.add_task(rescan_candidates)
+    return model.summary()
+
+
+@router.get("/scoring", response_model=ScoringModelSummary)
+async def get_scoring_model(current_user: User = Depends(get_hr_user)):
+    """Describe the current scoring model version."""
+    model = model_store.current()
+    if model is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No scoring model has been trained",
+        )
+    return model.summary()
 
 
 @router.get("", response_model=CandidateListResponse)
@@ -92,69 +292,121 @@ async def list_candidates(
     status_filter: Optional[str] = Query(None, alias="status"),
     bucket_id: Optional[int] = Query(None),
     search: Optional[str] = Query(None),
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """List candidates with pagination and filters."""
-    query = db.query(Candidate).filter(Candidate.deleted_at == None)
+    try:
+        ordering = CANDIDATE_SORTS.ordering(pagination.sort_by, pagination.sort_order)
+    except UnsupportedSortKey as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
     
-    # Apply filters
-    if status_filter:
-        query = query.filter(Candidate.status == status_filter)
+    params = {
+        **pagination.model_dump(),
+        "status": status_filter,
+        "bucket_id": bucket_id,
+        "search": search,
+    }
+    etag = list_etag(db, "candidates:list", params, cache_scope(current_user))
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
     
-    if bucket_id:
-        query = query.join(CandidateBucket).filter(CandidateBucket.bucket_id == bucket_id)
+    cache_key = response_cache.build_key(
+        "candidates:list",
+        params,
+        cache_scope(current_user),
+        [CANDIDATES_TAG],
+    )
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json", headers=etag_headers(etag))
     
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                Candidate.name.ilike(search_term),
-                Candidate.email.ilike(search_term),
-                Candidate.remarks.ilike(search_term) if Candidate.remarks else False,
-            )
-        )
+    query = db.query(Candidate)
+    query = apply_candidate_filters(query, status_filter, bucket_id, search)
     
     # Get total count
-    total = query.count()
+    total, total_exact = count_rows(
+        db,
+        query,
+        pagination.count,
+        response_cache.build_key(
+            "candidates:count",
+            {"status": status_filter, "bucket_id": bucket_id, "search": search},
+            cache_scope(current_user),
+            [],
+        ),
+    )
     
     # Apply sorting
-    sort_column = getattr(Candidate, pagination.sort_by, Candidate.created_at)
-    if pagination.sort_order == "desc":
-        query = query.order_by(sort_column.desc())
-    else:
-        query = query.order_by(sort_column.asc())
+    query = query.order_by(*ordering)
     
     # Apply pagination
+    # One extra row tells whether there is a next page, whatever the total says
     offset = (pagination.page - 1) * pagination.page_size
-    candidates = query.offset(offset).limit(pagination.page_size).all()
-    
-    # Build response
-    candidate_responses = []
-    for candidate in candidates:
-        bucket_ids = [cb.bucket_id for cb in candidate.buckets]
-        skill_ids = [cs.skill_id for cs in candidate.skills]
-        response = CandidateResponse.model_validate(candidate)
-        response.bucket_ids = bucket_ids
-        response.skill_ids = skill_ids
-        candidate_responses.append(response)
-    
-    return {
-        "data": candidate_responses,
-        "pagination": calculate_pagination(total, pagination.page, pagination.page_size),
-    }
+    rows = (
+        query.with_entities(*CANDIDATE_RESPONSE_COLUMNS)
+        .offset(offset)
+        .limit(pagination.page_size + 1)
+        .all()
+    )
+    has_next = len(rows) > pagination.page_size
+    rows = rows[:pagination.page_size]
+    
+    response = ORJSONResponse({
+        "data": candidate_rows_to_dicts(db, rows),
+        "pagination": calculate_pagination(total, pagination.page, pagination.page_size, total_exact, has_next),
+    })
+    response_cache.set(cache_key, response.body)
+    response.headers.update(etag_headers(etag))
+    return response
+
+
+@router.get("/export")
+async def export_candidates(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson|xlsx)$"),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    bucket_id: Optional[int] = Query(None),
+    search: Optional[str] = Query(None),
+    current_user: User = Depends(get_hr_user),
+    db: Session = Depends(get_db)
+):
+    """Export candidates matching the list filters as CSV, NDJSON or XLSX."""
+    query = db.query(Candidate)
+    query = apply_candidate_filters(query, status_filter, bucket_id, search)
+    query = build_export_query(query, db.get_bind().dialect.name)
+    
+    # Release the request session's connection; the stream reads through its
+    # own session and returns that connection as soon as the last row is sent.
+    db.close()
+    rows = iter_export_rows(query, SessionLocal(), settings.EXPORT_BATCH_SIZE)
+    
+    filename = f"candidates-{datetime.utcnow():%Y%m%d%H%M%S}.{export_format}"
+    return StreamingResponse(
+        EXPORT_WRITERS[export_format](rows),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get("/{candidate_id}", response_model=CandidateResponse)
 async def get_candidate(
     candidate_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get candidate by ID."""
+    """Get candidate by ID (answers 304 while ``If-None-Match`` names the current version)."""
+    etag = resource_etag(db, "candidate", Candidate.id == candidate_id)
+    if etag is not None and etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+    
     candidate = db.query(Candidate).filter(
-        Candidate.id == candidate_id,
-        Candidate.deleted_at == None
+        Candidate.id == candidate_id
     ).first()
     
     if not candidate:
@@ -165,25 +417,35 @@ async def get_candidate(
     
     bucket_ids = [cb.bucket_id for cb in candidate.buckets]
     skill_ids = [cs.skill_id for cs in candidate.skills]
-    response = CandidateResponse.model_validate(candidate)
-    response.bucket_ids = bucket_ids
-    response.skill_ids = skill_ids
+    candidate_response = CandidateResponse.model_validate(candidate)
+    candidate_response.bucket_ids = bucket_ids
+    candidate_response.skill_ids = skill_ids
+    if candidate.resume_file:
+        for field, url in preview_urls(candidate.resume_file.content_hash).items():
+            setattr(candidate_response, field, url)
     
-    return response
+    if etag is not None:
+        response.headers.update(etag_headers(etag))
+    return candidate_response
 
 
 @router.put("/{candidate_id}", response_model=CandidateResponse)
 async def update_candidate(
     candidate_id: int,
     candidate_data: CandidateUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     current_user: User = Depends(get_hr_user),
     db: Session = Depends(get_db)
 ):
-    """Update candidate."""
-    candidate = db.query(Candidate).filter(
-        Candidate.id == candidate_id,
-        Candidate.deleted_at == None
-    ).first()
+    """Update candidate (only while ``If-Match``, when sent, names the current version)."""
+    query = db.query(Candidate).filter(
+        Candidate.id == candidate_id
+    )
+    if if_match is not None:
+        # Hold the row until commit, so no other write lands between the check and this one
+        query = query.with_for_update(of=Candidate)
+    candidate = query.first()
     
     if not candidate:
         raise HTTPException(
@@ -191,37 +453,74 @@ async def update_candidate(
             detail="Candidate not found",
         )
     
+    if if_match is not None:
+        etag = resource_etag(db, "candidate", Candidate.id == candidate_id)
+        if etag is None or not etag_matches(if_match, etag):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Candidate was changed since it was read",
+            )
+    
     # Update fields
     update_data = candidate_data.model_dump(exclude_unset=True, exclude={"bucket_ids", "skill_ids"})
     for field, value in update_data.items():
         setattr(candidate, field, value)
     
-    # Update buckets if provided
+    # Update buckets and skills if provided, touching only the rows that change
+    bucket_ids = skill_ids = None
     if candidate_data.bucket_ids is not None:
-        db.query(CandidateBucket).filter(CandidateBucket.candidate_id == candidate_id).delete()
-        if candidate_data.bucket_ids:
-            buckets = db.query(ResumeBucket).filter(ResumeBucket.id.in_(candidate_data.bucket_ids)).all()
-            for bucket in buckets:
-                db.add(CandidateBucket(candidate_id=candidate.id, bucket_id=bucket.id))
-    
-    # Update skills if provided
+        bucket_ids = replace_links(db, candidate_id, "buckets", candidate_data.bucket_ids)
     if candidate_data.skill_ids is not None:
-        db.query(CandidateSkill).filter(CandidateSkill.candidate_id == candidate_id).delete()
-        if candidate_data.skill_ids:
-            skills = db.query(Skill).filter(Skill.id.in_(candidate_data.skill_ids)).all()
-            for skill in skills:
-                db.add(CandidateSkill(candidate_id=candidate.id, skill_id=skill.id))
+        skill_ids = replace_links(db, candidate_id, "skills", candidate_data.skill_ids)
     
+    record_changes(db, "candidate", [candidate_id])
     db.commit()
+    response_cache.invalidate(CANDIDATES_TAG)
     db.refresh(candidate)
     
-    bucket_ids = [cb.bucket_id for cb in candidate.buckets]
-    skill_ids = [cs.skill_id for cs in candidate.skills]
-    response = CandidateResponse.model_validate(candidate)
-    response.bucket_ids = bucket_ids
-    response.skill_ids = skill_ids
+    candidate_response = CandidateResponse.model_validate(candidate)
+    candidate_response.bucket_ids = bucket_ids if bucket_ids is not None else linked_ids(db, candidate_id, "buckets")
+    candidate_response.skill_ids = skill_ids if skill_ids is not None else linked_ids(db, candidate_id, "skills")
+    if candidate.resume_file:
+        for field, url in preview_urls(candidate.resume_file.content_hash).items():
+            setattr(candidate_response, field, url)
     
-    return response
+    etag = resource_etag(db, "candidate", Candidate.id == candidate_id)
+    if etag is not None:
+        response.headers.update(etag_headers(etag))
+    return candidate_response
+
+
+@router.patch("/{candidate_id}/associations", response_model=CandidateAssociations)
+async def update_candidate_associations(
+    candidate_id: int,
+    changes: CandidateAssociationsUpdate,
+    current_user: User = Depends(get_hr_user),
+    db: Session = Depends(get_db)
+):
+    """Add or remove individual buckets and skills without resending the full lists."""
+    candidate = db.query(Candidate.id).filter(
+        Candidate.id == candidate_id
+    ).first()
+    
+    if not candidate:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Candidate not found",
+        )
+    
+    bucket_ids = change_links(
+        db, candidate_id, "buckets", add=changes.add_bucket_ids, remove=changes.remove_bucket_ids
+    )
+    skill_ids = change_links(
+        db, candidate_id, "skills", add=changes.add_skill_ids, remove=changes.remove_skill_ids
+    )
+    
+    record_changes(db, "candidate", [candidate_id])
+    db.commit()
+    response_cache.invalidate(CANDIDATES_TAG)
+    
+    return {"bucket_ids": bucket_ids, "skill_ids": skill_ids}
 
 
 @router.delete("/{candidate_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -233,8 +532,7 @@ async def delete_candidate(
 ):
     """Delete candidate (soft delete by default)."""
     candidate = db.query(Candidate).filter(
-        Candidate.id == candidate_id,
-        Candidate.deleted_at == None
+        Candidate.id == candidate_id
     ).first()
     
     if not candidate:
@@ -244,11 +542,14 @@ async def delete_candidate(
         )
     
     if hard_delete and current_user.role == "admin":
+        # The candidate's interviews go with it
+        record_changes(db, "interview", [interview.id for interview in candidate.interviews])
         db.delete(candidate)
     else:
-        from datetime import datetime
         candidate.deleted_at = datetime.utcnow()
     
+    record_changes(db, "candidate", [candidate_id])
     db.commit()
+    response_cache.invalidate(CANDIDATES_TAG, INTERVIEWS_TAG)
     return None
 
@@ -0,0 +1,47 @@
+"""Change feed endpoints."""
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from ..config import settings
+from ..db.base import get_db
+from ..core.changes import CursorExpired, change_watcher, latest_sequence, read_changes
+from ..schemas.change import ChangeFeed
+from ..dependencies import get_current_user
+from ..models.user import User
+
+router = APIRouter()
+
+
+@router.get("", response_model=ChangeFeed)
+async def get_changes(
+    since: Optional[int] = Query(None, ge=0),
+    limit: int = Query(settings.CHANGES_PAGE_SIZE, ge=1, le=settings.CHANGES_PAGE_SIZE),
+    wait: int = Query(0, ge=0, le=settings.CHANGES_MAX_WAIT_SECONDS),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Candidate, interview and feedback changes after cursor ``since``.
+    
+    Without ``since`` no changes are returned, only the current cursor to
+    sync from after a full load. With ``wait``, a request that finds nothing
+    new is held for up to that many seconds until something changes.
+    """
+    if since is None:
+        return ORJSONResponse({"changes": [], "cursor": latest_sequence(db), "has_more": False})
+    
+    try:
+        feed = read_changes(db, since, limit, current_user)
+        if feed["cursor"] == since and wait:
+            # Give the connection back to the pool while waiting
+            db.rollback()
+            await change_watcher.wait(since, wait)
+            feed = read_changes(db, since, limit, current_user)
+    except CursorExpired as exc:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail=str(exc),
+        )
+    
+    return ORJSONResponse(feed)
@@ -1,11 +1,21 @@
 """Feedback endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status
+import time
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Response, status
+from sqlalchemy import literal, select
 from sqlalchemy.orm import Session
+from typing import Optional
 
 from ..db.base import get_db
+from ..db.upsert import insert_unless_exists
 from ..models.interview import InterviewRound, InterviewFeedback
 from ..schemas.interview import InterviewFeedbackCreate, InterviewFeedbackResponse
-from ..dependencies import get_current_user
+from ..dependencies import get_admin_user, get_current_user
+from ..core.assignment import interviewer_loads
+from ..core.calibration import calibrate_new_feedback, feedback_calibration, overall_rating
+from ..core.changes import record_changes
+from ..core.conditional import etag_headers, etag_matches, resource_etag
+from ..core.cache import INTERVIEWS_TAG, response_cache
 from ..models.user import User
 
 router = APIRouter()
@@ -14,66 +24,106 @@ router = APIRouter()
 @router.post("", response_model=InterviewFeedbackResponse, status_code=status.HTTP_201_CREATED)
 async def create_feedback(
     feedback_data: InterviewFeedbackCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Submit interview feedback."""
-    # Verify interview exists and belongs to interviewer
-    interview = db.query(InterviewRound).filter(
-        InterviewRound.id == feedback_data.interview_round_id,
-        InterviewRound.interviewer_id == current_user.id,
-        InterviewRound.deleted_at == None
-    ).first()
-    
-    if not interview:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Interview not found or you don't have permission",
-        )
-    
-    # Check if feedback already exists
-    existing = db.query(InterviewFeedback).filter(
-        InterviewFeedback.interview_round_id == feedback_data.interview_round_id
-    ).first()
+    # Insert from the interview row, so nothing is inserted unless the
+    # interview exists and belongs to the interviewer; the unique index on
+    # interview_round_id rejects a second submission
+    values = {
+        **feedback_data.model_dump(),
+        "interviewer_id": current_user.id,
+        "overall_rating": overall_rating(feedback_data.model_dump()),
+    }
+    columns = InterviewFeedback.__table__.c
+    feedback = insert_unless_exists(
+        db,
+        InterviewFeedback,
+        ["interview_round_id"],
+        from_select=(
+            list(values),
+            select(*[literal(value, columns[name].type) for name, value in values.items()]).where(
+                InterviewRound.id == feedback_data.interview_round_id,
+                InterviewRound.interviewer_id == current_user.id,
+                InterviewRound.deleted_at.is_(None),
+            ),
+        ),
+    )
     
-    if existing:
+    if feedback is None:
+        interview = db.query(InterviewRound.id).filter(
+            InterviewRound.id == feedback_data.interview_round_id,
+            InterviewRound.interviewer_id == current_user.id
+        ).first()
+        if not interview:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Interview not found or you don't have permission",
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Feedback already submitted for this interview",
         )
     
-    # Calculate overall rating
-    overall_rating = (
-        feedback_data.technical_proficiency_score * 0.4 +
-        feedback_data.attitude_score * 0.2 +
-        feedback_data.code_cleanliness_score * 0.2 +
-        feedback_data.communication_score * 0.2
-    )
+    # Update interview status
+    db.query(InterviewRound).filter(
+        InterviewRound.id == feedback_data.interview_round_id
+    ).update({"status": "completed"}, synchronize_session=False)
     
-    # Create feedback
-    feedback = InterviewFeedback(
-        **feedback_data.model_dump(),
-        interviewer_id=current_user.id,
-        overall_rating=overall_rating,
-    )
-    db.add(feedback)
+    response = InterviewFeedbackResponse.model_validate(feedback)
+    record_changes(db, "interview", [feedback_data.interview_round_id])
+    record_changes(db, "feedback", [feedback.id])
+    db.commit()
+    response_cache.invalidate(INTERVIEWS_TAG)
+    interviewer_loads.touch(current_user.id)
     
-    # Update interview status
-    interview.status = "completed"
+    # Calibrate the new rating and rewrite the ratings it shifted after responding;
+    # calibrated_rating stays null until then
+    background_tasks.add_task(calibrate_new_feedback)
     
+    return response
+
+
+@router.post("/calibration")
+async def recalibrate_feedback(
+    current_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Recompute every calibrated rating from scratch (e.g. after changing the score weights)."""
+    started = time.perf_counter()
+    written = feedback_calibration.recalibrate(db, full=True)
     db.commit()
-    db.refresh(feedback)
     
-    return InterviewFeedbackResponse.model_validate(feedback)
+    return {
+        "feedback": len(feedback_calibration),
+        "updated": len(written),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
 
 
 @router.get("/{interview_id}", response_model=InterviewFeedbackResponse)
 async def get_feedback(
     interview_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get feedback for an interview."""
+    """Get feedback for an interview (answers 304 while ``If-None-Match`` names the current version)."""
+    # Only feedback the user may read is probed; anything else takes the checks below.
+    # The soft-delete filter does not reach into EXISTS, hence the explicit deleted_at
+    criteria = [
+        InterviewFeedback.interview_round_id == interview_id,
+        InterviewFeedback.interview_round.has(InterviewRound.deleted_at.is_(None)),
+    ]
+    if current_user.role == "interviewer":
+        criteria.append(InterviewFeedback.interviewer_id == current_user.id)
+    etag = resource_etag(db, "feedback", *criteria)
+    if etag is not None and etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+    
     feedback = db.query(InterviewFeedback).filter(
         InterviewFeedback.interview_round_id == interview_id
     ).first()
@@ -102,5 +152,7 @@ async def get_feedback(
             detail="Insufficient permissions",
         )
     
+    if etag is not None:
+        response.headers.update(etag_headers(etag))
     return InterviewFeedbackResponse.model_validate(feedback)
 
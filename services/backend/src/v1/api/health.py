@@ -1,5 +1,5 @@
 """Health check endpoints."""
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy import text
@@ -1,35 +1,76 @@
 """Interview endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse, Response
+from sqlalchemy import literal, select
 from sqlalchemy.orm import Session
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, timedelta
 
+from ..config import settings
 from ..db.base import get_db
+from ..db.upsert import insert_unless_exists
 from ..models.interview import InterviewRound
 from ..models.candidate import Candidate
 from ..schemas.interview import (
     InterviewRoundCreate,
     InterviewRoundUpdate,
     InterviewRoundResponse,
+    InterviewAvailability,
+    InterviewAssignment,
+    InterviewAssignmentResponse,
 )
-from ..schemas.common import PaginationParams
+from ..schemas.common import PaginationParams, calculate_pagination
+from ..core.assignment import assign_rounds, interviewer_loads, pick_interviewer
+from ..core.changes import record_changes
+from ..core.conditional import etag_headers, etag_matches, list_etag, resource_etag
+from ..core.outbox import queue_interview_invites
+from ..core.scheduling import (
+    FREE_STATUSES,
+    BusyIndex,
+    free_slots,
+    interview_end,
+    previous_round_incomplete,
+)
+from ..core.serialization import INTERVIEW_RESPONSE_COLUMNS, rows_to_dicts
+from ..core.counting import count_rows
+from ..core.sorting import INTERVIEW_SORTS, UnsupportedSortKey
+from ..core.cache import INTERVIEWS_TAG, cache_scope, response_cache
 from ..dependencies import get_current_user, get_hr_user
 from ..models.user import User
 
 router = APIRouter()
 
 
-def calculate_pagination(total: int, page: int, page_size: int) -> dict:
-    """Calculate pagination metadata."""
-    total_pages = (total + page_size - 1) // page_size
-    return {
-        "total": total,
-        "page": page,
-        "page_size": page_size,
-        "total_pages": total_pages,
-        "has_next": page < total_pages,
-        "has_prev": page > 1,
-    }
+def check_duration(duration: Optional[int]) -> None:
+    """Raise 400 if an interview would be longer than allowed."""
+    if duration and duration > settings.INTERVIEW_MAX_DURATION:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Interviews cannot be longer than {settings.INTERVIEW_MAX_DURATION} minutes",
+        )
+
+
+def ensure_interviewer_free(
+    db: Session,
+    interviewer_id: int,
+    scheduled_date: datetime,
+    duration: Optional[int],
+    exclude_interview_id: Optional[int] = None,
+) -> None:
+    """Raise 400 if the interviewer is already booked during the slot.
+    
+    On PostgreSQL the interviewer row is locked first, so concurrent bookings
+    for the same interviewer are checked one after the other.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.query(User.id).filter(User.id == interviewer_id).with_for_update().first()
+    end = interview_end(scheduled_date, duration)
+    busy = BusyIndex.load(db, [interviewer_id], scheduled_date, end, exclude_interview_id)
+    if busy.conflicts(interviewer_id, scheduled_date, end):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Interviewer is already booked at that time",
+        )
 
 
 @router.post("", response_model=InterviewRoundResponse, status_code=status.HTTP_201_CREATED)
@@ -39,40 +80,98 @@ async def create_interview(
     db: Session = Depends(get_db)
 ):
     """Schedule a new interview."""
-    # Verify candidate exists
-    candidate = db.query(Candidate).filter(
-        Candidate.id == interview_data.candidate_id,
-        Candidate.deleted_at == None
-    ).first()
+    check_duration(interview_data.duration)
     
-    if not candidate:
+    if previous_round_incomplete(db, interview_data.candidate_id, interview_data.round_number):
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate not found",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Round {interview_data.round_number - 1} must be completed before scheduling this round",
         )
     
-    # Check if round already exists
-    existing = db.query(InterviewRound).filter(
-        InterviewRound.candidate_id == interview_data.candidate_id,
-        InterviewRound.round_number == interview_data.round_number,
-        InterviewRound.deleted_at == None
-    ).first()
+    if interview_data.interviewer_id is None:
+        interview_data.interviewer_id = pick_interviewer(db, interview_data.scheduled_date, interview_data.duration)
+        if interview_data.interviewer_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No interviewer is available at that time",
+            )
     
-    if existing:
+    if interview_data.scheduled_date:
+        ensure_interviewer_free(
+            db,
+            interview_data.interviewer_id,
+            interview_data.scheduled_date,
+            interview_data.duration,
+        )
+    
+    # Insert from the live candidate row, so a missing candidate inserts
+    # nothing, and let the live-round unique index reject duplicates
+    values = interview_data.model_dump()
+    columns = InterviewRound.__table__.c
+    interview = insert_unless_exists(
+        db,
+        InterviewRound,
+        ["candidate_id", "round_number"],
+        from_select=(
+            list(values),
+            select(*[literal(value, columns[name].type) for name, value in values.items()]).where(
+                Candidate.id == interview_data.candidate_id,
+                Candidate.deleted_at.is_(None),
+            ),
+        ),
+        conflict_where=InterviewRound.deleted_at.is_(None),
+    )
+    
+    if interview is None:
+        candidate = db.query(Candidate.id).filter(
+            Candidate.id == interview_data.candidate_id
+        ).first()
+        if not candidate:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Candidate not found",
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Interview round already exists for this candidate",
         )
     
-    # Create interview
-    interview = InterviewRound(
-        **interview_data.model_dump(),
+    queue_interview_invites(db, [interview])
+    response = InterviewRoundResponse.model_validate(interview)
+    record_changes(db, "interview", [interview.id])
+    db.commit()
+    response_cache.invalidate(INTERVIEWS_TAG)
+    interviewer_loads.touch(interview.interviewer_id)
+    
+    return response
+
+
+@router.post("/assign", response_model=InterviewAssignmentResponse, status_code=status.HTTP_201_CREATED)
+async def assign_interviews(
+    assignment: InterviewAssignment,
+    current_user: User = Depends(get_hr_user),
+    db: Session = Depends(get_db)
+):
+    """Create a round for a batch of candidates, assigning the least loaded available interviewers."""
+    check_duration(assignment.duration)
+    
+    result = assign_rounds(
+        db,
+        assignment.candidate_ids,
+        assignment.round_number,
+        assignment.round_name,
+        assignment.scheduled_date,
+        assignment.duration,
     )
-    db.add(interview)
+    queue_interview_invites(db, result["created"])
+    response = InterviewAssignmentResponse.model_validate(result, from_attributes=True)
+    record_changes(db, "interview", [interview.id for interview in result["created"]])
     db.commit()
-    db.refresh(interview)
+    if result["created"]:
+        response_cache.invalidate(INTERVIEWS_TAG)
+        interviewer_loads.touch(*{interview.interviewer_id for interview in result["created"]})
     
-    return InterviewRoundResponse.model_validate(interview)
+    return response
 
 
 @router.get("", response_model=dict)
@@ -80,11 +179,35 @@ async def list_interviews(
     pagination: PaginationParams = Depends(),
     candidate_id: Optional[int] = Query(None),
     status_filter: Optional[str] = Query(None, alias="status"),
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """List interviews with pagination."""
-    query = db.query(InterviewRound).filter(InterviewRound.deleted_at == None)
+    try:
+        ordering = INTERVIEW_SORTS.ordering(pagination.sort_by, pagination.sort_order)
+    except UnsupportedSortKey as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+    
+    params = {**pagination.model_dump(), "candidate_id": candidate_id, "status": status_filter}
+    etag = list_etag(db, "interviews:list", params, cache_scope(current_user))
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+    
+    cache_key = response_cache.build_key(
+        "interviews:list",
+        params,
+        cache_scope(current_user),
+        [INTERVIEWS_TAG],
+    )
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json", headers=etag_headers(etag))
+    
+    query = db.query(InterviewRound)
     
     # Apply filters
     if candidate_id:
@@ -98,42 +221,96 @@ async def list_interviews(
         query = query.filter(InterviewRound.interviewer_id == current_user.id)
     
     # Get total count
-    total = query.count()
+    total, total_exact = count_rows(
+        db,
+        query,
+        pagination.count,
+        response_cache.build_key(
+            "interviews:count",
+            {"candidate_id": candidate_id, "status": status_filter},
+            cache_scope(current_user),
+            [],
+        ),
+    )
     
     # Apply sorting
-    sort_column = getattr(InterviewRound, pagination.sort_by, InterviewRound.created_at)
-    if pagination.sort_order == "desc":
-        query = query.order_by(sort_column.desc())
-    else:
-        query = query.order_by(sort_column.asc())
+    query = query.order_by(*ordering)
     
     # Apply pagination
+    # One extra row tells whether there is a next page, whatever the total says
     offset = (pagination.page - 1) * pagination.page_size
-    interviews = query.offset(offset).limit(pagination.page_size).all()
+    rows = (
+        query.with_entities(*INTERVIEW_RESPONSE_COLUMNS)
+        .offset(offset)
+        .limit(pagination.page_size + 1)
+        .all()
+    )
+    has_next = len(rows) > pagination.page_size
+    rows = rows[:pagination.page_size]
+    
+    response = ORJSONResponse({
+        "data": rows_to_dicts(rows),
+        "pagination": calculate_pagination(total, pagination.page, pagination.page_size, total_exact, has_next),
+    })
+    response_cache.set(cache_key, response.body)
+    response.headers.update(etag_headers(etag))
+    return response
+
+
+@router.get("/availability", response_model=InterviewAvailability)
+async def get_availability(
+    interviewer_ids: Optional[List[int]] = Query(None, max_length=20),
+    start: datetime = Query(...),
+    end: datetime = Query(...),
+    duration: int = Query(60, ge=5),
+    current_user: User = Depends(get_hr_user),
+    db: Session = Depends(get_db)
+):
+    """Free slots when the whole panel is available, and the earliest of them."""
+    if not interviewer_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one interviewer_ids value is required",
+        )
+    if end <= start or end - start > timedelta(days=settings.SCHEDULING_MAX_RANGE_DAYS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"end must be after start and within {settings.SCHEDULING_MAX_RANGE_DAYS} days of it",
+        )
+    check_duration(duration)
+    
+    busy = BusyIndex.load(db, interviewer_ids, start, end)
+    slots = free_slots(busy, interviewer_ids, start, end, duration)
+    earliest = None
+    if slots:
+        earliest = {"start": slots[0][0], "end": slots[0][0] + timedelta(minutes=duration)}
     
     return {
-        "data": [InterviewRoundResponse.model_validate(i) for i in interviews],
-        "pagination": calculate_pagination(total, pagination.page, pagination.page_size),
+        "free_slots": [{"start": slot_start, "end": slot_end} for slot_start, slot_end in slots],
+        "earliest": earliest,
     }
 
 
 @router.get("/{interview_id}", response_model=InterviewRoundResponse)
 async def get_interview(
     interview_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get interview by ID."""
-    query = db.query(InterviewRound).filter(
-        InterviewRound.id == interview_id,
-        InterviewRound.deleted_at == None
-    )
+    """Get interview by ID (answers 304 while ``If-None-Match`` names the current version)."""
+    criteria = [InterviewRound.id == interview_id]
     
     # For interviewers, only allow access to their interviews
     if current_user.role == "interviewer":
-        query = query.filter(InterviewRound.interviewer_id == current_user.id)
+        criteria.append(InterviewRound.interviewer_id == current_user.id)
     
-    interview = query.first()
+    etag = resource_etag(db, "interview", *criteria)
+    if etag is not None and etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+    
+    interview = db.query(InterviewRound).filter(*criteria).first()
     
     if not interview:
         raise HTTPException(
@@ -141,6 +318,8 @@ async def get_interview(
             detail="Interview not found",
         )
     
+    if etag is not None:
+        response.headers.update(etag_headers(etag))
     return InterviewRoundResponse.model_validate(interview)
 
 
@@ -148,19 +327,23 @@ async def get_interview(
 async def update_interview(
     interview_id: int,
     interview_data: InterviewRoundUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Update interview."""
+    """Update interview (only while ``If-Match``, when sent, names the current version)."""
     query = db.query(InterviewRound).filter(
-        InterviewRound.id == interview_id,
-        InterviewRound.deleted_at == None
+        InterviewRound.id == interview_id
     )
     
     # For interviewers, only allow updating their interviews
     if current_user.role == "interviewer":
         query = query.filter(InterviewRound.interviewer_id == current_user.id)
     
+    if if_match is not None:
+        # Hold the row until commit, so no other write lands between the check and this one
+        query = query.with_for_update(of=InterviewRound)
     interview = query.first()
     
     if not interview:
@@ -169,14 +352,44 @@ async def update_interview(
             detail="Interview not found",
         )
     
+    if if_match is not None:
+        etag = resource_etag(db, "interview", InterviewRound.id == interview_id)
+        if etag is None or not etag_matches(if_match, etag):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Interview was changed since it was read",
+            )
+    
     # Update fields
     update_data = interview_data.model_dump(exclude_unset=True)
+    check_duration(update_data.get("duration"))
+    previous_date = interview.scheduled_date
     for field, value in update_data.items():
         setattr(interview, field, value)
     
+    # A moved, lengthened or reinstated round must not overlap the interviewer's other rounds
+    if (
+        {"scheduled_date", "duration", "status"} & update_data.keys()
+        and interview.scheduled_date
+        and interview.status not in FREE_STATUSES
+    ):
+        ensure_interviewer_free(
+            db, interview.interviewer_id, interview.scheduled_date, interview.duration, interview.id
+        )
+    
+    # A new or moved date is announced again
+    if interview.scheduled_date != previous_date:
+        queue_interview_invites(db, [interview])
+    
+    record_changes(db, "interview", [interview_id])
     db.commit()
+    response_cache.invalidate(INTERVIEWS_TAG)
+    interviewer_loads.touch(interview.interviewer_id)
     db.refresh(interview)
     
+    etag = resource_etag(db, "interview", InterviewRound.id == interview_id)
+    if etag is not None:
+        response.headers.update(etag_headers(etag))
     return InterviewRoundResponse.model_validate(interview)
 
 
@@ -189,8 +402,7 @@ async def delete_interview(
 ):
     """Delete interview (soft delete by default)."""
     interview = db.query(InterviewRound).filter(
-        InterviewRound.id == interview_id,
-        InterviewRound.deleted_at == None
+        InterviewRound.id == interview_id
     ).first()
     
     if not interview:
@@ -204,6 +416,10 @@ async def delete_interview(
     else:
         interview.deleted_at = datetime.utcnow()
     
+    interviewer_id = interview.interviewer_id
+    record_changes(db, "interview", [interview_id])
     db.commit()
+    response_cache.invalidate(INTERVIEWS_TAG)
+    interviewer_loads.touch(interviewer_id)
     return None
 
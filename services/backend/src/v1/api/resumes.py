@@ -0,0 +1,212 @@
+"""Resume endpoints."""
+import asyncio
+import time
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Path, Query, Request, Response, status
+from multipart.exceptions import MultipartParseError
+from sqlalchemy.orm import Session
+from datetime import datetime
+
+from ..db.base import get_db
+from ..config import settings
+from ..core.cache import CANDIDATES_TAG, response_cache
+from ..core.changes import record_changes
+from ..core.file_response import ContentAddressedFileResponse
+from ..core.security import create_signature, verify_signature
+from ..core.uploads import StreamingUploadParser, UploadRejected
+from ..models.candidate import Candidate
+from ..models.resume import ResumeFile
+from ..schemas.resume import ResumeFileResponse, ResumeDownloadURL
+from ..services.preview_service import PREVIEW_KINDS, preview_cache, preview_message
+from ..services.storage_service import (
+    get_or_create_resume_file,
+    replicate_to_drive,
+    storage,
+)
+from ..dependencies import get_current_user, get_hr_user
+from ..models.user import User
+
+router = APIRouter()
+
+
+def _download_message(candidate_id: int, content_hash: str, expires: int) -> str:
+    """Message signed into resume download URLs."""
+    return f"resume:{candidate_id}:{content_hash}:{expires}"
+
+
+def get_candidate_resume(db: Session, candidate_id: int) -> tuple[Candidate, ResumeFile]:
+    """Get a candidate and its stored resume or raise 404."""
+    candidate = db.query(Candidate).filter(
+        Candidate.id == candidate_id
+    ).first()
+    
+    if not candidate or not candidate.resume_file:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found",
+        )
+    
+    return candidate, candidate.resume_file
+
+
+@router.post("/{candidate_id}", response_model=ResumeFileResponse, status_code=status.HTTP_201_CREATED)
+async def upload_resume(
+    candidate_id: int,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_hr_user),
+    db: Session = Depends(get_db)
+):
+    """Upload or replace a candidate's resume (multipart, single ``file`` part)."""
+    candidate = db.query(Candidate).filter(
+        Candidate.id == candidate_id
+    ).first()
+    
+    if not candidate:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Candidate not found",
+        )
+    
+    upload = StreamingUploadParser(
+        storage,
+        max_file_bytes=settings.MAX_FILE_SIZE_MB * 1024 * 1024,
+        max_files=1,
+        allowed_types=set(settings.ALLOWED_FILE_TYPES.split(",")),
+    )
+    try:
+        await upload.parse(request.headers.get("content-type", ""), request.stream())
+    except UploadRejected as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.message)
+    except MultipartParseError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Malformed multipart body",
+        )
+    
+    if not upload.files:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No file uploaded",
+        )
+    
+    uploaded = upload.files[0]
+    resume_file = get_or_create_resume_file(db, uploaded.stored, uploaded.content_type, uploaded.filename)
+    candidate.resume_file_id = resume_file.id
+    record_changes(db, "candidate", [candidate.id])
+    db.commit()
+    response_cache.invalidate(CANDIDATES_TAG)
+    
+    if resume_file.drive_file_id is None:
+        background_tasks.add_task(replicate_to_drive, resume_file.id)
+    
+    return ResumeFileResponse.model_validate(resume_file)
+
+
+@router.get("/{candidate_id}/url", response_model=ResumeDownloadURL)
+async def get_resume_download_url(
+    candidate_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get a signed, expiring download URL for a candidate's resume."""
+    _, resume_file = get_candidate_resume(db, candidate_id)
+    
+    expires = int(time.time()) + settings.RESUME_URL_EXPIRE_SECONDS
+    signature = create_signature(_download_message(candidate_id, resume_file.content_hash, expires))
+    url = request.url_for("download_resume", candidate_id=candidate_id).include_query_params(
+        content_hash=resume_file.content_hash, expires=expires, signature=signature
+    )
+    
+    return {"url": str(url), "expires_at": datetime.utcfromtimestamp(expires)}
+
+
+@router.get("/{candidate_id}/download")
+async def download_resume(
+    candidate_id: int,
+    request: Request,
+    content_hash: str = Query(...),
+    expires: int = Query(...),
+    signature: str = Query(...),
+    db: Session = Depends(get_db)
+):
+    """Download a resume through a signed URL (supports Range and If-None-Match)."""
+    # Verify before looking anything up, so unsigned requests learn nothing about candidates
+    message = _download_message(candidate_id, content_hash, expires)
+    if expires < time.time() or not verify_signature(message, signature):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid or expired download link",
+        )
+    
+    # A link stops working once the candidate's resume is replaced
+    _, resume_file = get_candidate_resume(db, candidate_id)
+    if resume_file.content_hash != content_hash:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found",
+        )
+    
+    return ContentAddressedFileResponse(
+        storage.path_for(resume_file.content_hash),
+        resume_file.content_hash,
+        request.headers,
+        media_type=resume_file.content_type,
+        filename=resume_file.original_filename,
+        method=request.method,
+    )
+
+
+@router.get("/previews/{content_hash}/{kind}")
+async def get_resume_preview(
+    content_hash: str,
+    request: Request,
+    kind: str = Path(..., pattern="^(text|thumbnail)$"),
+    expires: int = Query(...),
+    signature: str = Query(...),
+    db: Session = Depends(get_db)
+):
+    """Serve a resume's first-page text snippet or thumbnail through a signed URL.
+    
+    Artifacts are rendered on first access; if rendering takes longer than
+    ``PREVIEW_WAIT_SECONDS`` the response is 202 with ``Retry-After``.
+    """
+    if expires < time.time() or not verify_signature(preview_message(content_hash, expires), signature):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid or expired preview link",
+        )
+    
+    path = preview_cache.lookup(content_hash, kind)
+    if path is None and not preview_cache.unavailable(content_hash, kind):
+        resume_file = db.query(ResumeFile).filter(ResumeFile.content_hash == content_hash).first()
+        if not resume_file:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Resume not found",
+            )
+        
+        future = preview_cache.generate(content_hash, storage.path_for(content_hash), resume_file.content_type)
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)), timeout=settings.PREVIEW_WAIT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            return Response(status_code=status.HTTP_202_ACCEPTED, headers={"retry-after": "1"})
+        except Exception:
+            pass  # logged by the cache; answered as unavailable below
+        path = preview_cache.lookup(content_hash, kind)
+    
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Preview not available",
+        )
+    
+    return ContentAddressedFileResponse(
+        path,
+        f"{content_hash}-{kind}",
+        request.headers,
+        media_type=PREVIEW_KINDS[kind][1],
+        method=request.method,
+    )
@@ -38,21 +38,129 @@ class Settings(BaseSettings):
     # Storage
     GOOGLE_DRIVE_STORAGE_ENABLED: bool = True
     RESUME_STORAGE_PATH: str = "/resumes"
+    RESUME_URL_EXPIRE_SECONDS: int = 900  # lifetime of signed download URLs
+    
+    # Resume previews
+    PREVIEW_CACHE_PATH: str = "/resumes/previews"
+    PREVIEW_CACHE_MAX_MB: int = 512
+    PREVIEW_WORKERS: int = 2  # rendering processes
+    PREVIEW_WAIT_SECONDS: float = 2.0  # how long a preview request waits before answering 202
+    PREVIEW_SNIPPET_CHARS: int = 1500
+    PREVIEW_THUMBNAIL_WIDTH: int = 240  # pixels
+    
+    # Profile backups
+    BACKUP_TRANSPORT: str = "drive"  # or local (directory stand-in for Drive)
+    BACKUP_LOCAL_PATH: str = "/backups"
+    BACKUP_STAGING_PATH: str = "/backups-staging"  # segments waiting to be uploaded
+    BACKUP_CHUNK_SIZE_MB: int = 8  # resumable upload chunk; Drive needs a multiple of 256KB
+    BACKUP_MAX_RETRIES: int = 5
+    BACKUP_OVERLAP_SECONDS: int = 300  # re-scan before the high-water mark for late commits
+    BACKUP_BATCH_SIZE: int = 500  # profiles loaded per query batch
     
     # Email
-    EMAIL_SERVICE: str = "sendgrid"  # or ses
+    EMAIL_ENABLED: bool = False  # queue emails in the outbox and run the dispatcher
+    EMAIL_SERVICE: str = "sendgrid"  # or ses, smtp
+    EMAIL_FROM: str = "recruiting@ucube.ai"
     SENDGRID_API_KEY: Optional[str] = None
-    AWS_SES_REGION: str = "us-east-1"
+    AWS_SES_REGION: str = "us-east-1"  # ses is used through its SMTP endpoint with SMTP_USERNAME/SMTP_PASSWORD
+    SMTP_HOST: str = "localhost"  # smtp: e.g. scripts/smtp_sink.py
+    SMTP_PORT: int = 1025
+    SMTP_USERNAME: Optional[str] = None
+    SMTP_PASSWORD: Optional[str] = None
+    SMTP_STARTTLS: bool = False
+    EMAIL_DISPATCH_INTERVAL: float = 5.0  # seconds between outbox polls when nothing is due
+    EMAIL_BATCH_SIZE: int = 100  # emails claimed per batch
+    EMAIL_RATE_PER_SECOND: float = 10.0  # sustained sending rate per worker
+    EMAIL_RATE_BURST: int = 20
+    EMAIL_MAX_ATTEMPTS: int = 6
+    EMAIL_RETRY_BASE_SECONDS: int = 60  # doubles after every failed attempt
+    EMAIL_CLAIM_SECONDS: int = 300  # a claimed email is retried after this if its worker dies mid-batch
     
     # OpenAI (Phase 2)
     OPENAI_API_KEY: Optional[str] = None  # Must be set via environment variable
     OPENAI_MODEL: str = "gpt-5.2"
+    OPENAI_BASE_URL: str = "https://api.openai.com/v1"  # point at scripts/openai_stub.py for local runs
+    OPENAI_INPUT_COST_PER_MTOK: float = 0.0  # USD per million tokens, for the cost estimates
+    OPENAI_OUTPUT_COST_PER_MTOK: float = 0.0
+    
+    # Resume extraction with the model (falls back to the heuristic parser)
+    AI_EXTRACTION_ENABLED: bool = False
+    AI_EXTRACTION_BATCH_SIZE: int = 8  # resumes per request
+    AI_EXTRACTION_CONCURRENCY: int = 4  # requests in flight per upload
+    AI_EXTRACTION_TIMEOUT: float = 30.0  # seconds per request
+    AI_EXTRACTION_MAX_CHARS: int = 6000  # resume text sent per resume
+    AI_EXTRACTION_CACHE_PATH: str = "/resumes/extractions"
     
     # File Upload
     MAX_FILE_SIZE_MB: int = 10
     ALLOWED_FILE_TYPES: str = "application/pdf,application/vnd.openxmlformats-officedocument.wordprocessingml.document"
     MAX_BATCH_SIZE: int = 50
     
+    # Response cache
+    CACHE_BACKEND: str = "memory"  # or redis
+    CACHE_URL: Optional[str] = None  # e.g. redis://localhost:6379/0
+    CACHE_TTL_SECONDS: int = 30
+    CACHE_MAX_ENTRIES: int = 1024
+    
+    # List totals
+    LIST_COUNT_STRATEGY: str = "auto"  # auto, exact, estimate or cached
+    COUNT_EXACT_THRESHOLD: int = 10000  # auto: count exactly when the planner expects at most this many rows
+    COUNT_CACHE_TTL_SECONDS: int = 60
+    
+    # Rate limiting
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"  # or redis (shared across workers)
+    RATE_LIMIT_STORE_URL: Optional[str] = None  # e.g. redis://localhost:6379/1
+    RATE_LIMIT_REQUESTS_PER_MINUTE: int = 100  # per user
+    RATE_LIMIT_LOGIN_PER_MINUTE: int = 10  # per IP
+    
+    # Interview scheduling (times are UTC)
+    INTERVIEW_DEFAULT_DURATION: int = 60  # minutes, for rounds without a duration
+    INTERVIEW_MAX_DURATION: int = 480  # minutes; longer rounds are rejected
+    SCHEDULING_DAY_START_HOUR: int = 9
+    SCHEDULING_DAY_END_HOUR: int = 18
+    SCHEDULING_WORKDAYS: str = "0,1,2,3,4"  # Monday is 0
+    SCHEDULING_SLOT_MINUTES: int = 15  # suggested slots start on this grid
+    SCHEDULING_MAX_RANGE_DAYS: int = 31
+    
+    # Interviewer assignment (load = upcoming rounds and feedback backlog, weighted)
+    ASSIGNMENT_UPCOMING_WEIGHT: float = 1.0
+    ASSIGNMENT_BACKLOG_WEIGHT: float = 2.0  # a round still waiting for feedback counts double
+    ASSIGNMENT_LOAD_REFRESH_SECONDS: int = 300  # full reload of the in-memory load counters
+    
+    # Feedback scoring (weights of the scores in overall_rating; they should sum to 1)
+    FEEDBACK_WEIGHT_TECHNICAL: float = 0.4
+    FEEDBACK_WEIGHT_ATTITUDE: float = 0.2
+    FEEDBACK_WEIGHT_CODE_CLEANLINESS: float = 0.2
+    FEEDBACK_WEIGHT_COMMUNICATION: float = 0.2
+    CALIBRATION_PRIOR_WEIGHT: float = 5.0  # pseudo-reviews pulling a new interviewer's stats toward everyone's
+    CALIBRATION_TOLERANCE: float = 0.05  # calibrated ratings that moved less than this are not rewritten
+    
+    # Candidate scoring (local ridge models; every training run is saved as a new version)
+    SCORING_MODEL_PATH: str = "/models"
+    SCORING_RIDGE_ALPHA: float = 1.0
+    SCORING_MIN_SAMPLES: int = 20  # labelled candidates needed to train a model
+    SCORING_INTERVAL: int = 300  # seconds between rescans of changed candidates
+    SCORING_BATCH_SIZE: int = 5000  # candidates scored per query batch
+    
+    # Data retention (older rows are archived under ARCHIVE_PATH, then deleted)
+    RETENTION_INTERVAL: int = 3600  # seconds between retention runs
+    RETENTION_BATCH_SIZE: int = 1000  # rows moved per transaction
+    RETENTION_AUDIT_LOG_DAYS: int = 180
+    RETENTION_SEARCH_LOG_DAYS: int = 30
+    RETENTION_NOTIFICATION_DAYS: int = 90
+    RETENTION_EMAIL_OUTBOX_DAYS: int = 30
+    RETENTION_CHANGE_LOG_DAYS: int = 7  # clients with an older cursor must reload
+    ARCHIVE_PATH: str = "/archive"
+    
+    # Change feed
+    CHANGES_PAGE_SIZE: int = 500  # default and maximum changes per page
+    CHANGES_MAX_WAIT_SECONDS: int = 30  # longest long-poll
+    CHANGES_POLL_INTERVAL: float = 1.0  # seconds between probes of the newest change while clients wait
+    
+    # Export
+    EXPORT_BATCH_SIZE: int = 1000  # rows fetched per server-side cursor batch
+    
     # Initial Admin User
     ADMIN_EMAIL: str = "admin@ucube.ai"
     ADMIN_PASSWORD: str = "admin"
@@ -4,6 +4,7 @@ from .security import (
     get_password_hash,
     create_access_token,
     create_refresh_token,
+    hash_token,
     decode_token,
     get_user_by_email,
     get_user_by_id,
@@ -14,6 +15,7 @@ __all__ = [
     "get_password_hash",
     "create_access_token",
     "create_refresh_token",
+    "hash_token",
     "decode_token",
     "get_user_by_email",
     "get_user_by_id",
@@ -0,0 +1,239 @@
+"""Automatic interviewer assignment by weighted least load.
+
+``interviewer_loads`` keeps, per active interviewer, the number of upcoming
+rounds and the feedback backlog (rounds that took place but have no
+``InterviewFeedback`` yet). It is loaded with one grouped query, refreshed
+only for the interviewers whose rounds changed (``touch``), and fully
+reloaded every ``ASSIGNMENT_LOAD_REFRESH_SECONDS`` to pick up writes from
+other workers and rounds whose date has passed.
+
+``LoadBalancer`` keeps the loads in a min-heap, so each pick of the least
+loaded interviewer is O(log n); interviewers busy at the requested time are
+passed over. ``assign_rounds`` schedules a round for a whole batch of
+candidates with a single multi-row ``INSERT``.
+"""
+import heapq
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..db.upsert import DIALECT_INSERTS
+from ..models.candidate import Candidate
+from ..models.interview import InterviewFeedback, InterviewRound
+from ..models.user import User
+from .scheduling import FREE_STATUSES, BusyIndex, interview_end
+
+# Interviewer id -> (upcoming rounds, feedback backlog)
+Loads = dict[int, tuple[int, int]]
+
+
+def query_loads(db: Session, interviewer_ids: Optional[Iterable[int]] = None) -> Loads:
+    """Current loads of active interviewers (all of them, or just ``interviewer_ids``) with one query."""
+    now = datetime.utcnow()
+    scheduled = InterviewRound.status == "scheduled"
+    upcoming = and_(scheduled, or_(InterviewRound.scheduled_date.is_(None), InterviewRound.scheduled_date >= now))
+    backlog = and_(
+        InterviewFeedback.id.is_(None),
+        or_(InterviewRound.status == "completed", and_(scheduled, InterviewRound.scheduled_date < now)),
+    )
+    query = db.query(
+        User.id,
+        func.count(InterviewRound.id).filter(upcoming),
+        func.count(InterviewRound.id).filter(backlog),
+    ).outerjoin(
+        InterviewRound,
+        and_(InterviewRound.interviewer_id == User.id, InterviewRound.status.notin_(FREE_STATUSES)),
+    ).outerjoin(
+        InterviewFeedback, InterviewFeedback.interview_round_id == InterviewRound.id
+    ).filter(
+        User.role == "interviewer",
+        User.is_active.is_(True),
+    )
+    if interviewer_ids is not None:
+        query = query.filter(User.id.in_(list(interviewer_ids)))
+    return {interviewer_id: (upcoming, backlog) for interviewer_id, upcoming, backlog in query.group_by(User.id)}
+
+
+class InterviewerLoads:
+    """In-process load counters, refreshed incrementally."""
+
+    def __init__(self, refresh_seconds: int):
+        self.refresh_seconds = refresh_seconds
+        self._loads: Loads = {}
+        self._dirty: set[int] = set()
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def touch(self, *interviewer_ids: int) -> None:
+        """Mark interviewers whose rounds or feedback changed; they are re-read on the next snapshot."""
+        with self._lock:
+            self._dirty.update(interviewer_ids)
+
+    def reset(self) -> None:
+        """Force a full reload on the next snapshot."""
+        with self._lock:
+            self._loaded_at = None
+
+    def snapshot(self, db: Session) -> Loads:
+        """Current loads, reloading what is stale."""
+        with self._lock:
+            if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.refresh_seconds:
+                self._loads = query_loads(db)
+                self._loaded_at = time.monotonic()
+                self._dirty.clear()
+            elif self._dirty:
+                fresh = query_loads(db, self._dirty)
+                for interviewer_id in self._dirty:
+                    self._loads.pop(interviewer_id, None)
+                self._loads.update(fresh)
+                self._dirty.clear()
+            return dict(self._loads)
+
+
+interviewer_loads = InterviewerLoads(settings.ASSIGNMENT_LOAD_REFRESH_SECONDS)
+
+
+class LoadBalancer:
+    """Min-heap of interviewers keyed by weighted load, for one assignment run."""
+
+    def __init__(self, loads: Loads):
+        self.loads = {interviewer_id: list(load) for interviewer_id, load in loads.items()}
+        self._heap = [(self.score(interviewer_id), interviewer_id) for interviewer_id in self.loads]
+        heapq.heapify(self._heap)
+
+    def score(self, interviewer_id: int) -> float:
+        upcoming, backlog = self.loads[interviewer_id]
+        return settings.ASSIGNMENT_UPCOMING_WEIGHT * upcoming + settings.ASSIGNMENT_BACKLOG_WEIGHT * backlog
+
+    def assign_next(self, available: Optional[Callable[[int], bool]] = None) -> Optional[int]:
+        """Pick the least loaded interviewer for which ``available`` holds and count the new round.
+
+        Ties go to the lowest id. Returns ``None`` if nobody is available.
+        """
+        passed_over, chosen = [], None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            if available is None or available(entry[1]):
+                chosen = entry[1]
+                break
+            passed_over.append(entry)
+        for entry in passed_over:
+            heapq.heappush(self._heap, entry)
+        if chosen is not None:
+            self.loads[chosen][0] += 1
+            heapq.heappush(self._heap, (self.score(chosen), chosen))
+        return chosen
+
+
+def _busy_panel(db: Session, interviewer_ids: list[int], start: datetime, end: datetime) -> BusyIndex:
+    # Lock the interviewers being considered (PostgreSQL) so concurrent bookings are checked one after the other
+    if db.get_bind().dialect.name == "postgresql" and interviewer_ids:
+        db.query(User.id).filter(User.id.in_(interviewer_ids)).order_by(User.id).with_for_update().all()
+    return BusyIndex.load(db, interviewer_ids, start, end)
+
+
+def pick_interviewer(db: Session, scheduled_date: Optional[datetime], duration: Optional[int]) -> Optional[int]:
+    """The least loaded interviewer, free at ``scheduled_date`` when one is given."""
+    balancer = LoadBalancer(interviewer_loads.snapshot(db))
+    if scheduled_date is None:
+        return balancer.assign_next()
+    end = interview_end(scheduled_date, duration)
+    busy = _busy_panel(db, list(balancer.loads), scheduled_date, end)
+    return balancer.assign_next(lambda interviewer_id: not busy.conflicts(interviewer_id, scheduled_date, end))
+
+
+def assign_rounds(
+    db: Session,
+    candidate_ids: list[int],
+    round_number: int,
+    round_name: str,
+    scheduled_date: Optional[datetime] = None,
+    duration: Optional[int] = None,
+) -> dict:
+    """Create round ``round_number`` for each candidate, spreading them over the least loaded interviewers.
+
+    Candidates that are missing, not eligible, already have the round or have
+    not completed the previous one are skipped with a reason. With a
+    ``scheduled_date`` every round is at that time, so each interviewer takes
+    at most one of them. The caller commits.
+    """
+    candidate_ids = list(dict.fromkeys(candidate_ids))
+    statuses = dict(db.query(Candidate.id, Candidate.status).filter(Candidate.id.in_(candidate_ids)))
+    rounds = {
+        (candidate_id, number): round_status
+        for candidate_id, number, round_status in db.query(
+            InterviewRound.candidate_id, InterviewRound.round_number, InterviewRound.status
+        ).filter(
+            InterviewRound.candidate_id.in_(candidate_ids),
+            InterviewRound.round_number.in_([round_number - 1, round_number]),
+        )
+    }
+
+    pending, skipped = [], []
+    for candidate_id in candidate_ids:
+        if candidate_id not in statuses:
+            skipped.append({"candidate_id": candidate_id, "reason": "Candidate not found"})
+        elif statuses[candidate_id] != "eligible":
+            skipped.append({"candidate_id": candidate_id, "reason": f"Candidate is {statuses[candidate_id]}"})
+        elif (candidate_id, round_number) in rounds:
+            skipped.append({"candidate_id": candidate_id, "reason": "Interview round already exists for this candidate"})
+        elif round_number > 1 and rounds.get((candidate_id, round_number - 1)) != "completed":
+            skipped.append({"candidate_id": candidate_id, "reason": f"Round {round_number - 1} is not completed"})
+        else:
+            pending.append(candidate_id)
+    if not pending:
+        return {"created": [], "skipped": skipped}
+
+    balancer = LoadBalancer(interviewer_loads.snapshot(db))
+    available = None
+    if scheduled_date is not None:
+        end = interview_end(scheduled_date, duration)
+        busy = _busy_panel(db, list(balancer.loads), scheduled_date, end)
+        available = lambda interviewer_id: not busy.conflicts(interviewer_id, scheduled_date, end)
+
+    values = []
+    for candidate_id in pending:
+        interviewer_id = balancer.assign_next(available)
+        if interviewer_id is None:
+            skipped.append({"candidate_id": candidate_id, "reason": "No interviewer is available"})
+            continue
+        if scheduled_date is not None:
+            busy.add(interviewer_id, scheduled_date, end)
+        values.append({
+            "candidate_id": candidate_id,
+            "round_number": round_number,
+            "round_name": round_name,
+            "scheduled_date": scheduled_date,
+            "duration": duration,
+            "interviewer_id": interviewer_id,
+            "status": "scheduled",
+        })
+    if not values:
+        return {"created": [], "skipped": skipped}
+
+    # A round created concurrently for the same candidate is skipped by the live-round unique index
+    statement = (
+        DIALECT_INSERTS[db.get_bind().dialect.name](InterviewRound)
+        .values(values)
+        .on_conflict_do_nothing(
+            index_elements=["candidate_id", "round_number"],
+            index_where=InterviewRound.deleted_at.is_(None),
+        )
+        .returning(InterviewRound)
+    )
+    created = {interview.candidate_id: interview for interview in db.scalars(statement)}
+    for row in values:
+        if row["candidate_id"] not in created:
+            skipped.append({
+                "candidate_id": row["candidate_id"],
+                "reason": "Interview round already exists for this candidate",
+            })
+    return {
+        "created": [created[row["candidate_id"]] for row in values if row["candidate_id"] in created],
+        "skipped": skipped,
+    }
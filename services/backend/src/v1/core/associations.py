@@ -0,0 +1,90 @@
+"""Candidate bucket and skill links.
+
+Links are changed as set differences: only added ids are inserted and only
+removed ids are deleted, with one statement each, so editing one skill on a
+profile with forty touches one row and the untouched rows keep their
+``created_at``. Any change bumps the candidate's ``updated_at`` so that
+incremental backups also notice removals.
+"""
+from typing import Iterable
+
+from sqlalchemy import delete, func, literal, select, update
+from sqlalchemy.orm import Session
+
+from ..db.upsert import DIALECT_INSERTS
+from ..models.bucket import ResumeBucket
+from ..models.candidate import Candidate, CandidateBucket, CandidateSkill
+from ..models.skill import Skill
+
+# Link kind -> (link model, id column on it, linked model)
+LINKS = {
+    "buckets": (CandidateBucket, "bucket_id", ResumeBucket),
+    "skills": (CandidateSkill, "skill_id", Skill),
+}
+
+
+def linked_ids(db: Session, candidate_id: int, kind: str) -> list[int]:
+    """Ids currently linked to a candidate, sorted."""
+    model, column, _ = LINKS[kind]
+    id_column = getattr(model, column)
+    query = db.query(id_column).filter(model.candidate_id == candidate_id).order_by(id_column)
+    return [value for (value,) in query]
+
+
+def insert_links(db: Session, candidate_id: int, kind: str, ids: Iterable[int]) -> list[int]:
+    """Link a candidate to the ``ids`` that exist, skipping links already present; return the new ids."""
+    ids = set(ids)
+    if not ids:
+        return []
+    model, column, target = LINKS[kind]
+    statement = (
+        DIALECT_INSERTS[db.get_bind().dialect.name](model)
+        .from_select(
+            ["candidate_id", column],
+            select(literal(candidate_id), target.id).where(target.id.in_(ids)),
+        )
+        .on_conflict_do_nothing(index_elements=["candidate_id", column])
+        .returning(getattr(model, column))
+    )
+    return sorted(db.scalars(statement).all())
+
+
+def _apply_diff(db: Session, candidate_id: int, kind: str, current: set, added: set, removed: set) -> list[int]:
+    model, column, _ = LINKS[kind]
+    inserted = insert_links(db, candidate_id, kind, added)
+    if removed:
+        db.execute(
+            delete(model)
+            .where(model.candidate_id == candidate_id, getattr(model, column).in_(removed))
+            .execution_options(synchronize_session=False)
+        )
+    if inserted or removed:
+        db.execute(
+            update(Candidate)
+            .where(Candidate.id == candidate_id)
+            .values(updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+    return sorted((current - removed) | set(inserted))
+
+
+def change_links(
+    db: Session,
+    candidate_id: int,
+    kind: str,
+    add: Iterable[int] = (),
+    remove: Iterable[int] = (),
+) -> list[int]:
+    """Add and remove links of a candidate; return the resulting ids, sorted.
+
+    Unknown ids in ``add`` and unlinked ids in ``remove`` are ignored.
+    """
+    current = set(linked_ids(db, candidate_id, kind))
+    return _apply_diff(db, candidate_id, kind, current, set(add) - current, set(remove) & current)
+
+
+def replace_links(db: Session, candidate_id: int, kind: str, ids: Iterable[int]) -> list[int]:
+    """Make a candidate's links match ``ids`` (unknown ids ignored), touching only the difference."""
+    ids = set(ids)
+    current = set(linked_ids(db, candidate_id, kind))
+    return _apply_diff(db, candidate_id, kind, current, ids - current, current - ids)
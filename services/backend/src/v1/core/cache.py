@@ -0,0 +1,162 @@
+"""Response cache for list endpoints.
+
+Cached bodies are stored under a key built from the normalized request
+parameters and the caller's scope. Every entry is also bound to the current
+generation of its tags (``candidates``, ``interviews``); write paths bump the
+generation, which orphans all entries cached under the old one without having
+to enumerate them. Orphaned entries age out through the LRU bound or TTL.
+"""
+import hashlib
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
+
+from ..config import settings
+
+CANDIDATES_TAG = "candidates"
+INTERVIEWS_TAG = "interviews"
+
+
+class ResponseCache(ABC):
+    """Base class for tag-aware response caches."""
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+
+    def build_key(self, namespace: str, params: dict, scope: str, tags: Iterable[str]) -> str:
+        """Build a cache key from normalized parameters, the caller scope and current tag generations.
+
+        Tag generations are resolved here, once, so a write that lands while
+        the response is being built leaves the result under the old generation.
+        """
+        normalized = json.dumps(params, sort_keys=True, default=str, separators=(",", ":"))
+        digest = hashlib.sha1(f"{scope}|{normalized}".encode("utf-8")).hexdigest()
+        tags = sorted(tags)
+        versions = self._tag_versions(tags)
+        generation = ",".join(f"{tag}={version}" for tag, version in zip(tags, versions))
+        return f"{namespace}:{digest}|{generation}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached body for ``key``, if any."""
+        return self._load(key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: Optional[int] = None) -> None:
+        """Cache ``value`` under ``key``."""
+        self._store(key, value, ttl_seconds or self.ttl_seconds)
+
+    def invalidate(self, *tags: str) -> None:
+        """Invalidate every entry cached under any of ``tags``."""
+        for tag in tags:
+            self._bump(tag)
+
+    @abstractmethod
+    def _tag_versions(self, tags: list[str]) -> list[int]:
+        """Current generation of each tag (0 if never bumped)."""
+
+    @abstractmethod
+    def _bump(self, tag: str) -> None:
+        """Move ``tag`` to a new generation."""
+
+    @abstractmethod
+    def _load(self, key: str) -> Optional[bytes]:
+        """The stored body for ``key``, or ``None`` if absent or expired."""
+
+    @abstractmethod
+    def _store(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        """Store ``value`` under ``key`` for ``ttl_seconds``."""
+
+
+class InMemoryResponseCache(ResponseCache):
+    """In-process LRU cache bounded by entry count, with per-entry TTL."""
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        super().__init__(ttl_seconds)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _tag_versions(self, tags: list[str]) -> list[int]:
+        return [self._versions.get(tag, 0) for tag in tags]
+
+    def _bump(self, tag: str) -> None:
+        with self._lock:
+            self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    def _load(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _store(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisResponseCache(ResponseCache):
+    """Cache shared across workers through a Redis-compatible client.
+
+    Only ``get``, ``set(ex=...)``, ``mget`` and ``incr`` are used, so any client
+    exposing that subset (e.g. an in-process stand-in in tests) can be passed.
+    Memory is bounded by the server's ``maxmemory``/LRU eviction policy.
+    """
+
+    def __init__(self, client: Any, ttl_seconds: int, prefix: str = "ats:cache:"):
+        super().__init__(ttl_seconds)
+        self.client = client
+        self.prefix = prefix
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def _tag_versions(self, tags: list[str]) -> list[int]:
+        if not tags:
+            return []
+        return [int(version or 0) for version in self.client.mget([self._tag_key(tag) for tag in tags])]
+
+    def _bump(self, tag: str) -> None:
+        self.client.incr(self._tag_key(tag))
+
+    def _load(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def _store(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        self.client.set(self.prefix + key, value, ex=ttl_seconds)
+
+
+def create_response_cache() -> ResponseCache:
+    """Create the response cache configured in settings."""
+    if settings.CACHE_BACKEND == "redis":
+        import redis
+
+        client = redis.Redis.from_url(settings.CACHE_URL)
+        return RedisResponseCache(client, settings.CACHE_TTL_SECONDS)
+    return InMemoryResponseCache(settings.CACHE_TTL_SECONDS, settings.CACHE_MAX_ENTRIES)
+
+
+response_cache = create_response_cache()
+
+
+def cache_scope(user) -> str:
+    """Scope cache entries by role; interviewers only ever see their own rows."""
+    if user.role == "interviewer":
+        return f"{user.role}:{user.id}"
+    return user.role
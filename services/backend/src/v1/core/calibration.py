@@ -0,0 +1,186 @@
+"""Interviewer calibration of feedback scores.
+
+Raw ``overall_rating`` values are not comparable across interviewers: a
+lenient interviewer's 80 may be a harsh one's 60. Each feedback row therefore
+also gets a ``calibrated_rating``:
+
+1. each of the four scores becomes a z-score against that interviewer's mean
+   and spread for that score;
+2. the z-scores are combined with the score weights, and the result becomes
+   a z-score against all feedback of the same round number;
+3. that is mapped back to the 0-100 scale of ``overall_rating`` using the mean
+   and spread of all overall ratings.
+
+Group statistics are shrunk toward the global ones with
+``CALIBRATION_PRIOR_WEIGHT`` pseudo-rows, so an interviewer with two reviews
+is only partly corrected. Feedback is immutable, so ``feedback_calibration``
+keeps every score in NumPy arrays, loads only rows it has not seen, recomputes
+all ratings in one vectorized pass and writes back only the ratings that moved
+by more than ``CALIBRATION_TOLERANCE``. New feedback is calibrated by
+``calibrate_new_feedback`` in a background task, off the request.
+"""
+import logging
+import threading
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..db.base import SessionLocal
+from ..db.bulk import update_by_id
+from ..models.interview import InterviewFeedback, InterviewRound
+from .changes import record_changes
+
+SCORE_COLUMNS = (
+    "technical_proficiency_score",
+    "attitude_score",
+    "code_cleanliness_score",
+    "communication_score",
+)
+
+# Floor for variances, so a group where every score is equal does not divide by zero
+EPSILON = 1e-9
+
+logger = logging.getLogger(__name__)
+
+
+def score_weights() -> np.ndarray:
+    """Weights of the scores in ``SCORE_COLUMNS`` order."""
+    return np.array([
+        settings.FEEDBACK_WEIGHT_TECHNICAL,
+        settings.FEEDBACK_WEIGHT_ATTITUDE,
+        settings.FEEDBACK_WEIGHT_CODE_CLEANLINESS,
+        settings.FEEDBACK_WEIGHT_COMMUNICATION,
+    ])
+
+
+def overall_rating(scores: dict) -> float:
+    """Weighted raw rating of one feedback."""
+    return float(np.array([scores[column] for column in SCORE_COLUMNS]) @ score_weights())
+
+
+def _standardize(values: np.ndarray, groups: np.ndarray, prior: float) -> np.ndarray:
+    """Z-scores of the ``(n, d)`` ``values`` within their group, with group stats shrunk toward the global ones."""
+    _, index = np.unique(groups, return_inverse=True)
+    index = index.reshape(-1)
+    size = index.max() + 1
+    counts = np.bincount(index, minlength=size)[:, None]
+    sums = np.column_stack([np.bincount(index, weights=column, minlength=size) for column in values.T])
+    squares = np.column_stack([np.bincount(index, weights=column ** 2, minlength=size) for column in values.T])
+    mean = (sums + prior * values.mean(axis=0)) / (counts + prior)
+    variance = (squares + prior * (values ** 2).mean(axis=0)) / (counts + prior) - mean ** 2
+    return (values - mean[index]) / np.sqrt(np.maximum(variance[index], EPSILON))
+
+
+def calibrate(
+    interviewers: np.ndarray,
+    rounds: np.ndarray,
+    scores: np.ndarray,
+    weights: np.ndarray,
+    prior: float,
+) -> np.ndarray:
+    """Calibrated ratings of feedback rows given their interviewer, round number and ``(n, 4)`` scores."""
+    if not len(scores):
+        return np.empty(0)
+    by_interviewer = _standardize(scores, interviewers, prior)
+    by_round = _standardize((by_interviewer @ weights)[:, None], rounds, prior)[:, 0]
+    overall = scores @ weights
+    return np.clip(overall.mean() + by_round * overall.std(), 0, 100)
+
+
+class FeedbackCalibration:
+    """Feedback scores held in memory, recalibrated as new feedback arrives."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clear()
+
+    def _clear(self) -> None:
+        self.ids = np.empty(0, dtype=np.int64)
+        self.interviewers = np.empty(0, dtype=np.int64)
+        self.rounds = np.empty(0, dtype=np.int64)
+        self.scores = np.empty((0, len(SCORE_COLUMNS)))
+        self.stored = np.empty(0)
+
+    def _load(self, db: Session, after_id: int = 0) -> None:
+        # Feedback of deleted rounds still says how the interviewer scores
+        query = db.query(
+            InterviewFeedback.id,
+            InterviewFeedback.interviewer_id,
+            InterviewRound.round_number,
+            *[getattr(InterviewFeedback, column) for column in SCORE_COLUMNS],
+            InterviewFeedback.calibrated_rating,
+        ).join(
+            InterviewRound, InterviewRound.id == InterviewFeedback.interview_round_id
+        ).filter(
+            InterviewFeedback.id > after_id
+        ).order_by(InterviewFeedback.id).execution_options(include_deleted=True)
+        rows = np.array(query.all(), dtype=float)  # a missing calibrated_rating becomes NaN
+        if not len(rows):
+            return
+        self.ids = np.concatenate([self.ids, rows[:, 0].astype(np.int64)])
+        self.interviewers = np.concatenate([self.interviewers, rows[:, 1].astype(np.int64)])
+        self.rounds = np.concatenate([self.rounds, rows[:, 2].astype(np.int64)])
+        self.scores = np.concatenate([self.scores, rows[:, 3:-1]])
+        self.stored = np.concatenate([self.stored, rows[:, -1]])
+
+    def recalibrate(self, db: Session, full: bool = False) -> dict[int, float]:
+        """Load unseen feedback, recompute all calibrated ratings and write the ones that moved.
+
+        Returns the written ratings by feedback id. ``full`` reloads every
+        row first, e.g. after the weights changed. The caller commits.
+        """
+        with self._lock:
+            if full or not len(self.ids):
+                self._clear()
+                self._load(db)
+            else:
+                self._load(db, int(self.ids[-1]))
+                # Rows committed out of id order were missed by the incremental load
+                if db.query(func.count(InterviewFeedback.id)).scalar() != len(self.ids):
+                    self._clear()
+                    self._load(db)
+
+            ratings = calibrate(
+                self.interviewers,
+                self.rounds,
+                self.scores,
+                score_weights(),
+                settings.CALIBRATION_PRIOR_WEIGHT,
+            )
+            moved = ~(np.abs(ratings - self.stored) <= settings.CALIBRATION_TOLERANCE)  # NaN counts as moved
+            written = dict(zip(self.ids[moved].tolist(), ratings[moved].round(2).tolist()))
+            if written:
+                # Calibration is derived data: it must not bump updated_at, which marks edited feedback
+                update_by_id(
+                    db,
+                    InterviewFeedback,
+                    list(written),
+                    {"calibrated_rating": list(written.values())},
+                    updated_at=InterviewFeedback.__table__.c.updated_at,
+                )
+                self.stored[moved] = ratings[moved].round(2)
+                record_changes(db, "feedback", written)
+            return written
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+feedback_calibration = FeedbackCalibration()
+
+
+def calibrate_new_feedback() -> None:
+    """Calibrate new feedback in a session of its own (background task entry point)."""
+    db = SessionLocal()
+    try:
+        written = feedback_calibration.recalibrate(db)
+        db.commit()
+        if written:
+            logger.info("Rewrote %d calibrated ratings", len(written))
+    except Exception:
+        logger.exception("Feedback calibration failed")
+        db.rollback()
+    finally:
+        db.close()
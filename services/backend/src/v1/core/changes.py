@@ -0,0 +1,199 @@
+"""Change feed for incremental client sync.
+
+The candidate, interview and feedback write paths call ``record_changes`` in
+their transaction, adding one ``change_log`` row per written resource. The
+row id is the feed's sequence: a client keeps the last ``cursor`` it was
+given and asks for what changed after it.
+
+A sequence is only a safe cursor if ids become visible in order. On
+PostgreSQL ``record_changes`` therefore takes a transaction-level advisory
+lock, so change-log writers commit one after the other and a transaction
+that took a lower id can never commit after a reader has moved past a higher
+one; writers call it just before committing to keep that window short.
+SQLite allows one writer at a time anyway.
+
+``read_changes`` collapses several changes of one resource into the latest
+and reports the resource as it is now: its current representation, or a
+deletion if it is gone. A page is thus the smallest delta that brings a
+client up to date. ``change_watcher`` lets
+long-polling requests wait for new changes while sharing one cheap probe of
+the newest sequence per worker.
+"""
+import asyncio
+from typing import Iterable, Optional
+
+from sqlalchemy import func, insert, text
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..db.base import SessionLocal
+from ..models.candidate import Candidate
+from ..models.change_log import ChangeLog
+from ..models.interview import InterviewFeedback, InterviewRound
+from ..models.user import User
+from .serialization import (
+    CANDIDATE_RESPONSE_COLUMNS,
+    FEEDBACK_RESPONSE_COLUMNS,
+    INTERVIEW_RESPONSE_COLUMNS,
+    candidate_rows_to_dicts,
+    rows_to_dicts,
+)
+
+# Key of the PostgreSQL advisory lock that orders change-log writers
+CHANGE_LOG_LOCK = 0x43484E47
+
+RESOURCE_TYPES = ("candidate", "interview", "feedback")
+
+
+class CursorExpired(ValueError):
+    """The cursor is older than the retained change log; the client must reload."""
+
+
+def record_changes(db: Session, resource_type: str, resource_ids: Iterable[int]) -> None:
+    """Log writes (including deletions) to resources in the caller's transaction; the caller commits."""
+    resource_ids = list(dict.fromkeys(resource_ids))
+    if not resource_ids:
+        return
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": CHANGE_LOG_LOCK})
+    db.execute(insert(ChangeLog), [
+        {"resource_type": resource_type, "resource_id": resource_id}
+        for resource_id in resource_ids
+    ])
+
+
+def latest_sequence(db: Session) -> int:
+    """The newest sequence number, or 0 for an empty log."""
+    return db.query(func.max(ChangeLog.id)).scalar() or 0
+
+
+def _current_rows(db: Session, resource_type: str, ids: list[int], user: User) -> dict[int, dict]:
+    """Current representation of live resources the user may see, by id."""
+    if resource_type == "candidate":
+        rows = db.query(*CANDIDATE_RESPONSE_COLUMNS).filter(Candidate.id.in_(ids))
+        return {row["id"]: row for row in candidate_rows_to_dicts(db, rows)}
+    if resource_type == "interview":
+        query = db.query(*INTERVIEW_RESPONSE_COLUMNS).filter(InterviewRound.id.in_(ids))
+        if user.role == "interviewer":
+            query = query.filter(InterviewRound.interviewer_id == user.id)
+        return {row["id"]: row for row in rows_to_dicts(query)}
+    query = db.query(*FEEDBACK_RESPONSE_COLUMNS).filter(InterviewFeedback.id.in_(ids))
+    if user.role == "interviewer":
+        query = query.filter(InterviewFeedback.interviewer_id == user.id)
+    return {row["id"]: row for row in rows_to_dicts(query)}
+
+
+def _visible_deletions(db: Session, resource_type: str, ids: list[int], user: User) -> set[int]:
+    """The deleted resources among ``ids`` that the user may hear about."""
+    if user.role != "interviewer" or resource_type == "candidate":
+        return set(ids)
+    model = InterviewRound if resource_type == "interview" else InterviewFeedback
+    query = db.query(model.id).filter(model.id.in_(ids), model.interviewer_id == user.id)
+    return {row_id for (row_id,) in query.execution_options(include_deleted=True)}
+
+
+def read_changes(db: Session, since: int, limit: int, user: User) -> dict:
+    """Changes after sequence ``since`` as compact deltas, at most one per resource.
+
+    Raises ``CursorExpired`` when changes after ``since`` were already
+    removed by retention.
+    """
+    oldest = db.query(func.min(ChangeLog.id)).scalar()
+    if oldest is not None and since < oldest - 1:
+        raise CursorExpired("Cursor is older than the retained change log; reload and start from a new cursor")
+
+    entries = (
+        db.query(ChangeLog.id, ChangeLog.resource_type, ChangeLog.resource_id)
+        .filter(ChangeLog.id > since)
+        .order_by(ChangeLog.id)
+        .limit(limit + 1)
+        .all()
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    if not entries:
+        return {"changes": [], "cursor": since, "has_more": False}
+
+    # Later changes of a resource supersede earlier ones in the same page
+    latest = {}
+    for sequence, resource_type, resource_id in entries:
+        latest[(resource_type, resource_id)] = sequence
+
+    changes = []
+    for resource_type in RESOURCE_TYPES:
+        ids = [resource_id for (kind, resource_id) in latest if kind == resource_type]
+        if not ids:
+            continue
+        current = _current_rows(db, resource_type, ids, user)
+        # A resource that is gone (or hidden from this user) now is reported as deleted
+        gone = [resource_id for resource_id in ids if resource_id not in current]
+        deletions = _visible_deletions(db, resource_type, gone, user) if gone else set()
+        for resource_id in ids:
+            if resource_id in current:
+                changes.append({
+                    "sequence": latest[(resource_type, resource_id)],
+                    "resource_type": resource_type,
+                    "resource_id": resource_id,
+                    "action": "upsert",
+                    "data": current[resource_id],
+                })
+            elif resource_id in deletions:
+                changes.append({
+                    "sequence": latest[(resource_type, resource_id)],
+                    "resource_type": resource_type,
+                    "resource_id": resource_id,
+                    "action": "delete",
+                    "data": None,
+                })
+    changes.sort(key=lambda change: change["sequence"])
+    return {"changes": changes, "cursor": entries[-1].id, "has_more": has_more}
+
+
+def _probe() -> int:
+    db = SessionLocal()
+    try:
+        return latest_sequence(db)
+    finally:
+        db.close()
+
+
+class ChangeWatcher:
+    """Wakes long-polling requests when the change log grows.
+
+    While any request is waiting, one task per worker probes the newest
+    sequence every ``CHANGES_POLL_INTERVAL`` seconds, however many clients
+    are waiting.
+    """
+
+    def __init__(self):
+        self.latest = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._task: Optional[asyncio.Task] = None
+        self._waiters = 0
+
+    async def wait(self, since: int, timeout: float) -> None:
+        """Return once a change after ``since`` exists, or after ``timeout`` seconds."""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        self._waiters += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        try:
+            async with self._condition:
+                await asyncio.wait_for(self._condition.wait_for(lambda: self.latest > since), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._waiters -= 1
+
+    async def _run(self) -> None:
+        while self._waiters:
+            latest = await asyncio.to_thread(_probe)
+            if latest > self.latest:
+                self.latest = latest
+                async with self._condition:
+                    self._condition.notify_all()
+            await asyncio.sleep(settings.CHANGES_POLL_INTERVAL)
+
+
+change_watcher = ChangeWatcher()
@@ -0,0 +1,86 @@
+"""Conditional requests for candidate, interview and feedback resources.
+
+Detail responses carry a weak ``ETag`` naming the resource's version: the
+newest change-log sequence recorded for it (see ``core/changes.py``) and its
+``updated_at`` (``created_at`` before the first update). The version is read
+with one indexed probe, so a ``GET`` whose ``If-None-Match`` still names it is
+answered with 304 before the resource is loaded and serialized, and a ``PUT``
+whose ``If-Match`` names an older version is refused with 412 instead of
+overwriting a change the client has not seen. The tags name versions rather
+than bytes, so both headers use the weak comparison.
+
+List tags combine the newest sequence of the whole change log with the
+request's parameters and the caller's scope: any recorded write changes
+every list tag. Candidate representations embed signed preview URLs that
+rotate with ``preview_window``, which is therefore part of candidate tags.
+
+Versions are probed before the body is built, so a write that lands in
+between yields a body newer than its tag: the next request revalidates, and a
+stale body is never confirmed.
+"""
+import hashlib
+import json
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..models.candidate import Candidate
+from ..models.change_log import ChangeLog
+from ..models.interview import InterviewFeedback, InterviewRound
+from ..services.preview_service import preview_window
+from .changes import latest_sequence
+
+RESOURCE_MODELS = {
+    "candidate": Candidate,
+    "interview": InterviewRound,
+    "feedback": InterviewFeedback,
+}
+
+# Clients may keep tagged responses but must revalidate them; shared caches must not store them
+CACHE_CONTROL = "private, no-cache"
+
+
+def weak_etag(*parts) -> str:
+    """A weak entity tag over ``parts``."""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Whether an ``If-None-Match``/``If-Match`` value names ``etag`` (weak comparison; ``*`` matches)."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def resource_etag(db: Session, resource_type: str, *criteria) -> Optional[str]:
+    """Tag of the live resource matching ``criteria``, or ``None`` if there is none."""
+    model = RESOURCE_MODELS[resource_type]
+    latest_change = (
+        select(func.max(ChangeLog.id))
+        .where(ChangeLog.resource_type == resource_type, ChangeLog.resource_id == model.id)
+        .scalar_subquery()
+    )
+    row = db.query(
+        model.id, func.coalesce(model.updated_at, model.created_at), latest_change
+    ).filter(*criteria).first()
+    if row is None:
+        return None
+    if resource_type == "candidate":
+        return weak_etag(resource_type, *row, preview_window())
+    return weak_etag(resource_type, *row)
+
+
+def list_etag(db: Session, namespace: str, params: dict, scope: str) -> str:
+    """Tag of a list response for ``params`` as seen by ``scope``."""
+    normalized = json.dumps(params, sort_keys=True, default=str, separators=(",", ":"))
+    return weak_etag(namespace, scope, normalized, latest_sequence(db), preview_window())
+
+
+def etag_headers(etag: str) -> dict[str, str]:
+    """Headers sent with a tagged response (and with its 304)."""
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
@@ -0,0 +1,62 @@
+"""Totals for paginated lists.
+
+An exact ``COUNT(*)`` over a large filtered set costs about as much as
+reading the set. List endpoints therefore pick a count strategy:
+
+- ``exact``: always ``COUNT(*)``.
+- ``estimate``: the PostgreSQL planner's row estimate for the query
+  (``EXPLAIN``), which is nearly free but approximate.
+- ``cached``: an exact count, reused for ``COUNT_CACHE_TTL_SECONDS`` per
+  filter combination, so it may lag behind recent writes.
+- ``auto``: exact when the planner expects at most ``COUNT_EXACT_THRESHOLD``
+  rows, the estimate otherwise.
+
+Databases without planner estimates (SQLite) always count exactly. Callers
+report whether the total is exact, and derive ``has_next`` from the page
+itself rather than from the total.
+"""
+import json
+from typing import Optional
+
+from sqlalchemy.orm import Query, Session
+
+from ..config import settings
+from ..db.soft_delete import exclude_deleted
+from .cache import response_cache
+
+
+def estimate_count(db: Session, query: Query) -> Optional[int]:
+    """The planner's row estimate for ``query`` on PostgreSQL; ``None`` elsewhere."""
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+    statement = query.order_by(None).statement
+    if not query.get_execution_options().get("include_deleted", False):
+        statement = exclude_deleted(statement)
+    compiled = statement.compile(dialect=bind.dialect)
+    plan = db.connection().exec_driver_sql(
+        "EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_rows(db: Session, query: Query, strategy: Optional[str], cache_key: str) -> tuple[int, bool]:
+    """Return ``(total, exact)`` for ``query`` using ``strategy``.
+
+    ``cache_key`` identifies the filter combination for the ``cached`` strategy.
+    """
+    strategy = strategy or settings.LIST_COUNT_STRATEGY
+    if strategy in ("auto", "estimate"):
+        estimate = estimate_count(db, query)
+        if estimate is not None and (strategy == "estimate" or estimate > settings.COUNT_EXACT_THRESHOLD):
+            return estimate, False
+    elif strategy == "cached":
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return int(cached), False
+        total = query.count()
+        response_cache.set(cache_key, str(total).encode(), settings.COUNT_CACHE_TTL_SECONDS)
+        return total, True
+    return query.count(), True
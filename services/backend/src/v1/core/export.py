@@ -0,0 +1,266 @@
+"""Candidate export helpers.
+
+Rows are read through a server-side cursor and written out in small chunks so
+that memory use stays flat regardless of how many candidates are exported.
+"""
+import csv
+import io
+import json
+import zipfile
+from datetime import date, datetime
+from typing import Iterable, Iterator, Optional
+from xml.sax.saxutils import escape
+
+from sqlalchemy import and_, func, literal_column, select
+from sqlalchemy.orm import Query, Session, aliased
+
+from ..models.bucket import ResumeBucket
+from ..models.candidate import Candidate, CandidateBucket, CandidateSkill
+from ..models.interview import InterviewRound
+from ..models.skill import Skill
+
+EXPORT_COLUMNS = [
+    "id",
+    "name",
+    "email",
+    "phone_number",
+    "location",
+    "years_of_experience",
+    "current_salary",
+    "expected_salary",
+    "status",
+    "source",
+    "objective_rating",
+    "remarks",
+    "resume_url",
+    "upload_date",
+    "created_at",
+    "updated_at",
+    "buckets",
+    "skills",
+    "latest_round_number",
+    "latest_round_status",
+]
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def _string_agg(column, dialect_name: str):
+    """Aggregate a text column into a comma separated list."""
+    if dialect_name == "postgresql":
+        return func.string_agg(column, literal_column("', '"))
+    return func.group_concat(column, ", ")
+
+
+def build_export_query(query: Query, dialect_name: str) -> Query:
+    """Project a filtered candidate query onto the export columns.
+
+    Bucket names, skill names and the latest interview round are joined in as
+    grouped subqueries so each candidate costs one row of a single query.
+    """
+    bucket_names = (
+        select(
+            CandidateBucket.candidate_id.label("candidate_id"),
+            _string_agg(ResumeBucket.name, dialect_name).label("names"),
+        )
+        .join(ResumeBucket, ResumeBucket.id == CandidateBucket.bucket_id)
+        .group_by(CandidateBucket.candidate_id)
+        .subquery()
+    )
+    skill_names = (
+        select(
+            CandidateSkill.candidate_id.label("candidate_id"),
+            _string_agg(Skill.name, dialect_name).label("names"),
+        )
+        .join(Skill, Skill.id == CandidateSkill.skill_id)
+        .group_by(CandidateSkill.candidate_id)
+        .subquery()
+    )
+    latest_round_number = (
+        select(
+            InterviewRound.candidate_id.label("candidate_id"),
+            func.max(InterviewRound.round_number).label("round_number"),
+        )
+        .where(InterviewRound.deleted_at == None)
+        .group_by(InterviewRound.candidate_id)
+        .subquery()
+    )
+    latest_round = aliased(InterviewRound)
+
+    return (
+        query.with_entities(
+            *[getattr(Candidate, column) for column in EXPORT_COLUMNS[:16]],
+            bucket_names.c.names,
+            skill_names.c.names,
+            latest_round.round_number,
+            latest_round.status,
+        )
+        .outerjoin(bucket_names, bucket_names.c.candidate_id == Candidate.id)
+        .outerjoin(skill_names, skill_names.c.candidate_id == Candidate.id)
+        .outerjoin(latest_round_number, latest_round_number.c.candidate_id == Candidate.id)
+        .outerjoin(
+            latest_round,
+            and_(
+                latest_round.candidate_id == Candidate.id,
+                latest_round.round_number == latest_round_number.c.round_number,
+                latest_round.deleted_at == None,
+            ),
+        )
+        .order_by(Candidate.id)
+    )
+
+
+def iter_export_rows(query: Query, session: Session, batch_size: int) -> Iterator[tuple]:
+    """Yield export rows from a server-side cursor, closing the session when done."""
+    try:
+        for row in query.with_session(session).yield_per(batch_size):
+            yield tuple(row)
+    finally:
+        session.close()
+
+
+def _format_value(value) -> Optional[str]:
+    """Convert a column value to a plain export value."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def stream_csv(rows: Iterable[tuple], chunk_rows: int = 500) -> Iterator[str]:
+    """Stream rows as CSV text."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    pending = 0
+    for row in rows:
+        writer.writerow([_format_value(value) for value in row])
+        pending += 1
+        if pending >= chunk_rows:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue()
+
+
+def stream_ndjson(rows: Iterable[tuple], chunk_rows: int = 500) -> Iterator[str]:
+    """Stream rows as newline delimited JSON objects."""
+    lines = []
+    for row in rows:
+        record = dict(zip(EXPORT_COLUMNS, (_format_value(value) for value in row)))
+        lines.append(json.dumps(record))
+        if len(lines) >= chunk_rows:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+class _ChunkBuffer(io.RawIOBase):
+    """Write-only, non-seekable sink that hands written bytes back to the caller."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    "</Types>"
+)
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Candidates" sheetId="1" r:id="rId1"/></sheets>'
+    "</workbook>"
+)
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    "</Relationships>"
+)
+
+
+def _xlsx_row(values) -> str:
+    """Render one worksheet row using inline strings and numeric cells."""
+    cells = []
+    for value in values:
+        value = _format_value(value)
+        if value is None:
+            cells.append("<c/>")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            cells.append(f"<c><v>{value}</v></c>")
+        else:
+            cells.append(f'<c t="inlineStr"><is><t>{escape(str(value))}</t></is></c>')
+    return "<row>" + "".join(cells) + "</row>"
+
+
+def stream_xlsx(rows: Iterable[tuple], chunk_rows: int = 500) -> Iterator[bytes]:
+    """Stream rows as a single-sheet XLSX workbook.
+
+    The zip container is written to a non-seekable sink, so entries use data
+    descriptors and the sheet is flushed to the client as it is produced.
+    """
+    sink = _ChunkBuffer()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _XLSX_CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _XLSX_ROOT_RELS)
+        archive.writestr("xl/workbook.xml", _XLSX_WORKBOOK)
+        archive.writestr("xl/_rels/workbook.xml.rels", _XLSX_WORKBOOK_RELS)
+        with archive.open("xl/worksheets/sheet1.xml", mode="w", force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                b"<sheetData>"
+            )
+            sheet.write(_xlsx_row(EXPORT_COLUMNS).encode("utf-8"))
+            pending = 0
+            for row in rows:
+                sheet.write(_xlsx_row(row).encode("utf-8"))
+                pending += 1
+                if pending >= chunk_rows:
+                    yield sink.drain()
+                    pending = 0
+            sheet.write(b"</sheetData></worksheet>")
+    yield sink.drain()
+
+
+EXPORT_WRITERS = {
+    "csv": stream_csv,
+    "ndjson": stream_ndjson,
+    "xlsx": stream_xlsx,
+}
@@ -0,0 +1,125 @@
+"""File responses with HTTP Range, conditional GET and zero-copy support."""
+import os
+import re
+from typing import Optional
+
+import anyio
+from starlette.responses import FileResponse, Response
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """Parse a single-range ``Range`` header into inclusive ``(start, end)``.
+
+    Returns ``None`` when the header is absent or not a single byte range
+    (the full file is served) and raises ``ValueError`` if it cannot be satisfied.
+    """
+    if not header:
+        return None
+    match = _RANGE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError("unsatisfiable range")
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("unsatisfiable range")
+    return start, end
+
+
+class ContentAddressedFileResponse(FileResponse):
+    """Serve a content-addressed file.
+
+    The content hash is a strong ``ETag``; ``If-None-Match`` is answered with
+    304 and single byte ranges with 206. When the server offers the ASGI
+    ``http.response.zerocopysend`` extension the body is sent with
+    ``sendfile`` instead of being copied through Python.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        content_hash: str,
+        request_headers,
+        media_type: Optional[str] = None,
+        filename: Optional[str] = None,
+        method: Optional[str] = None,
+    ):
+        super().__init__(
+            path,
+            media_type=media_type,
+            filename=filename,
+            method=method,
+            content_disposition_type="inline",
+        )
+        self.etag = f'"{content_hash}"'
+        self.if_none_match = request_headers.get("if-none-match")
+        self.range_header = request_headers.get("range")
+        self.if_range = request_headers.get("if-range")
+        self.headers["etag"] = self.etag
+        self.headers["accept-ranges"] = "bytes"
+        self.headers["cache-control"] = "private, max-age=3600"
+
+    async def __call__(self, scope, receive, send) -> None:
+        stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+        size = stat_result.st_size
+        self.set_stat_headers(stat_result)
+
+        if self.if_none_match and self.etag in [tag.strip() for tag in self.if_none_match.split(",")]:
+            await Response(status_code=304, headers={"etag": self.etag})(scope, receive, send)
+            return
+
+        byte_range = None
+        if self.range_header and (not self.if_range or self.if_range == self.etag):
+            try:
+                byte_range = parse_range(self.range_header, size)
+            except ValueError:
+                await Response(
+                    status_code=416, headers={"content-range": f"bytes */{size}"}
+                )(scope, receive, send)
+                return
+
+        start, end = byte_range if byte_range else (0, size - 1)
+        length = end - start + 1 if size else 0
+        if byte_range:
+            self.status_code = 206
+            self.headers["content-range"] = f"bytes {start}-{end}/{size}"
+        self.headers["content-length"] = str(length)
+
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if self.send_header_only or length == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        elif "http.response.zerocopysend" in scope.get("extensions", {}):
+            with open(self.path, "rb") as file:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": file.fileno(),
+                    "offset": start,
+                    "count": length,
+                    "more_body": False,
+                })
+        else:
+            async with await anyio.open_file(self.path, mode="rb") as file:
+                await file.seek(start)
+                remaining = length
+                while remaining:
+                    chunk = await file.read(min(self.chunk_size, remaining))
+                    remaining -= len(chunk)
+                    await send({
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": bool(remaining) and bool(chunk),
+                    })
+                    if not chunk:
+                        break
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,149 @@
+"""Transactional email outbox.
+
+No email is sent while a request is handled. The emails a change triggers are
+rendered from ``EMAIL_TEMPLATES`` and inserted into ``email_outbox`` with one
+multi-row ``INSERT`` in the caller's transaction, so they exist exactly when
+the change commits. The dispatcher in ``services/email_service.py`` delivers
+them in the background. Nothing is queued while ``EMAIL_ENABLED`` is off.
+"""
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.candidate import Candidate
+from ..models.email_outbox import EmailOutbox
+from ..models.interview import InterviewRound
+from ..models.user import User
+from .scheduling import to_utc
+
+SIGNATURE = "\n\nuCube.ai Recruiting"
+
+# kind -> (subject, body) format strings
+EMAIL_TEMPLATES = {
+    "interview_invite": (
+        "Interview invitation: {round_name}",
+        "Hello {name},\n\nYou are invited to the {round_name} interview (round {round_number}) "
+        "on {when}, lasting {duration} minutes.",
+    ),
+    "interviewer_invite": (
+        "Interview scheduled: {candidate_name}, {round_name}",
+        "Hello {name},\n\nYou are interviewing {candidate_name} for the {round_name} round "
+        "(round {round_number}) on {when}, lasting {duration} minutes.",
+    ),
+    "rejection_notice": (
+        "Your application at uCube.ai",
+        "Hello {name},\n\nThank you for your interest in uCube.ai. After careful consideration "
+        "we will not be moving forward with your application.",
+    ),
+    "upload_confirmation": (
+        "{count} resumes uploaded",
+        "Hello {name},\n\nYour upload of {count} resumes is stored: {created} new candidate "
+        "profiles, {duplicates} files already on record, {unparsed} without a name and email "
+        "that need manual entry.",
+    ),
+}
+
+
+def render_email(
+    kind: str,
+    to_address: str,
+    related_resource_type: Optional[str] = None,
+    related_resource_id: Optional[int] = None,
+    **values,
+) -> dict:
+    """An outbox row for template ``kind`` filled with ``values``."""
+    subject, body = EMAIL_TEMPLATES[kind]
+    return {
+        "kind": kind,
+        "to_address": to_address,
+        "subject": subject.format(**values),
+        "body": body.format(**values) + SIGNATURE,
+        "related_resource_type": related_resource_type,
+        "related_resource_id": related_resource_id,
+    }
+
+
+def queue_emails(db: Session, emails: list[dict]) -> None:
+    """Insert rendered emails into the outbox; the caller commits."""
+    if settings.EMAIL_ENABLED and emails:
+        db.execute(insert(EmailOutbox), emails)
+
+
+def _when(value: datetime) -> str:
+    return f"{to_utc(value):%A %d %B %Y, %H:%M} UTC"
+
+
+def queue_interview_invites(db: Session, interviews: Iterable[InterviewRound]) -> None:
+    """Invite the candidate and the interviewer of each scheduled round with a date."""
+    interviews = [
+        interview for interview in interviews
+        if interview.scheduled_date is not None and interview.status == "scheduled"
+    ]
+    if not settings.EMAIL_ENABLED or not interviews:
+        return
+    candidates = {
+        row.id: row for row in db.query(Candidate.id, Candidate.name, Candidate.email).filter(
+            Candidate.id.in_({interview.candidate_id for interview in interviews})
+        )
+    }
+    interviewers = {
+        row.id: row for row in db.query(User.id, User.username, User.email).filter(
+            User.id.in_({interview.interviewer_id for interview in interviews})
+        )
+    }
+
+    emails = []
+    for interview in interviews:
+        candidate = candidates.get(interview.candidate_id)
+        interviewer = interviewers.get(interview.interviewer_id)
+        if candidate is None:
+            continue
+        values = {
+            "round_name": interview.round_name,
+            "round_number": interview.round_number,
+            "when": _when(interview.scheduled_date),
+            "duration": interview.duration or settings.INTERVIEW_DEFAULT_DURATION,
+        }
+        emails.append(render_email(
+            "interview_invite", candidate.email, "interview", interview.id, name=candidate.name, **values
+        ))
+        if interviewer is not None:
+            emails.append(render_email(
+                "interviewer_invite",
+                interviewer.email,
+                "interview",
+                interview.id,
+                name=interviewer.username,
+                candidate_name=candidate.name,
+                **values,
+            ))
+    queue_emails(db, emails)
+
+
+def queue_rejection_notices(db: Session, candidates: Iterable) -> None:
+    """Tell rejected candidates (rows with ``id``, ``name`` and ``email``)."""
+    queue_emails(db, [
+        render_email("rejection_notice", candidate.email, "candidate", candidate.id, name=candidate.name)
+        for candidate in candidates
+    ])
+
+
+def queue_upload_confirmation(db: Session, uploader: User, results: list[dict]) -> None:
+    """Confirm a batch upload to the uploader with one email."""
+    if not results:
+        return
+    created = sum(1 for result in results if result["candidate_id"])
+    duplicates = sum(1 for result in results if result["duplicate"])
+    unparsed = sum(1 for result in results if not (result["parsed"]["name"] and result["parsed"]["email"]))
+    queue_emails(db, [render_email(
+        "upload_confirmation",
+        uploader.email,
+        name=uploader.username,
+        count=len(results),
+        created=created,
+        duplicates=duplicates,
+        unparsed=unparsed,
+    )])
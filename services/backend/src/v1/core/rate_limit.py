@@ -0,0 +1,209 @@
+"""Request rate limiting.
+
+Each client gets a token bucket holding up to ``RATE_LIMIT_REQUESTS_PER_MINUTE``
+tokens that refills continuously. Requests spend tokens according to the
+route's cost, so expensive endpoints (exports, search) drain the bucket faster.
+Clients are keyed by the user id in their access token, falling back to the
+client IP for anonymous requests and always using the IP for ``/auth/login``.
+"""
+import json
+import math
+import re
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from ..config import settings
+from .security import decode_token
+
+# (method, path pattern, cost); first match wins, default cost is 1
+ROUTE_COSTS = [
+    ("GET", re.compile(r"/candidates/export$"), 10),
+]
+# Full-text search through the list endpoints (GET /candidates?search=...)
+SEARCH_COST = 3
+
+EXEMPT_PATHS = re.compile(r"/(health|ready)$")
+
+
+class InMemoryRateLimiter:
+    """Token buckets kept in process memory.
+
+    ``acquire`` never awaits, so each bucket update runs to completion on the
+    event loop without locks. Buckets are kept in least recently seen order.
+    Once there are ``max_keys`` of them, the ones idle long enough to have
+    refilled (equivalent to new ones) are dropped, then the least recently
+    seen until there is room, so memory stays bounded however many keys are
+    active.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float, max_keys: int = 100_000):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, list[float]] = OrderedDict()
+
+    async def acquire(self, key: str, cost: float = 1) -> float:
+        """Spend ``cost`` tokens; return 0 if allowed, otherwise seconds until it would be."""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self._prune(now)
+            bucket = self._buckets[key] = [self.capacity, now]
+        else:
+            self._buckets.move_to_end(key)
+        tokens = min(self.capacity, bucket[0] + (now - bucket[1]) * self.refill_per_second)
+        bucket[1] = now
+        if tokens >= cost:
+            bucket[0] = tokens - cost
+            return 0
+        bucket[0] = tokens
+        return (cost - tokens) / self.refill_per_second
+
+    def _prune(self, now: float) -> None:
+        full_after = self.capacity / self.refill_per_second
+        while self._buckets:
+            key, (_, last) = next(iter(self._buckets.items()))
+            if now - last < full_after and len(self._buckets) < self.max_keys:
+                break
+            del self._buckets[key]
+
+
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisRateLimiter:
+    """Token buckets shared by all workers, updated atomically by a Lua script.
+
+    ``client`` is an asyncio Redis-compatible client exposing ``eval``.
+    """
+
+    def __init__(self, client, capacity: float, refill_per_second: float, prefix: str = "ats:ratelimit:"):
+        self.client = client
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.prefix = prefix
+
+    async def acquire(self, key: str, cost: float = 1) -> float:
+        """Spend ``cost`` tokens; return 0 if allowed, otherwise seconds until it would be."""
+        allowed, tokens = await self.client.eval(
+            _TOKEN_BUCKET_SCRIPT,
+            1,
+            self.prefix + key,
+            self.capacity,
+            self.refill_per_second,
+            time.time(),
+            cost,
+        )
+        if int(allowed):
+            return 0
+        return (cost - float(tokens)) / self.refill_per_second
+
+
+def create_rate_limiter(per_minute: int):
+    """Create a limiter for ``per_minute`` requests using the configured backend."""
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(settings.RATE_LIMIT_STORE_URL)
+        return RedisRateLimiter(client, per_minute, per_minute / 60)
+    return InMemoryRateLimiter(per_minute, per_minute / 60)
+
+
+def route_cost(method: str, path: str, query_string: bytes) -> int:
+    """Return the token cost of a request."""
+    for route_method, pattern, cost in ROUTE_COSTS:
+        if method == route_method and pattern.search(path):
+            return cost
+    if method == "GET" and b"search=" in query_string:
+        return SEARCH_COST
+    return 1
+
+
+def _client_ip(scope) -> str:
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _user_id(scope) -> Optional[str]:
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer":
+                return None
+            payload = decode_token(token)
+            if payload and payload.get("type") == "access":
+                return payload.get("sub")
+            return None
+    return None
+
+
+class RateLimitMiddleware:
+    """ASGI middleware enforcing per-user and per-IP login rate limits."""
+
+    def __init__(self, app):
+        self.app = app
+        self.enabled = settings.RATE_LIMIT_ENABLED
+        self.user_limiter = create_rate_limiter(settings.RATE_LIMIT_REQUESTS_PER_MINUTE)
+        self.login_limiter = create_rate_limiter(settings.RATE_LIMIT_LOGIN_PER_MINUTE)
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if (
+            not self.enabled
+            or scope["type"] != "http"
+            or not path.startswith("/api/")
+            or EXEMPT_PATHS.search(path)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "POST" and path.endswith("/auth/login"):
+            retry_after = await self.login_limiter.acquire(f"login:{_client_ip(scope)}")
+        else:
+            user_id = _user_id(scope)
+            key = f"user:{user_id}" if user_id else f"ip:{_client_ip(scope)}"
+            cost = route_cost(scope["method"], path, scope.get("query_string", b""))
+            retry_after = await self.user_limiter.acquire(key, cost)
+
+        if retry_after:
+            await self._reject(send, math.ceil(retry_after))
+            return
+        await self.app(scope, receive, send)
+
+    async def _reject(self, send, retry_after: int) -> None:
+        body = json.dumps({
+            "error": {
+                "code": "RATE_LIMIT_EXCEEDED",
+                "message": "Too many requests",
+                "details": {"retry_after": retry_after},
+            }
+        }).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"retry-after", str(retry_after).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
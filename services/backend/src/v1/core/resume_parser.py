@@ -0,0 +1,76 @@
+"""Heuristic resume parser.
+
+Extracts plain text from PDF/DOCX resumes on disk and pulls out the contact
+fields needed to create a candidate profile. This is the Phase 1 parser; it
+works from a file path so uploads can be handed over without re-reading them
+into memory.
+"""
+import re
+from typing import Optional
+
+PDF = "application/pdf"
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+MAX_TEXT_CHARS = 20_000
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE_RE = re.compile(r"\+?\d[\d \t().-]{8,}\d")
+EXPERIENCE_RE = re.compile(r"(\d{1,2})\+?\s*(?:years?|yrs?)", re.IGNORECASE)
+
+
+def extract_text(file_path: str, content_type: str, max_chars: int = MAX_TEXT_CHARS) -> str:
+    """Extract up to ``max_chars`` of text from a resume file, reading no further than needed."""
+    parts = []
+    length = 0
+    if content_type == PDF:
+        from PyPDF2 import PdfReader
+
+        for page in PdfReader(file_path).pages:
+            text = page.extract_text() or ""
+            parts.append(text)
+            length += len(text)
+            if length >= max_chars:
+                break
+    elif content_type == DOCX:
+        import docx
+
+        for paragraph in docx.Document(file_path).paragraphs:
+            parts.append(paragraph.text)
+            length += len(paragraph.text)
+            if length >= max_chars:
+                break
+    return "\n".join(parts)[:max_chars]
+
+
+def _guess_name(lines: list[str]) -> Optional[str]:
+    """The first short line that is not contact information is usually the name."""
+    for line in lines[:10]:
+        if EMAIL_RE.search(line) or PHONE_RE.search(line):
+            continue
+        words = line.split()
+        if 1 < len(words) <= 4 and all(word[:1].isalpha() for word in words):
+            return line
+    return None
+
+
+def parse_text(text: str) -> dict:
+    """Extract candidate fields from resume text."""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    email = EMAIL_RE.search(text)
+    phone = PHONE_RE.search(text)
+    years = [int(match) for match in EXPERIENCE_RE.findall(text)]
+    return {
+        "name": _guess_name(lines),
+        "email": email.group(0).lower() if email else None,
+        "phone_number": re.sub(r"[\s().-]", "", phone.group(0)) if phone else None,
+        "years_of_experience": max(years) if years else None,
+    }
+
+
+def parse_resume(file_path: str, content_type: str) -> dict:
+    """Parse a resume file into candidate fields; unreadable files yield empty fields."""
+    try:
+        text = extract_text(file_path, content_type)
+    except Exception:
+        text = ""
+    return parse_text(text)
@@ -0,0 +1,215 @@
+"""Retention for high-volume log tables.
+
+Each policy names a table, the timestamp that ages its rows and how long rows
+stay in the hot table. Older rows are moved in small batches: a batch is
+written to a gzip-compressed NDJSON file under ``ARCHIVE_PATH``, recorded as an
+``ArchiveSegment`` and deleted in the same transaction, so every lock is short
+and the hot tables (and their indexes) stay small. Policies with
+``archive=False`` only delete. Archived rows can still be searched with
+``search_archive``.
+"""
+import asyncio
+import gzip
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import orjson
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..db.base import SessionLocal
+from ..models.archive import ArchiveSegment
+from ..models.audit_log import AuditLog
+from ..models.change_log import ChangeLog
+from ..models.email_outbox import EmailOutbox
+from ..models.notification import Notification
+from ..models.refresh_token import RefreshToken
+from ..models.search_log import SearchLog
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """How long rows of one table are kept hot."""
+    model: type
+    age_column: str
+    keep: timedelta
+    archive: bool = True
+    criteria: tuple = ()  # extra filters; rows not matching them are kept whatever their age
+
+
+def retention_policies() -> list[RetentionPolicy]:
+    """Policies for every table under retention, from current settings."""
+    return [
+        RetentionPolicy(AuditLog, "created_at", timedelta(days=settings.RETENTION_AUDIT_LOG_DAYS)),
+        RetentionPolicy(SearchLog, "created_at", timedelta(days=settings.RETENTION_SEARCH_LOG_DAYS)),
+        RetentionPolicy(Notification, "created_at", timedelta(days=settings.RETENTION_NOTIFICATION_DAYS)),
+        # Pending emails are still being retried and stay until they are sent or fail
+        RetentionPolicy(
+            EmailOutbox,
+            "created_at",
+            timedelta(days=settings.RETENTION_EMAIL_OUTBOX_DAYS),
+            criteria=(EmailOutbox.status.in_(("sent", "failed")),),
+        ),
+        RetentionPolicy(ChangeLog, "created_at", timedelta(days=settings.RETENTION_CHANGE_LOG_DAYS), archive=False),
+        # Revoked tokens are kept until they expire so that replaying a rotated
+        # token is still detected; expired tokens are worthless and not archived.
+        RetentionPolicy(RefreshToken, "expires_at", timedelta(0), archive=False),
+    ]
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Normalise database timestamps (aware on PostgreSQL, naive on SQLite) to naive UTC."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _write_segment(policy: RetentionPolicy, rows: list[dict]) -> ArchiveSegment:
+    """Write a batch of rows to a compressed archive file and describe it."""
+    table_name = policy.model.__tablename__
+    times = [_naive_utc(row["created_at"]) for row in rows if row.get("created_at") is not None]
+    min_created_at = min(times) if times else datetime.utcnow()
+    max_created_at = max(times) if times else min_created_at
+    first_id, last_id = rows[0]["id"], rows[-1]["id"]
+
+    relative_path = os.path.join(
+        table_name,
+        f"{min_created_at:%Y}",
+        f"{min_created_at:%m}",
+        f"{table_name}-{first_id:012d}-{last_id:012d}.ndjson.gz",
+    )
+    path = os.path.join(settings.ARCHIVE_PATH, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with gzip.open(path + ".tmp", "wb") as file:
+        for row in rows:
+            file.write(orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NAIVE_UTC))
+    os.replace(path + ".tmp", path)
+
+    return ArchiveSegment(
+        table_name=table_name,
+        path=relative_path,
+        row_count=len(rows),
+        first_id=first_id,
+        last_id=last_id,
+        min_created_at=min_created_at,
+        max_created_at=max_created_at,
+    )
+
+
+def apply_policy(db: Session, policy: RetentionPolicy, batch_size: int, now: Optional[datetime] = None) -> int:
+    """Archive and delete rows older than the policy allows; return the number moved.
+
+    Batches walk the age column's index from the oldest row. On PostgreSQL
+    rows are claimed with ``FOR UPDATE SKIP LOCKED`` so concurrent workers
+    never archive the same batch twice.
+    """
+    table = policy.model.__table__
+    age_column = table.c[policy.age_column]
+    cutoff = (now or datetime.utcnow()) - policy.keep
+    moved = 0
+    while True:
+        query = (
+            db.query(table if policy.archive else table.c.id)
+            .filter(age_column < cutoff, *policy.criteria)
+            .order_by(age_column, table.c.id)
+            .limit(batch_size)
+        )
+        if db.get_bind().dialect.name == "postgresql":
+            query = query.with_for_update(skip_locked=True)
+        rows = [dict(row._mapping) for row in query]
+        if not rows:
+            break
+        rows.sort(key=lambda row: row["id"])
+        if policy.archive:
+            db.add(_write_segment(policy, rows))
+        db.query(policy.model).filter(
+            policy.model.id.in_([row["id"] for row in rows])
+        ).delete(synchronize_session=False)
+        db.commit()
+        moved += len(rows)
+        if len(rows) < batch_size:
+            break
+    return moved
+
+
+def run_retention(db: Session, batch_size: int) -> dict[str, int]:
+    """Apply every retention policy; return rows moved per table."""
+    return {
+        policy.model.__tablename__: apply_policy(db, policy, batch_size)
+        for policy in retention_policies()
+    }
+
+
+def _run_once() -> dict[str, int]:
+    db = SessionLocal()
+    try:
+        return run_retention(db, settings.RETENTION_BATCH_SIZE)
+    finally:
+        db.close()
+
+
+async def run_retention_job() -> None:
+    """Periodically apply retention policies until cancelled."""
+    while True:
+        await asyncio.sleep(settings.RETENTION_INTERVAL)
+        try:
+            moved = await asyncio.to_thread(_run_once)
+            for table_name, count in moved.items():
+                if count:
+                    logger.info("Retention moved %d rows out of %s", count, table_name)
+        except Exception:
+            logger.exception("Retention run failed")
+
+
+def _parse_time(value) -> Optional[datetime]:
+    return _naive_utc(datetime.fromisoformat(value)) if value else None
+
+
+def search_archive(
+    db: Session,
+    model: type,
+    filters: dict,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = 100,
+) -> list[dict]:
+    """Search archived rows of ``model``, newest first.
+
+    Segments are pruned by their time range and read newest first; reading
+    stops once ``limit`` matches are found that are newer than anything in
+    the remaining segments. ``filters`` are equality matches on columns.
+    """
+    since = _naive_utc(since) if since else None
+    until = _naive_utc(until) if until else None
+    query = db.query(ArchiveSegment).filter(ArchiveSegment.table_name == model.__tablename__)
+    if since:
+        query = query.filter(ArchiveSegment.max_created_at >= since)
+    if until:
+        query = query.filter(ArchiveSegment.min_created_at <= until)
+
+    matches: list[dict] = []
+    for segment in query.order_by(ArchiveSegment.max_created_at.desc()):
+        if len(matches) >= limit and _naive_utc(segment.max_created_at) < matches[limit - 1]["_created_at"]:
+            break
+        path = os.path.join(settings.ARCHIVE_PATH, segment.path)
+        with gzip.open(path, "rb") as file:
+            for line in file:
+                row = orjson.loads(line)
+                if any(row.get(key) != value for key, value in filters.items()):
+                    continue
+                created_at = _parse_time(row.get("created_at")) or datetime.min
+                if (since and created_at < since) or (until and created_at > until):
+                    continue
+                row["_created_at"] = created_at
+                matches.append(row)
+        matches.sort(key=lambda row: row["_created_at"], reverse=True)
+        del matches[limit:]
+
+    for row in matches:
+        del row["_created_at"]
+    return matches
@@ -0,0 +1,183 @@
+"""Interview scheduling: busy slots, free slots and round ordering.
+
+Busy slots come from ``interview_rounds.scheduled_date`` plus ``duration``.
+``BusyIndex.load`` reads every busy slot of a panel in a date range with one
+query, served by the ``(interviewer_id, scheduled_date)`` covering index, and
+keeps them sorted per interviewer. Conflict checks then use binary search,
+and free slots for the whole panel come from a single sweep over the merged
+intervals.
+
+All times are handled as naive UTC. Working hours and workdays come from the
+``SCHEDULING_*`` settings.
+"""
+import heapq
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.interview import InterviewRound
+
+Interval = tuple[datetime, datetime]
+
+# Rounds in these states no longer occupy their slot
+FREE_STATUSES = ("cancelled",)
+
+
+def to_utc(value: datetime) -> datetime:
+    """Normalise a timestamp (aware, or naive UTC as stored by SQLite) to naive UTC."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def interview_end(start: datetime, duration: Optional[int]) -> datetime:
+    """End of an interview, using the default length when none is set."""
+    return start + timedelta(minutes=duration or settings.INTERVIEW_DEFAULT_DURATION)
+
+
+class BusyIndex:
+    """Busy intervals of a set of interviewers, sorted by start per interviewer."""
+
+    def __init__(self, intervals: dict[int, list[Interval]]):
+        self.intervals = intervals
+        self._starts = {interviewer_id: [start for start, _ in slots] for interviewer_id, slots in intervals.items()}
+
+    @classmethod
+    def load(
+        cls,
+        db: Session,
+        interviewer_ids: Iterable[int],
+        start: datetime,
+        end: datetime,
+        exclude_interview_id: Optional[int] = None,
+    ) -> "BusyIndex":
+        """Load the busy intervals overlapping ``[start, end)`` for the interviewers with one query."""
+        interviewer_ids = list(dict.fromkeys(interviewer_ids))
+        start, end = to_utc(start), to_utc(end)
+        query = db.query(
+            InterviewRound.interviewer_id,
+            InterviewRound.scheduled_date,
+            InterviewRound.duration,
+        ).filter(
+            InterviewRound.interviewer_id.in_(interviewer_ids),
+            InterviewRound.scheduled_date >= start - timedelta(minutes=settings.INTERVIEW_MAX_DURATION),
+            InterviewRound.scheduled_date < end,
+            InterviewRound.status.notin_(FREE_STATUSES),
+        )
+        if exclude_interview_id is not None:
+            query = query.filter(InterviewRound.id != exclude_interview_id)
+
+        intervals: dict[int, list[Interval]] = {interviewer_id: [] for interviewer_id in interviewer_ids}
+        for interviewer_id, scheduled_date, duration in query.order_by(
+            InterviewRound.interviewer_id, InterviewRound.scheduled_date
+        ):
+            slot_start = to_utc(scheduled_date)
+            slot_end = interview_end(slot_start, duration)
+            if slot_end > start:
+                intervals[interviewer_id].append((slot_start, slot_end))
+        return cls(intervals)
+
+    def conflicts(self, interviewer_id: int, start: datetime, end: datetime) -> bool:
+        """Whether the interviewer is busy at any time in ``[start, end)``."""
+        start, end = to_utc(start), to_utc(end)
+        slots = self.intervals.get(interviewer_id, [])
+        # Only the slot starting just before ``end`` and those before it can overlap; a
+        # slot can run at most INTERVIEW_MAX_DURATION, so walk back until one ends too early.
+        position = bisect_left(self._starts.get(interviewer_id, []), end)
+        earliest = start - timedelta(minutes=settings.INTERVIEW_MAX_DURATION)
+        for slot_start, slot_end in reversed(slots[:position]):
+            if slot_end > start:
+                return True
+            if slot_start < earliest:
+                break
+        return False
+
+    def add(self, interviewer_id: int, start: datetime, end: datetime) -> None:
+        """Record a new busy interval, e.g. one just assigned in the same batch."""
+        start, end = to_utc(start), to_utc(end)
+        insort(self.intervals.setdefault(interviewer_id, []), (start, end))
+        insort(self._starts.setdefault(interviewer_id, []), start)
+
+    def merged(self, interviewer_ids: Iterable[int]) -> Iterator[Interval]:
+        """Union of the busy intervals of several interviewers, in order."""
+        current: Optional[Interval] = None
+        for slot_start, slot_end in heapq.merge(*(self.intervals.get(i, []) for i in interviewer_ids)):
+            if current and slot_start <= current[1]:
+                current = (current[0], max(current[1], slot_end))
+                continue
+            if current:
+                yield current
+            current = (slot_start, slot_end)
+        if current:
+            yield current
+
+
+def working_windows(start: datetime, end: datetime) -> Iterator[Interval]:
+    """Working-hour windows inside ``[start, end)``."""
+    start, end = to_utc(start), to_utc(end)
+    workdays = {int(day) for day in settings.SCHEDULING_WORKDAYS.split(",") if day.strip()}
+    day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    while day < end:
+        if day.weekday() in workdays:
+            window_start = max(start, day + timedelta(hours=settings.SCHEDULING_DAY_START_HOUR))
+            window_end = min(end, day + timedelta(hours=settings.SCHEDULING_DAY_END_HOUR))
+            if window_start < window_end:
+                yield window_start, window_end
+        day += timedelta(days=1)
+
+
+def _align(value: datetime) -> datetime:
+    """Round up to the slot grid."""
+    grid = settings.SCHEDULING_SLOT_MINUTES * 60
+    seconds = (value - value.replace(hour=0, minute=0, second=0, microsecond=0)).total_seconds()
+    remainder = seconds % grid
+    return value if remainder == 0 else value + timedelta(seconds=grid - remainder)
+
+
+def free_slots(
+    index: BusyIndex,
+    interviewer_ids: Iterable[int],
+    start: datetime,
+    end: datetime,
+    duration: int,
+) -> list[Interval]:
+    """Working-hour intervals of at least ``duration`` minutes when the whole panel is free.
+
+    Interval starts are aligned to the slot grid. The working windows and the
+    panel's merged busy intervals are both sorted, so one sweep covers them.
+    """
+    length = timedelta(minutes=duration)
+    busy = list(index.merged(interviewer_ids))
+    slots, position = [], 0
+    for window_start, window_end in working_windows(start, end):
+        cursor = _align(window_start)
+        while position < len(busy) and busy[position][1] <= cursor:
+            position += 1
+        scan = position
+        while cursor + length <= window_end:
+            if scan < len(busy) and busy[scan][0] < cursor + length:
+                # Busy before the slot would end: jump past it
+                cursor = _align(max(cursor, busy[scan][1]))
+                scan += 1
+                continue
+            free_end = min(window_end, busy[scan][0]) if scan < len(busy) else window_end
+            slots.append((cursor, free_end))
+            cursor = _align(free_end)
+    return slots
+
+
+def previous_round_incomplete(db: Session, candidate_id: int, round_number: int) -> bool:
+    """Whether round ``round_number - 1`` still has to be completed before this round.
+
+    Round 0 is resume screening (no interview) and round 1 has no predecessor.
+    """
+    if round_number <= 1:
+        return False
+    previous = db.query(InterviewRound.status).filter(
+        InterviewRound.candidate_id == candidate_id,
+        InterviewRound.round_number == round_number - 1,
+    ).first()
+    return previous is None or previous.status != "completed"
@@ -0,0 +1,338 @@
+"""Local batch scoring of candidates: objective rating and salary prediction.
+
+Two ridge regressions are trained with NumPy from the candidates themselves:
+
+- the objective rating model learns the candidate's mean feedback rating
+  (``calibrated_rating`` where available) from years of experience, current
+  salary and skills;
+- the salary model learns ``log(current_salary)`` from years of experience and
+  skills, so a salary can be predicted for candidates who did not state one.
+
+Features are a few numeric columns with missing-value flags plus one column
+per skill seen in training, standardized before the closed-form ridge solve.
+Each training run is saved as a new version (``scoring-v0001.npz``, ...)
+under ``SCORING_MODEL_PATH``; the newest version is the current one in every
+worker. Candidates record the version and time they were scored, so a rescan
+only touches candidates that were edited since (links bump ``updated_at``)
+or were scored by an older version, in batches of ``SCORING_BATCH_SIZE`` with
+one query for the inputs and one ``UPDATE`` for the results.
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..db.base import SessionLocal
+from ..db.bulk import update_by_id
+from ..models.candidate import Candidate, CandidateSkill
+from ..models.interview import InterviewFeedback, InterviewRound
+from .cache import CANDIDATES_TAG, response_cache
+from .changes import record_changes
+
+logger = logging.getLogger(__name__)
+
+MODEL_FILE = re.compile(r"^scoring-v(\d+)\.npz$")
+
+
+class InsufficientTrainingData(ValueError):
+    """Raised when neither model has enough labelled candidates to train on."""
+
+
+@dataclass(frozen=True)
+class RidgeModel:
+    """Linear model over standardized features."""
+    weights: np.ndarray
+    intercept: float
+    mean: np.ndarray
+    scale: np.ndarray
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        return ((features - self.mean) / self.scale) @ self.weights + self.intercept
+
+
+def fit_ridge(features: np.ndarray, target: np.ndarray, alpha: float) -> RidgeModel:
+    """Closed-form ridge regression; the intercept is not penalized."""
+    mean = features.mean(axis=0)
+    scale = features.std(axis=0)
+    scale[scale == 0] = 1.0
+    standardized = (features - mean) / scale
+    intercept = float(target.mean())
+    gram = standardized.T @ standardized + alpha * np.eye(standardized.shape[1])
+    weights = np.linalg.solve(gram, standardized.T @ (target - intercept))
+    return RidgeModel(weights, intercept, mean, scale)
+
+
+@dataclass
+class CandidateInputs:
+    """Scoring inputs of a batch of candidates; skills as (row, skill id) pairs."""
+    ids: np.ndarray
+    years: np.ndarray
+    salary: np.ndarray
+    skill_rows: np.ndarray
+    skill_ids: np.ndarray
+
+
+def load_inputs(db: Session, candidate_ids: Optional[list[int]] = None) -> CandidateInputs:
+    """Load the inputs of the given live candidates, or of all of them, with two queries."""
+    query = db.query(Candidate.id, Candidate.years_of_experience, Candidate.current_salary)
+    links = db.query(CandidateSkill.candidate_id, CandidateSkill.skill_id)
+    if candidate_ids is not None:
+        query = query.filter(Candidate.id.in_(candidate_ids))
+        links = links.filter(CandidateSkill.candidate_id.in_(candidate_ids))
+    rows = np.array(query.order_by(Candidate.id).all(), dtype=float).reshape(-1, 3)  # NULL becomes NaN
+    pairs = np.array(links.all(), dtype=np.int64).reshape(-1, 2)
+
+    ids = rows[:, 0].astype(np.int64)
+    positions = np.minimum(np.searchsorted(ids, pairs[:, 0]), max(len(ids) - 1, 0))
+    known = ids[positions] == pairs[:, 0] if len(ids) else np.zeros(len(pairs), dtype=bool)
+    return CandidateInputs(ids, rows[:, 1], rows[:, 2], positions[known], pairs[known, 1])
+
+
+def feature_matrix(inputs: CandidateInputs, skill_ids: np.ndarray, with_salary: bool) -> np.ndarray:
+    """Numeric columns with missing-value flags, then one 0/1 column per known skill."""
+    columns = [np.nan_to_num(inputs.years), np.isnan(inputs.years)]
+    if with_salary:
+        salary = np.log1p(np.clip(inputs.salary, 0, None))
+        columns += [np.nan_to_num(salary), np.isnan(salary)]
+    skills = np.zeros((len(inputs.ids), len(skill_ids)))
+    if len(skill_ids) and len(inputs.skill_ids):
+        positions = np.minimum(np.searchsorted(skill_ids, inputs.skill_ids), len(skill_ids) - 1)
+        known = skill_ids[positions] == inputs.skill_ids
+        skills[inputs.skill_rows[known], positions[known]] = 1.0
+    return np.hstack([np.column_stack(columns).astype(float), skills])
+
+
+@dataclass(frozen=True)
+class ScoringModel:
+    """One trained version of the rating and salary models."""
+    version: int
+    skill_ids: np.ndarray
+    rating: Optional[RidgeModel]
+    salary: Optional[RidgeModel]
+    info: dict
+
+    def predict(self, inputs: CandidateInputs) -> tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """Objective ratings (0-100) and predicted salaries, or ``None`` for a model that was not trained."""
+        ratings = salaries = None
+        if self.rating is not None:
+            features = feature_matrix(inputs, self.skill_ids, with_salary=True)
+            ratings = np.clip(self.rating.predict(features), 0, 100).round(2)
+        if self.salary is not None:
+            features = feature_matrix(inputs, self.skill_ids, with_salary=False)
+            salaries = np.exp(np.clip(self.salary.predict(features), 0, 25)).round()
+        return ratings, salaries
+
+    def summary(self) -> dict:
+        return {"version": self.version, **self.info}
+
+
+def _feedback_labels(db: Session) -> dict[int, float]:
+    rating = func.coalesce(InterviewFeedback.calibrated_rating, InterviewFeedback.overall_rating)
+    query = db.query(InterviewRound.candidate_id, func.avg(rating)).join(
+        InterviewFeedback, InterviewFeedback.interview_round_id == InterviewRound.id
+    ).group_by(InterviewRound.candidate_id)
+    return {candidate_id: float(value) for candidate_id, value in query}
+
+
+def _fit(features: np.ndarray, target: np.ndarray) -> tuple[Optional[RidgeModel], Optional[float]]:
+    if len(target) < settings.SCORING_MIN_SAMPLES:
+        return None, None
+    model = fit_ridge(features, target, settings.SCORING_RIDGE_ALPHA)
+    rmse = float(np.sqrt(np.mean((model.predict(features) - target) ** 2)))
+    return model, round(rmse, 4)
+
+
+def train_models(db: Session) -> ScoringModel:
+    """Train both models on all live candidates and save them as a new version."""
+    inputs = load_inputs(db)
+    skill_ids = np.unique(inputs.skill_ids)
+
+    labels = _feedback_labels(db)
+    rated = np.array([candidate_id in labels for candidate_id in inputs.ids.tolist()], dtype=bool)
+    rating_features = feature_matrix(inputs, skill_ids, with_salary=True)[rated]
+    rating_target = np.array([labels[candidate_id] for candidate_id in inputs.ids[rated].tolist()])
+    rating, rating_rmse = _fit(rating_features, rating_target)
+
+    paid = np.nan_to_num(inputs.salary) > 0
+    salary_features = feature_matrix(inputs, skill_ids, with_salary=False)[paid]
+    salary, salary_rmse = _fit(salary_features, np.log(inputs.salary[paid]))
+
+    if rating is None and salary is None:
+        raise InsufficientTrainingData(
+            f"At least {settings.SCORING_MIN_SAMPLES} candidates with feedback or a current salary are needed "
+            f"(found {int(rated.sum())} with feedback, {int(paid.sum())} with a salary)"
+        )
+    info = {
+        "trained_at": datetime.now(timezone.utc).isoformat(),
+        "skills": len(skill_ids),
+        "rating_samples": int(rated.sum()) if rating else 0,
+        "rating_rmse": rating_rmse,
+        "salary_samples": int(paid.sum()) if salary else 0,
+        "salary_rmse_log": salary_rmse,
+    }
+    return model_store.save(skill_ids, rating, salary, info)
+
+
+class ModelStore:
+    """Scoring model versions saved as ``.npz`` files in one directory."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._current: Optional[ScoringModel] = None
+        self._lock = threading.Lock()
+
+    def versions(self) -> list[int]:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(int(match.group(1)) for match in map(MODEL_FILE.match, os.listdir(self.directory)) if match)
+
+    def path(self, version: int) -> str:
+        return os.path.join(self.directory, f"scoring-v{version:04d}.npz")
+
+    def save(self, skill_ids: np.ndarray, rating: Optional[RidgeModel], salary: Optional[RidgeModel], info: dict) -> ScoringModel:
+        """Write a new version; concurrent trainers each get their own version number."""
+        os.makedirs(self.directory, exist_ok=True)
+        arrays = {"skill_ids": skill_ids, "info": np.array(json.dumps(info))}
+        for name, model in (("rating", rating), ("salary", salary)):
+            if model is not None:
+                arrays.update({
+                    f"{name}_weights": model.weights,
+                    f"{name}_intercept": np.array(model.intercept),
+                    f"{name}_mean": model.mean,
+                    f"{name}_scale": model.scale,
+                })
+        temporary = os.path.join(self.directory, f".scoring-{os.getpid()}-{threading.get_ident()}.npz")
+        with open(temporary, "wb") as handle:
+            np.savez(handle, **arrays)
+        try:
+            while True:
+                version = max(self.versions(), default=0) + 1
+                try:
+                    os.link(temporary, self.path(version))  # fails if another worker took the version
+                    break
+                except FileExistsError:
+                    continue
+        finally:
+            os.remove(temporary)
+        return self.load(version)
+
+    def load(self, version: int) -> ScoringModel:
+        with np.load(self.path(version), allow_pickle=False) as data:
+            models = {}
+            for name in ("rating", "salary"):
+                models[name] = None
+                if f"{name}_weights" in data:
+                    models[name] = RidgeModel(
+                        data[f"{name}_weights"],
+                        float(data[f"{name}_intercept"]),
+                        data[f"{name}_mean"],
+                        data[f"{name}_scale"],
+                    )
+            return ScoringModel(version, data["skill_ids"], models["rating"], models["salary"], json.loads(str(data["info"])))
+
+    def current(self) -> Optional[ScoringModel]:
+        """The newest version, reloaded when another worker saved a newer one."""
+        latest = max(self.versions(), default=None)
+        with self._lock:
+            if latest is None:
+                self._current = None
+            elif self._current is None or self._current.version != latest:
+                self._current = self.load(latest)
+            return self._current
+
+
+model_store = ModelStore(settings.SCORING_MODEL_PATH)
+
+
+def pending_candidate_ids(db: Session, version: int, candidate_ids: Optional[list[int]] = None) -> list[int]:
+    """Live candidates never scored, scored by another version, or edited since they were scored."""
+    query = db.query(Candidate.id).filter(
+        or_(
+            Candidate.scored_at.is_(None),
+            Candidate.scoring_version != version,
+            # >= so that an edit in the same clock tick as the scoring is rescanned
+            Candidate.updated_at >= Candidate.scored_at,
+        )
+    )
+    if candidate_ids is not None:
+        query = query.filter(Candidate.id.in_(candidate_ids))
+    return [candidate_id for (candidate_id,) in query.order_by(Candidate.id)]
+
+
+def score_candidates(db: Session, candidate_ids: Optional[list[int]] = None) -> dict[int, tuple]:
+    """Score the pending candidates (all of them, or among ``candidate_ids``) with the current model.
+
+    Returns ``(objective_rating, predicted_salary)`` by candidate id. Does
+    nothing until a model has been trained. The caller records the changes
+    and commits.
+    """
+    model = model_store.current()
+    if model is None:
+        return {}
+    pending = pending_candidate_ids(db, model.version, candidate_ids)
+    table = Candidate.__table__
+    scores = {}
+    for start in range(0, len(pending), settings.SCORING_BATCH_SIZE):
+        inputs = load_inputs(db, pending[start:start + settings.SCORING_BATCH_SIZE])
+        ratings, salaries = model.predict(inputs)
+        columns = {}
+        if ratings is not None:
+            columns["objective_rating"] = ratings.tolist()
+        if salaries is not None:
+            columns["predicted_salary"] = salaries.tolist()
+        # Scoring is derived data: it must not bump updated_at, which marks edited inputs
+        update_by_id(
+            db,
+            Candidate,
+            inputs.ids.tolist(),
+            columns,
+            scored_at=func.now(),
+            scoring_version=model.version,
+            updated_at=table.c.updated_at,
+        )
+        unscored = [None] * len(inputs.ids)
+        scores.update(zip(
+            inputs.ids.tolist(),
+            zip(columns.get("objective_rating", unscored), columns.get("predicted_salary", unscored)),
+        ))
+    return scores
+
+
+def _rescan_once() -> int:
+    db = SessionLocal()
+    try:
+        scores = score_candidates(db)
+        record_changes(db, "candidate", scores)
+        db.commit()
+    finally:
+        db.close()
+    if scores:
+        response_cache.invalidate(CANDIDATES_TAG)
+    return len(scores)
+
+
+def rescan_candidates() -> None:
+    """Score every pending candidate in a session of its own (background task entry point)."""
+    try:
+        scored = _rescan_once()
+        if scored:
+            logger.info("Scored %d candidates", scored)
+    except Exception:
+        logger.exception("Candidate scoring failed")
+
+
+async def run_scoring_job() -> None:
+    """Periodically score candidates whose inputs changed, until cancelled."""
+    while True:
+        await asyncio.sleep(settings.SCORING_INTERVAL)
+        await asyncio.to_thread(rescan_candidates)
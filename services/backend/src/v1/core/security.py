@@ -1,4 +1,7 @@
 """Security utilities for authentication and authorization."""
+import hashlib
+import hmac
+import secrets
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
@@ -33,10 +36,28 @@ def create_refresh_token(data: dict) -> str:
     """Create a JWT refresh token."""
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "type": "refresh"})
+    # jti keeps tokens issued to the same user in the same second distinct
+    to_encode.update({"exp": expire, "type": "refresh", "jti": secrets.token_urlsafe(16)})
     return jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
 
 
+def hash_token(token: str) -> str:
+    """Hash a token for storage and lookup (fixed-size SHA-256 hex digest)."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def create_signature(message: str) -> str:
+    """Sign a message (e.g. a download URL) with the application secret."""
+    return hmac.new(
+        settings.JWT_SECRET_KEY.encode("utf-8"), message.encode("utf-8"), hashlib.sha256
+    ).hexdigest()
+
+
+def verify_signature(message: str, signature: str) -> bool:
+    """Check a signature produced by ``create_signature``."""
+    return hmac.compare_digest(create_signature(message), signature)
+
+
 def decode_token(token: str) -> Optional[dict]:
     """Decode a JWT token."""
     try:
@@ -52,7 +73,6 @@ def get_user_by_email(db: Session, email: str) -> Optional[User]:
         .filter(
             User.email == email,
             User.is_active.is_(True),
-            User.deleted_at.is_(None),
         )
         .first()
     )
@@ -65,7 +85,6 @@ def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
         .filter(
             User.id == user_id,
             User.is_active.is_(True),
-            User.deleted_at.is_(None),
         )
         .first()
     )
@@ -0,0 +1,82 @@
+"""Column-projected reads for list endpoints.
+
+List endpoints select only the columns their response schema exposes, get
+plain row tuples back and hand them straight to orjson, skipping the ORM
+identity map and per-row Pydantic validation.
+"""
+from collections import defaultdict
+from typing import Iterable
+
+from sqlalchemy.orm import Session
+
+from ..models.candidate import Candidate, CandidateBucket, CandidateSkill
+from ..models.interview import InterviewFeedback, InterviewRound
+from ..models.resume import ResumeFile
+from ..schemas.candidate import CandidateResponse
+from ..schemas.interview import InterviewFeedbackResponse, InterviewRoundResponse
+from ..services.preview_service import preview_urls
+
+# Response fields that are not candidate columns and are filled in per page
+CANDIDATE_ASSOCIATION_FIELDS = ("bucket_ids", "skill_ids", "resume_preview_url", "resume_thumbnail_url")
+
+CANDIDATE_RESPONSE_COLUMNS = [
+    getattr(Candidate, name)
+    for name in CandidateResponse.model_fields
+    if name not in CANDIDATE_ASSOCIATION_FIELDS
+]
+
+INTERVIEW_RESPONSE_COLUMNS = [
+    getattr(InterviewRound, name) for name in InterviewRoundResponse.model_fields
+]
+
+FEEDBACK_RESPONSE_COLUMNS = [
+    getattr(InterviewFeedback, name) for name in InterviewFeedbackResponse.model_fields
+]
+
+
+def rows_to_dicts(rows: Iterable) -> list[dict]:
+    """Convert projected result rows to plain dictionaries."""
+    return [dict(row._mapping) for row in rows]
+
+
+def group_ids(db: Session, key_column, value_column, keys: list[int]) -> dict[int, list[int]]:
+    """Load ``value_column`` ids grouped by ``key_column`` for the given keys in one query."""
+    grouped = defaultdict(list)
+    if not keys:
+        return grouped
+    rows = (
+        db.query(key_column, value_column)
+        .filter(key_column.in_(keys))
+        .order_by(key_column, value_column)
+        .all()
+    )
+    for key, value in rows:
+        grouped[key].append(value)
+    return grouped
+
+
+def resume_hashes(db: Session, candidate_ids: list[int]) -> dict[int, str]:
+    """Load the resume content hash of each candidate that has a stored resume."""
+    if not candidate_ids:
+        return {}
+    rows = (
+        db.query(Candidate.id, ResumeFile.content_hash)
+        .join(ResumeFile, Candidate.resume_file_id == ResumeFile.id)
+        .filter(Candidate.id.in_(candidate_ids))
+        .all()
+    )
+    return dict(rows)
+
+
+def candidate_rows_to_dicts(db: Session, rows: Iterable) -> list[dict]:
+    """Build candidate response dictionaries with associations and preview URLs batched per page."""
+    records = rows_to_dicts(rows)
+    ids = [record["id"] for record in records]
+    bucket_ids = group_ids(db, CandidateBucket.candidate_id, CandidateBucket.bucket_id, ids)
+    skill_ids = group_ids(db, CandidateSkill.candidate_id, CandidateSkill.skill_id, ids)
+    hashes = resume_hashes(db, ids)
+    for record in records:
+        record["bucket_ids"] = bucket_ids.get(record["id"], [])
+        record["skill_ids"] = skill_ids.get(record["id"], [])
+        record.update(preview_urls(hashes.get(record["id"])))
+    return records
@@ -0,0 +1,53 @@
+"""Whitelisted sorting for list endpoints.
+
+Each resource declares the public sort keys it accepts and the column each
+one orders by. Every key is backed by a partial ``(column, id)`` index over
+live rows, and ``id`` is always appended as a tie-breaker in the same
+direction, so pages are deterministic and every permitted sort is an
+index scan rather than a full sort of the table.
+"""
+from sqlalchemy import Column
+
+from ..models.candidate import Candidate
+from ..models.interview import InterviewRound
+
+
+class UnsupportedSortKey(ValueError):
+    """Raised for a sort key that the resource does not declare."""
+
+
+class SortRegistry:
+    """Public sort keys of one resource and the indexed columns they order by."""
+
+    def __init__(self, model: type, columns: dict[str, Column]):
+        self.model = model
+        self.columns = columns
+
+    def ordering(self, sort_by: str, sort_order: str) -> list:
+        """ORDER BY clauses for a sort key, with the ``id`` tie-breaker."""
+        column = self.columns.get(sort_by)
+        if column is None:
+            raise UnsupportedSortKey(
+                f"Unsupported sort key '{sort_by}'. Supported keys: {', '.join(self.columns)}"
+            )
+        if sort_order == "desc":
+            return [column.desc(), self.model.id.desc()]
+        return [column.asc(), self.model.id.asc()]
+
+
+CANDIDATE_SORTS = SortRegistry(
+    Candidate,
+    {
+        "created_at": Candidate.created_at,
+        "name": Candidate.name,
+        "objective_rating": Candidate.objective_rating,
+    },
+)
+
+INTERVIEW_SORTS = SortRegistry(
+    InterviewRound,
+    {
+        "created_at": InterviewRound.created_at,
+        "scheduled_date": InterviewRound.scheduled_date,
+    },
+)
@@ -0,0 +1,90 @@
+"""Refresh token storage and rotation.
+
+Only SHA-256 hashes of refresh tokens are stored. Every refresh revokes the
+presented token and issues a replacement; presenting a token that has already
+been rotated means it was copied, so the user's whole token family is revoked.
+Expired tokens are removed by the retention job (``core/retention.py``).
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.refresh_token import RefreshToken
+from ..models.user import User
+from .security import create_refresh_token, hash_token
+
+
+class RefreshTokenReuseError(Exception):
+    """Raised when an already rotated refresh token is presented again."""
+
+
+def issue_refresh_token(
+    db: Session,
+    user: User,
+    ip_address: Optional[str] = None,
+    user_agent: Optional[str] = None,
+) -> tuple[str, RefreshToken]:
+    """Create a refresh token for ``user`` and stage its hashed row on the session."""
+    token = create_refresh_token({"sub": str(user.id)})
+    db_token = RefreshToken(
+        user_id=user.id,
+        token_hash=hash_token(token),
+        expires_at=datetime.utcnow() + timedelta(days=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS),
+        ip_address=ip_address,
+        user_agent=user_agent,
+    )
+    db.add(db_token)
+    return token, db_token
+
+
+def rotate_refresh_token(
+    db: Session,
+    token: str,
+    ip_address: Optional[str] = None,
+    user_agent: Optional[str] = None,
+) -> Optional[tuple[str, User]]:
+    """Exchange a valid refresh token for a new one.
+
+    Returns ``None`` for unknown, expired or logged-out tokens and raises
+    ``RefreshTokenReuseError`` (after revoking every token of the user) when
+    the token was already rotated. The caller commits, in both cases.
+    """
+    db_token = (
+        db.query(RefreshToken)
+        .filter(
+            RefreshToken.token_hash == hash_token(token),
+            RefreshToken.expires_at > datetime.utcnow(),
+        )
+        .with_for_update()
+        .first()
+    )
+    if not db_token:
+        return None
+
+    if db_token.revoked:
+        if db_token.replaced_by_id is not None:
+            revoke_user_tokens(db, db_token.user_id)
+            raise RefreshTokenReuseError()
+        return None
+
+    user = db.query(User).filter(User.id == db_token.user_id).first()
+    if not user or not user.is_active or user.deleted_at is not None:
+        return None
+
+    new_token, new_db_token = issue_refresh_token(db, user, ip_address, user_agent)
+    db.flush()
+    db_token.revoked = True
+    db_token.revoked_at = datetime.utcnow()
+    db_token.replaced_by_id = new_db_token.id
+    return new_token, user
+
+
+def revoke_user_tokens(db: Session, user_id: int) -> None:
+    """Revoke every active refresh token of a user."""
+    db.query(RefreshToken).filter(
+        RefreshToken.user_id == user_id,
+        RefreshToken.revoked == False
+    ).update({"revoked": True, "revoked_at": datetime.utcnow()}, synchronize_session=False)
+
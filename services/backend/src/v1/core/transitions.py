@@ -0,0 +1,132 @@
+"""Batch candidate status transitions.
+
+A screening pass moves many candidates at once. ``transition_candidates``
+checks each move against ``CANDIDATE_STATUS_TRANSITIONS`` and applies the
+valid ones with one set-based ``UPDATE``. It then writes the matching
+``Rejection`` rows, audit entries, uploader notifications and rejection
+emails with one multi-row ``INSERT`` each, all in the caller's transaction.
+"""
+from collections import defaultdict
+from typing import Optional
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from ..models.audit_log import AuditLog
+from ..models.candidate import Candidate
+from ..models.notification import Notification
+from ..models.rejection import Rejection
+from ..models.user import User
+from .outbox import queue_rejection_notices
+
+# Allowed moves per current status (rejected -> eligible needs the Phase 2 reapplication workflow)
+CANDIDATE_STATUS_TRANSITIONS = {
+    "eligible": {"rejected", "hired"},
+    "rejected": set(),
+    "hired": set(),
+}
+
+
+def transition_candidates(
+    db: Session,
+    candidate_ids: list[int],
+    to_status: str,
+    actor: User,
+    reason: Optional[str] = None,
+    stage: str = "resume_screening",
+    round_number: Optional[int] = None,
+    notes: Optional[str] = None,
+    ip_address: Optional[str] = None,
+    user_agent: Optional[str] = None,
+) -> dict:
+    """Move live candidates to ``to_status``; return the updated ids and the skipped ones with a reason.
+
+    Rows are locked while they are checked (on PostgreSQL) so concurrent
+    batches cannot apply conflicting moves. The caller commits.
+    """
+    candidate_ids = list(dict.fromkeys(candidate_ids))
+    query = db.query(Candidate.id, Candidate.name, Candidate.email, Candidate.status, Candidate.uploaded_by).filter(
+        Candidate.id.in_(candidate_ids)
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        query = query.with_for_update(of=Candidate)
+    current = {row.id: row for row in query}
+
+    moved, skipped = [], []
+    for candidate_id in candidate_ids:
+        row = current.get(candidate_id)
+        if row is None:
+            skipped.append({"id": candidate_id, "reason": "Candidate not found"})
+        elif row.status == to_status:
+            skipped.append({"id": candidate_id, "reason": f"Candidate is already {to_status}"})
+        elif to_status not in CANDIDATE_STATUS_TRANSITIONS.get(row.status, set()):
+            skipped.append({"id": candidate_id, "reason": f"Cannot move candidate from {row.status} to {to_status}"})
+        else:
+            moved.append(row)
+    if not moved:
+        return {"updated": [], "skipped": skipped}
+
+    moved_ids = [row.id for row in moved]
+    db.execute(
+        update(Candidate)
+        .where(Candidate.id.in_(moved_ids))
+        .values(status=to_status)
+        .execution_options(synchronize_session=False)
+    )
+
+    if to_status == "rejected":
+        db.execute(insert(Rejection), [
+            {
+                "candidate_id": row.id,
+                "rejected_by": actor.id,
+                "rejection_reason": reason,
+                "stage": stage,
+                "round_number": round_number,
+                "notes": notes,
+            }
+            for row in moved
+        ])
+        queue_rejection_notices(db, moved)
+
+    db.execute(insert(AuditLog), [
+        {
+            "user_id": actor.id,
+            "action": "update",
+            "resource_type": "candidate",
+            "resource_id": row.id,
+            "changes": {"status": {"from": row.status, "to": to_status}, "reason": reason},
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+        }
+        for row in moved
+    ])
+
+    # One notification per uploader, however many of their candidates moved
+    by_uploader = defaultdict(list)
+    for row in moved:
+        if row.uploaded_by != actor.id:
+            by_uploader[row.uploaded_by].append(row)
+    if by_uploader:
+        db.execute(insert(Notification), [
+            _status_notification(user_id, rows, to_status, actor)
+            for user_id, rows in by_uploader.items()
+        ])
+
+    return {"updated": moved_ids, "skipped": skipped}
+
+
+def _status_notification(user_id: int, rows: list, to_status: str, actor: User) -> dict:
+    if len(rows) == 1:
+        title = f"Candidate {to_status}"
+        message = f"{rows[0].name} was marked {to_status} by {actor.username}."
+    else:
+        title = f"{len(rows)} candidates {to_status}"
+        message = f"{len(rows)} of your candidates were marked {to_status} by {actor.username}."
+    return {
+        "user_id": user_id,
+        "type": "rejection_notice" if to_status == "rejected" else "candidate_status_changed",
+        "title": title,
+        "message": message,
+        "related_resource_type": "candidate",
+        "related_resource_id": rows[0].id if len(rows) == 1 else None,
+    }
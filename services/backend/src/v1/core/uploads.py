@@ -0,0 +1,243 @@
+"""Streaming multipart upload handling.
+
+The request body is fed to the multipart parser chunk by chunk. File parts are
+hashed and written straight to temp files on the storage filesystem as they
+arrive, so a batch upload never sits in worker memory. Size limits and file
+types (checked by magic bytes, not the client-supplied content type) are
+enforced while streaming and abort the upload at the first violation. A
+DOCX starts like any ZIP archive, so once it is complete its central directory
+must also show the Word main document part.
+"""
+import hashlib
+import os
+import zipfile
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from multipart.multipart import MultipartParser, parse_options_header
+
+from ..services.storage_service import LocalStorageBackend, StoredFile
+
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# Leading bytes of each allowed resume format
+MAGIC_NUMBERS = {
+    b"%PDF-": "application/pdf",
+    b"PK\x03\x04": DOCX,
+}
+SNIFF_BYTES = max(len(magic) for magic in MAGIC_NUMBERS)
+MAX_FIELD_BYTES = 64 * 1024
+# Content type of a Word document's main part in [Content_Types].xml
+WORDPROCESSING_MAIN = b"application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"
+MAX_CONTENT_TYPES_BYTES = 1024 * 1024
+
+
+class UploadRejected(Exception):
+    """Raised when an upload violates a limit; carries an API error code."""
+
+    def __init__(self, code: str, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.status_code = status_code
+
+
+def sniff_content_type(head: bytes) -> Optional[str]:
+    """Return the content type matching a file's leading bytes, if known."""
+    for magic, content_type in MAGIC_NUMBERS.items():
+        if head.startswith(magic):
+            return content_type
+    return None
+
+
+def is_word_document(path: str) -> bool:
+    """Whether a ZIP file is a Word document: it has ``word/document.xml`` or declares a Word main part."""
+    try:
+        with zipfile.ZipFile(path) as package:
+            names = set(package.namelist())
+            if "word/document.xml" in names:
+                return True
+            if "[Content_Types].xml" not in names:
+                return False
+            with package.open("[Content_Types].xml") as content_types:
+                return WORDPROCESSING_MAIN in content_types.read(MAX_CONTENT_TYPES_BYTES)
+    except Exception:
+        # Corrupt archives, unsupported compression and the like are not documents
+        return False
+
+
+@dataclass
+class UploadedFile:
+    """A file part that has been streamed into storage."""
+    filename: Optional[str]
+    content_type: str
+    stored: StoredFile
+
+
+@dataclass
+class _Part:
+    name: str = ""
+    filename: Optional[str] = None
+    data: bytearray = field(default_factory=bytearray)
+    head: bytes = b""
+    content_type: Optional[str] = None
+    size: int = 0
+    digest: Optional["hashlib._Hash"] = None
+    temp: Optional[object] = None
+    pending: list = field(default_factory=list)
+
+
+class StreamingUploadParser:
+    """Parse a multipart body into storage without buffering whole files."""
+
+    def __init__(
+        self,
+        storage: LocalStorageBackend,
+        max_file_bytes: int,
+        max_files: int,
+        allowed_types: set[str],
+    ):
+        self.storage = storage
+        self.max_file_bytes = max_file_bytes
+        self.max_files = max_files
+        self.allowed_types = allowed_types
+        self.files: list[UploadedFile] = []
+        self.fields: dict[str, str] = {}
+        self._part = _Part()
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._finished: list[_Part] = []
+        self._open: list[_Part] = []
+
+    # Parser callbacks (synchronous; file I/O is deferred to ``parse``)
+
+    def _on_part_begin(self) -> None:
+        self._part = _Part()
+        self._disposition = b""
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._disposition)
+        if b"name" not in options:
+            raise UploadRejected("VALIDATION_ERROR", 'Multipart part is missing a "name"')
+        self._part.name = options[b"name"].decode("utf-8", "replace")
+        if b"filename" in options:
+            if len(self.files) + len(self._open) >= self.max_files:
+                raise UploadRejected(
+                    "VALIDATION_ERROR", f"Too many files; at most {self.max_files} per upload"
+                )
+            self._part.filename = options[b"filename"].decode("utf-8", "replace")
+            self._part.digest = hashlib.sha256()
+            self._open.append(self._part)
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        chunk = data[start:end]
+        part = self._part
+        if part.filename is None:
+            part.data += chunk
+            if len(part.data) > MAX_FIELD_BYTES:
+                raise UploadRejected("VALIDATION_ERROR", f"Form field {part.name!r} is too large")
+            return
+
+        part.size += len(chunk)
+        if part.size > self.max_file_bytes:
+            raise UploadRejected(
+                "FILE_TOO_LARGE",
+                f"{part.filename} exceeds {self.max_file_bytes // (1024 * 1024)}MB",
+                status_code=413,
+            )
+        if part.content_type is None:
+            part.head += chunk[:SNIFF_BYTES]
+            if len(part.head) >= SNIFF_BYTES or part.size >= SNIFF_BYTES:
+                self._check_type(part)
+        part.digest.update(chunk)
+        part.pending.append(chunk)
+
+    def _on_part_end(self) -> None:
+        part = self._part
+        if part.filename is None:
+            self.fields[part.name] = part.data.decode("utf-8", "replace")
+            return
+        if part.content_type is None:
+            self._check_type(part)
+        self._finished.append(part)
+
+    def _check_type(self, part: _Part) -> None:
+        content_type = sniff_content_type(part.head)
+        if content_type is None or content_type not in self.allowed_types:
+            raise UploadRejected("INVALID_FILE_TYPE", f"{part.filename} is not an allowed file type")
+        part.content_type = content_type
+
+    # Driver
+
+    async def _flush(self) -> None:
+        """Write buffered chunks to temp files and commit finished parts."""
+        for part in self._open:
+            if part.pending:
+                if part.temp is None:
+                    part.temp = await run_in_threadpool(self.storage.temp_file)
+                chunks, part.pending = part.pending, []
+                await run_in_threadpool(part.temp.writelines, chunks)
+        for part in self._finished:
+            if part.temp is None:
+                part.temp = await run_in_threadpool(self.storage.temp_file)
+            await run_in_threadpool(part.temp.close)
+            if part.content_type == DOCX and not await run_in_threadpool(is_word_document, part.temp.name):
+                raise UploadRejected("INVALID_FILE_TYPE", f"{part.filename} is not an allowed file type")
+            stored = await run_in_threadpool(
+                self.storage.commit_temp, part.temp.name, part.digest.hexdigest(), part.size
+            )
+            self._open.remove(part)
+            self.files.append(UploadedFile(part.filename, part.content_type, stored))
+        self._finished.clear()
+
+    def _discard(self) -> None:
+        """Remove temp files of parts that were not committed, and files this upload stored first."""
+        for part in self._open:
+            if part.temp is not None:
+                part.temp.close()
+                if os.path.exists(part.temp.name):
+                    os.unlink(part.temp.name)
+        # A rejected batch is not recorded, so content it added to storage would be orphaned
+        for uploaded in self.files:
+            if uploaded.stored.created and os.path.exists(uploaded.stored.path):
+                os.unlink(uploaded.stored.path)
+
+    async def parse(self, content_type_header: str, stream: AsyncIterator[bytes]) -> "StreamingUploadParser":
+        """Consume the request body; on any violation, clean up and raise ``UploadRejected``."""
+        _, params = parse_options_header(content_type_header)
+        if b"boundary" not in params:
+            raise UploadRejected("VALIDATION_ERROR", "Missing multipart boundary")
+
+        parser = MultipartParser(params[b"boundary"], {
+            "on_part_begin": self._on_part_begin,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+        })
+        try:
+            async for chunk in stream:
+                parser.write(chunk)
+                await self._flush()
+            parser.finalize()
+            await self._flush()
+        except BaseException:
+            await run_in_threadpool(self._discard)
+            raise
+        return self
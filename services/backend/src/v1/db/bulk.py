@@ -0,0 +1,44 @@
+"""Set-based updates of many rows by id.
+
+``update_by_id`` writes a different value per row in a single statement on
+PostgreSQL (an ``UPDATE ... FROM`` over unnested arrays) and with one
+executemany elsewhere, instead of flushing one ORM object at a time.
+"""
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+
+
+def update_by_id(db: Session, model: type, ids: list[int], columns: dict[str, list], **constants) -> None:
+    """Set ``columns[name][i]`` on the row with id ``ids[i]``, plus ``constants`` on all of them.
+
+    ``constants`` may be SQL expressions, e.g. ``updated_at=table.c.updated_at``
+    to keep a column's ``onupdate`` from firing. The identity map is not
+    synchronized.
+    """
+    if not ids:
+        return
+    table = model.__table__
+    if db.get_bind().dialect.name == "postgresql":
+        rows = select(
+            func.unnest(bindparam("ids", list(ids), type_=ARRAY(table.c.id.type))).label("id"),
+            *[
+                func.unnest(bindparam(f"new_{name}", list(values), type_=ARRAY(table.c[name].type))).label(name)
+                for name, values in columns.items()
+            ],
+        ).subquery()
+        db.execute(
+            update(table)
+            .where(table.c.id == rows.c.id)
+            .values(**{name: rows.c[name] for name in columns}, **constants)
+        )
+        return
+    db.execute(
+        update(table)
+        .where(table.c.id == bindparam("row_id"))
+        .values(**{name: bindparam(f"new_{name}") for name in columns}, **constants),
+        [
+            {"row_id": row_id, **{f"new_{name}": values[i] for name, values in columns.items()}}
+            for i, row_id in enumerate(ids)
+        ],
+    )
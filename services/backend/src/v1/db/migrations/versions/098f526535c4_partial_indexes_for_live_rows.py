@@ -0,0 +1,79 @@
+"""Partial indexes over live (not soft-deleted) rows
+
+Revision ID: 098f526535c4
+Revises: 4e8b677cdd2b
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '098f526535c4'
+down_revision = '4e8b677cdd2b'
+branch_labels = None
+depends_on = None
+
+LIVE_ROWS = "deleted_at IS NULL"
+
+# (index, table, columns, unique, full indexes it replaces); downgrade restores
+# only the first replaced index, later ones are redundant duplicates
+LIVE_INDEXES = [
+    ("idx_candidates_status", "candidates", ["status"], False, ["idx_candidates_status"]),
+    ("idx_candidates_email", "candidates", ["email"], False, ["ix_candidates_email"]),
+    ("idx_candidate_notes_candidate", "candidate_notes", ["candidate_id"], False, ["idx_candidate_notes_candidate"]),
+    # Unique among live rounds only, matching the "round already exists" check
+    (
+        "idx_interview_rounds_candidate_round",
+        "interview_rounds",
+        ["candidate_id", "round_number"],
+        True,
+        ["idx_interview_rounds_candidate_round"],
+    ),
+    ("idx_interview_rounds_status", "interview_rounds", ["status"], False, ["ix_interview_rounds_status"]),
+    (
+        "idx_interview_rounds_scheduled_date",
+        "interview_rounds",
+        ["scheduled_date"],
+        False,
+        ["ix_interview_rounds_scheduled_date", "idx_interview_rounds_scheduled_date"],
+    ),
+]
+
+
+def _index_names(inspector, table):
+    return {index["name"] for index in inspector.get_indexes(table)}
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+
+    for index_name, table, columns, unique, replaces in LIVE_INDEXES:
+        if table not in tables:
+            continue
+        existing = _index_names(inspector, table)
+        for old_name in replaces:
+            if old_name in existing:
+                op.drop_index(old_name, table_name=table)
+                existing.discard(old_name)
+        # Databases created from the current models already have the partial index
+        if index_name in existing:
+            continue
+        op.create_index(
+            index_name,
+            table,
+            columns,
+            unique=unique,
+            postgresql_where=sa.text(LIVE_ROWS),
+            sqlite_where=sa.text(LIVE_ROWS),
+        )
+
+
+def downgrade() -> None:
+    # Restoring the full unique index fails if a deleted round shares its
+    # candidate and round number with a live one; remove such rows first.
+    for index_name, table, columns, unique, replaces in reversed(LIVE_INDEXES):
+        op.drop_index(index_name, table_name=table)
+        op.create_index(replaces[0], table, columns, unique=unique)
@@ -0,0 +1,75 @@
+"""Add composite indexes backing the list sort keys
+
+Revision ID: 1f53949aef89
+Revises: 098f526535c4
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1f53949aef89'
+down_revision = '098f526535c4'
+branch_labels = None
+depends_on = None
+
+LIVE_ROWS = "deleted_at IS NULL"
+
+# (index, table, columns, live rows only)
+SORT_INDEXES = [
+    ("idx_candidates_live_created_at", "candidates", ["created_at", "id"], True),
+    ("idx_candidates_status_created_at", "candidates", ["status", "created_at", "id"], True),
+    ("idx_candidates_name", "candidates", ["name", "id"], True),
+    ("idx_candidates_objective_rating", "candidates", ["objective_rating", "id"], True),
+    ("idx_candidate_buckets_bucket", "candidate_buckets", ["bucket_id", "candidate_id"], False),
+    ("idx_interview_rounds_live_created_at", "interview_rounds", ["created_at", "id"], True),
+    ("idx_interview_rounds_status_created_at", "interview_rounds", ["status", "created_at", "id"], True),
+    (
+        "idx_interview_rounds_interviewer_created_at",
+        "interview_rounds",
+        ["interviewer_id", "created_at", "id"],
+        True,
+    ),
+    ("idx_interview_rounds_scheduled_date", "interview_rounds", ["scheduled_date", "id"], True),
+]
+
+# Indexes superseded by the ones above, with their previous definitions
+REPLACED_INDEXES = [
+    ("idx_candidates_status", "candidates", ["status"], True),
+    ("idx_candidate_buckets_bucket", "candidate_buckets", ["bucket_id"], False),
+    ("idx_interview_rounds_status", "interview_rounds", ["status"], True),
+    ("idx_interview_rounds_scheduled_date", "interview_rounds", ["scheduled_date"], True),
+]
+
+
+def _create_index(index_name, table, columns, live):
+    where = {"postgresql_where": sa.text(LIVE_ROWS), "sqlite_where": sa.text(LIVE_ROWS)} if live else {}
+    op.create_index(index_name, table, columns, **where)
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+    existing = {
+        table: {index["name"] for index in inspector.get_indexes(table)}
+        for table in {table for _, table, _, _ in SORT_INDEXES}
+        if table in tables
+    }
+
+    for index_name, table, _, _ in REPLACED_INDEXES:
+        if index_name in existing.get(table, ()):
+            op.drop_index(index_name, table_name=table)
+            existing[table].discard(index_name)
+
+    for index_name, table, columns, live in SORT_INDEXES:
+        if table in existing and index_name not in existing[table]:
+            _create_index(index_name, table, columns, live)
+
+
+def downgrade() -> None:
+    for index_name, table, _, _ in reversed(SORT_INDEXES):
+        op.drop_index(index_name, table_name=table)
+    for index_name, table, columns, live in REPLACED_INDEXES:
+        _create_index(index_name, table, columns, live)
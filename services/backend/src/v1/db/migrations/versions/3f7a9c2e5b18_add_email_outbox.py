@@ -0,0 +1,55 @@
+"""Add email outbox
+
+Revision ID: 3f7a9c2e5b18
+Revises: 8d2f4a61c0e7
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f7a9c2e5b18'
+down_revision = '8d2f4a61c0e7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "email_outbox" in inspector.get_table_names():
+        return
+
+    op.create_table(
+        "email_outbox",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("to_address", sa.String(), nullable=False),
+        sa.Column("subject", sa.String(), nullable=False),
+        sa.Column("body", sa.Text(), nullable=False),
+        sa.Column("related_resource_type", sa.String(), nullable=True),
+        sa.Column("related_resource_id", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(), nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_email_outbox_id", "email_outbox", ["id"])
+    op.create_index("ix_email_outbox_created_at", "email_outbox", ["created_at"])
+    op.create_index(
+        "idx_email_outbox_due",
+        "email_outbox",
+        ["next_attempt_at"],
+        postgresql_where=sa.text("status = 'pending'"),
+        sqlite_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_email_outbox_due", table_name="email_outbox")
+    op.drop_index("ix_email_outbox_created_at", table_name="email_outbox")
+    op.drop_index("ix_email_outbox_id", table_name="email_outbox")
+    op.drop_table("email_outbox")
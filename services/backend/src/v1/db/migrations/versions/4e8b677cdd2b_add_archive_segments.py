@@ -0,0 +1,43 @@
+"""Add archive segments
+
+Revision ID: 4e8b677cdd2b
+Revises: e42a4d2b607b
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4e8b677cdd2b'
+down_revision = 'e42a4d2b607b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    if "archive_segments" not in inspector.get_table_names():
+        op.create_table(
+            "archive_segments",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("table_name", sa.String(), nullable=False),
+            sa.Column("path", sa.String(), nullable=False),
+            sa.Column("row_count", sa.Integer(), nullable=False),
+            sa.Column("first_id", sa.Integer(), nullable=False),
+            sa.Column("last_id", sa.Integer(), nullable=False),
+            sa.Column("min_created_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("max_created_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.UniqueConstraint("path"),
+        )
+        op.create_index("ix_archive_segments_id", "archive_segments", ["id"])
+        op.create_index("idx_archive_segments_table_time", "archive_segments", ["table_name", "max_created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_archive_segments_table_time", table_name="archive_segments")
+    op.drop_index("ix_archive_segments_id", table_name="archive_segments")
+    op.drop_table("archive_segments")
@@ -0,0 +1,30 @@
+"""Add calibrated rating to interview feedback
+
+Revision ID: 5b1e0c9d7a3f
+Revises: ca344bb5ab04
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b1e0c9d7a3f'
+down_revision = 'ca344bb5ab04'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "interview_feedback" not in inspector.get_table_names():
+        return
+    if "calibrated_rating" in {c["name"] for c in inspector.get_columns("interview_feedback")}:
+        return
+    # Filled in by the first recalibration (POST /feedback/calibration or the next submitted feedback)
+    op.add_column("interview_feedback", sa.Column("calibrated_rating", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("interview_feedback", "calibrated_rating")
@@ -0,0 +1,27 @@
+"""Add change log resource index
+
+Revision ID: 5c8e2b7d41f9
+Revises: b6e1d0c94a27
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c8e2b7d41f9'
+down_revision = 'b6e1d0c94a27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    existing = {index["name"] for index in inspector.get_indexes("change_log")}
+    if "idx_change_log_resource" not in existing:
+        op.create_index("idx_change_log_resource", "change_log", ["resource_type", "resource_id", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_change_log_resource", table_name="change_log")
@@ -0,0 +1,37 @@
+"""Add scoring columns to candidates
+
+Revision ID: 8d2f4a61c0e7
+Revises: 5b1e0c9d7a3f
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2f4a61c0e7'
+down_revision = '5b1e0c9d7a3f'
+branch_labels = None
+depends_on = None
+
+COLUMNS = (
+    ("predicted_salary", sa.Float()),
+    ("scored_at", sa.DateTime(timezone=True)),
+    ("scoring_version", sa.Integer()),
+)
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "candidates" not in inspector.get_table_names():
+        return
+    existing = {c["name"] for c in inspector.get_columns("candidates")}
+    for name, column_type in COLUMNS:
+        if name not in existing:
+            op.add_column("candidates", sa.Column(name, column_type, nullable=True))
+
+
+def downgrade() -> None:
+    for name, _ in reversed(COLUMNS):
+        op.drop_column("candidates", name)
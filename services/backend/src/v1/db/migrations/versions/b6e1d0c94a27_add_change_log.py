@@ -0,0 +1,40 @@
+"""Add change log
+
+Revision ID: b6e1d0c94a27
+Revises: 3f7a9c2e5b18
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e1d0c94a27'
+down_revision = '3f7a9c2e5b18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "change_log" in inspector.get_table_names():
+        return
+
+    op.create_table(
+        "change_log",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("resource_type", sa.String(), nullable=False),
+        sa.Column("resource_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        # Sequence numbers are never reused, even after the newest rows are deleted
+        sqlite_autoincrement=True,
+    )
+    op.create_index("ix_change_log_id", "change_log", ["id"])
+    op.create_index("ix_change_log_created_at", "change_log", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_change_log_created_at", table_name="change_log")
+    op.drop_index("ix_change_log_id", table_name="change_log")
+    op.drop_table("change_log")
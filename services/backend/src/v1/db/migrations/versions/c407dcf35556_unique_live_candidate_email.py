@@ -0,0 +1,59 @@
+"""Make candidate email unique among live candidates
+
+Revision ID: c407dcf35556
+Revises: 1f53949aef89
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c407dcf35556'
+down_revision = '1f53949aef89'
+branch_labels = None
+depends_on = None
+
+LIVE_ROWS = "deleted_at IS NULL"
+
+
+def _create_email_index(unique: bool) -> None:
+    op.create_index(
+        "idx_candidates_email",
+        "candidates",
+        ["email"],
+        unique=unique,
+        postgresql_where=sa.text(LIVE_ROWS),
+        sqlite_where=sa.text(LIVE_ROWS),
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "candidates" not in inspector.get_table_names():
+        return
+
+    duplicates = bind.execute(sa.text(
+        f"SELECT email, COUNT(*) FROM candidates WHERE {LIVE_ROWS} "
+        "GROUP BY email HAVING COUNT(*) > 1 ORDER BY email"
+    )).fetchall()
+    if duplicates:
+        emails = ", ".join(f"{email} ({count})" for email, count in duplicates[:20])
+        raise RuntimeError(
+            f"{len(duplicates)} emails are shared by several live candidates: {emails}. "
+            "Soft-delete or merge the duplicates, then rerun the migration."
+        )
+
+    indexes = {index["name"]: index for index in inspector.get_indexes("candidates")}
+    if "idx_candidates_email" in indexes:
+        if indexes["idx_candidates_email"]["unique"]:
+            return
+        op.drop_index("idx_candidates_email", table_name="candidates")
+    _create_email_index(unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("idx_candidates_email", table_name="candidates")
+    _create_email_index(unique=False)
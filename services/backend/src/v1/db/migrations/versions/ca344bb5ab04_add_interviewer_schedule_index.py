@@ -0,0 +1,38 @@
+"""Add covering index for interviewer busy-slot range scans
+
+Revision ID: ca344bb5ab04
+Revises: c407dcf35556
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ca344bb5ab04'
+down_revision = 'c407dcf35556'
+branch_labels = None
+depends_on = None
+
+LIVE_ROWS = "deleted_at IS NULL"
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "interview_rounds" not in inspector.get_table_names():
+        return
+    if "idx_interview_rounds_interviewer_schedule" in {i["name"] for i in inspector.get_indexes("interview_rounds")}:
+        return
+    op.create_index(
+        "idx_interview_rounds_interviewer_schedule",
+        "interview_rounds",
+        ["interviewer_id", "scheduled_date"],
+        postgresql_include=["duration", "status"],
+        postgresql_where=sa.text(LIVE_ROWS),
+        sqlite_where=sa.text(LIVE_ROWS),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_interview_rounds_interviewer_schedule", table_name="interview_rounds")
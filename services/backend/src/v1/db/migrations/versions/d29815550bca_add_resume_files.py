@@ -0,0 +1,54 @@
+"""Add content-addressed resume files
+
+Revision ID: d29815550bca
+Revises: e026795026cc
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd29815550bca'
+down_revision = 'e026795026cc'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+
+    if "resume_files" not in tables:
+        op.create_table(
+            "resume_files",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("content_hash", sa.String(64), nullable=False),
+            sa.Column("size", sa.BigInteger(), nullable=False),
+            sa.Column("content_type", sa.String(), nullable=False),
+            sa.Column("original_filename", sa.String(), nullable=True),
+            sa.Column("drive_file_id", sa.String(), nullable=True),
+            sa.Column("drive_replicated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+        op.create_index("ix_resume_files_id", "resume_files", ["id"])
+        op.create_index("ix_resume_files_content_hash", "resume_files", ["content_hash"], unique=True)
+
+    if "candidates" in tables and "resume_file_id" not in {c["name"] for c in inspector.get_columns("candidates")}:
+        with op.batch_alter_table("candidates") as batch_op:
+            batch_op.add_column(sa.Column("resume_file_id", sa.Integer(), nullable=True))
+            batch_op.create_foreign_key(
+                "fk_candidates_resume_file_id", "resume_files", ["resume_file_id"], ["id"]
+            )
+            batch_op.create_index("ix_candidates_resume_file_id", ["resume_file_id"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("candidates") as batch_op:
+        batch_op.drop_index("ix_candidates_resume_file_id")
+        batch_op.drop_constraint("fk_candidates_resume_file_id", type_="foreignkey")
+        batch_op.drop_column("resume_file_id")
+    op.drop_index("ix_resume_files_content_hash", table_name="resume_files")
+    op.drop_index("ix_resume_files_id", table_name="resume_files")
+    op.drop_table("resume_files")
@@ -0,0 +1,75 @@
+"""Store refresh tokens as SHA-256 hashes and track rotation
+
+Revision ID: e026795026cc
+Revises:
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e026795026cc'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _columns(table: str) -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    if table not in inspector.get_table_names():
+        return set()
+    return {column["name"] for column in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    columns = _columns("refresh_tokens")
+    # Fresh databases get the new layout from the models; nothing to migrate.
+    if not columns or "token_hash" in columns:
+        return
+
+    op.add_column("refresh_tokens", sa.Column("token_hash", sa.String(64), nullable=True))
+    op.add_column("refresh_tokens", sa.Column("replaced_by_id", sa.Integer(), nullable=True))
+
+    bind = op.get_bind()
+    tokens = sa.table(
+        "refresh_tokens",
+        sa.column("id", sa.Integer),
+        sa.column("token", sa.String),
+        sa.column("token_hash", sa.String),
+    )
+    for row in bind.execute(sa.select(tokens.c.id, tokens.c.token)):
+        bind.execute(
+            tokens.update()
+            .where(tokens.c.id == row.id)
+            .values(token_hash=hashlib.sha256(row.token.encode("utf-8")).hexdigest())
+        )
+
+    with op.batch_alter_table("refresh_tokens") as batch_op:
+        batch_op.alter_column("token_hash", nullable=False)
+        batch_op.drop_index("ix_refresh_tokens_token")
+        batch_op.drop_column("token")
+        batch_op.create_index("ix_refresh_tokens_token_hash", ["token_hash"], unique=True)
+        batch_op.create_foreign_key(
+            "fk_refresh_tokens_replaced_by_id",
+            "refresh_tokens",
+            ["replaced_by_id"],
+            ["id"],
+            ondelete="SET NULL",
+        )
+
+
+def downgrade() -> None:
+    # Plaintext tokens cannot be recovered from their hashes; existing
+    # sessions are dropped and users sign in again.
+    op.execute("DELETE FROM refresh_tokens")
+    with op.batch_alter_table("refresh_tokens") as batch_op:
+        batch_op.drop_constraint("fk_refresh_tokens_replaced_by_id", type_="foreignkey")
+        batch_op.drop_index("ix_refresh_tokens_token_hash")
+        batch_op.drop_column("replaced_by_id")
+        batch_op.drop_column("token_hash")
+        batch_op.add_column(sa.Column("token", sa.String(), nullable=False))
+        batch_op.create_index("ix_refresh_tokens_token", ["token"], unique=True)
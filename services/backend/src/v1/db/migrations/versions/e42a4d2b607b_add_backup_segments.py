@@ -0,0 +1,65 @@
+"""Add backup segments and change-tracking indexes
+
+Revision ID: e42a4d2b607b
+Revises: d29815550bca
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e42a4d2b607b'
+down_revision = 'd29815550bca'
+branch_labels = None
+depends_on = None
+
+# Indexes the incremental backup uses to find rows changed since its high-water mark
+CHANGE_INDEXES = [
+    ("idx_candidates_updated_at", "candidates", "updated_at"),
+    ("idx_candidate_notes_updated_at", "candidate_notes", "updated_at"),
+    ("idx_interview_rounds_created_at", "interview_rounds", "created_at"),
+    ("idx_interview_rounds_updated_at", "interview_rounds", "updated_at"),
+    ("idx_interview_feedback_created_at", "interview_feedback", "created_at"),
+    ("idx_interview_feedback_updated_at", "interview_feedback", "updated_at"),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+
+    if "backup_segments" not in tables:
+        op.create_table(
+            "backup_segments",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("changed_since", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("high_water_mark", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("profile_count", sa.Integer(), nullable=False),
+            sa.Column("size", sa.BigInteger(), nullable=False),
+            sa.Column("status", sa.String(), nullable=False, server_default="pending"),
+            sa.Column("upload_session", sa.String(), nullable=True),
+            sa.Column("uploaded_bytes", sa.BigInteger(), nullable=False, server_default="0"),
+            sa.Column("remote_id", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("uploaded_at", sa.DateTime(timezone=True), nullable=True),
+            sa.UniqueConstraint("name"),
+        )
+        op.create_index("ix_backup_segments_id", "backup_segments", ["id"])
+        op.create_index("ix_backup_segments_high_water_mark", "backup_segments", ["high_water_mark"])
+        op.create_index("ix_backup_segments_status", "backup_segments", ["status"])
+
+    for index_name, table, column in CHANGE_INDEXES:
+        if table in tables and index_name not in {i["name"] for i in inspector.get_indexes(table)}:
+            op.create_index(index_name, table, [column])
+
+
+def downgrade() -> None:
+    for index_name, table, _ in reversed(CHANGE_INDEXES):
+        op.drop_index(index_name, table_name=table)
+    op.drop_index("ix_backup_segments_status", table_name="backup_segments")
+    op.drop_index("ix_backup_segments_high_water_mark", table_name="backup_segments")
+    op.drop_index("ix_backup_segments_id", table_name="backup_segments")
+    op.drop_table("backup_segments")
@@ -0,0 +1,54 @@
+"""Soft-delete support.
+
+Models that mix in ``SoftDeleteMixin`` are deleted by setting ``deleted_at``.
+Every ORM ``SELECT`` issued through a session hides those rows automatically,
+including rows reached through aliases and joins, so callers no longer filter
+``deleted_at == None`` by hand. Pass the ``include_deleted`` execution option
+to see them, e.g. ``db.query(Candidate).execution_options(include_deleted=True)``.
+
+Relationship and column lazy loads are left alone, so an object that is
+already loaded still sees its deleted children and a deleted object can still
+be refreshed.
+"""
+from sqlalchemy import Column, DateTime, Index, event, text
+from sqlalchemy.orm import ORMExecuteState, Session, with_loader_criteria
+
+
+class SoftDeleteMixin:
+    """Marks a model as soft-deletable and hides its deleted rows from queries."""
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+
+
+def live_index(name: str, *columns: str, **kwargs) -> Index:
+    """A partial index over live rows only, for columns that are only queried with deleted rows hidden."""
+    return Index(
+        name,
+        *columns,
+        postgresql_where=text("deleted_at IS NULL"),
+        sqlite_where=text("deleted_at IS NULL"),
+        **kwargs,
+    )
+
+
+def exclude_deleted(statement):
+    """Add the live-rows criteria to an ORM statement that is compiled outside a session."""
+    return statement.options(
+        with_loader_criteria(
+            SoftDeleteMixin,
+            lambda cls: cls.deleted_at.is_(None),
+            include_aliases=True,
+            propagate_to_loaders=False,
+        )
+    )
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _exclude_soft_deleted(execute_state: ORMExecuteState) -> None:
+    if (
+        not execute_state.is_select
+        or execute_state.is_column_load
+        or execute_state.is_relationship_load
+        or execute_state.execution_options.get("include_deleted", False)
+    ):
+        return
+    execute_state.statement = exclude_deleted(execute_state.statement)
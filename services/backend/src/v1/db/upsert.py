@@ -0,0 +1,44 @@
+"""Single-statement inserts that rely on unique constraints.
+
+``insert_unless_exists`` issues ``INSERT ... ON CONFLICT DO NOTHING ...
+RETURNING`` (PostgreSQL, and SQLite 3.35+), so creating a row, checking for a
+duplicate and reading back server defaults is one round-trip, and concurrent
+submissions of the same row cannot both succeed.
+"""
+from typing import Optional, Sequence
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def insert_unless_exists(
+    db: Session,
+    model: type,
+    conflict_columns: Sequence[str],
+    values: Optional[dict] = None,
+    from_select=None,
+    conflict_where=None,
+):
+    """Insert a row unless it would violate the unique index on ``conflict_columns``.
+
+    The row comes from ``values`` or, when given, from the ``(columns,
+    select)`` pair ``from_select``; the select may match nothing (e.g. when a
+    referenced row is missing). ``conflict_where`` names the predicate of a
+    partial unique index. Returns the new instance, or ``None`` if nothing was
+    inserted.
+    """
+    statement = DIALECT_INSERTS[db.get_bind().dialect.name](model)
+    if from_select is not None:
+        statement = statement.from_select(*from_select)
+    else:
+        statement = statement.values(**values)
+    statement = statement.on_conflict_do_nothing(
+        index_elements=conflict_columns,
+        index_where=conflict_where,
+    ).returning(model)
+    return db.scalars(statement).one_or_none()
@@ -9,6 +9,11 @@ from .notification import Notification
 from .audit_log import AuditLog
 from .refresh_token import RefreshToken
 from .search_log import SearchLog
+from .resume import ResumeFile
+from .backup import BackupSegment
+from .archive import ArchiveSegment
+from .email_outbox import EmailOutbox
+from .change_log import ChangeLog
 
 __all__ = [
     "User",
@@ -26,5 +31,10 @@ __all__ = [
     "AuditLog",
     "RefreshToken",
     "SearchLog",
+    "ResumeFile",
+    "BackupSegment",
+    "ArchiveSegment",
+    "EmailOutbox",
+    "ChangeLog",
 ]
 
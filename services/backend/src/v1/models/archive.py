@@ -0,0 +1,25 @@
+"""Archive segment model."""
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from sqlalchemy.sql import func
+
+from ..db.base import Base
+
+
+class ArchiveSegment(Base):
+    """A compressed file of rows moved out of a hot table by the retention job."""
+    
+    __tablename__ = "archive_segments"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    table_name = Column(String, nullable=False)
+    path = Column(String, unique=True, nullable=False)  # relative to ARCHIVE_PATH
+    row_count = Column(Integer, nullable=False)
+    first_id = Column(Integer, nullable=False)
+    last_id = Column(Integer, nullable=False)
+    min_created_at = Column(DateTime(timezone=True), nullable=False)
+    max_created_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        Index("idx_archive_segments_table_time", "table_name", "max_created_at"),
+    )
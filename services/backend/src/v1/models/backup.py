@@ -0,0 +1,24 @@
+"""Backup segment model."""
+from sqlalchemy import Column, Integer, String, DateTime, BigInteger
+from sqlalchemy.sql import func
+
+from ..db.base import Base
+
+
+class BackupSegment(Base):
+    """One incremental profile backup segment and its upload state."""
+    
+    __tablename__ = "backup_segments"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, nullable=False)  # object name at the destination
+    changed_since = Column(DateTime(timezone=True), nullable=True)  # None for the initial full segment
+    high_water_mark = Column(DateTime(timezone=True), nullable=False, index=True)
+    profile_count = Column(Integer, nullable=False)
+    size = Column(BigInteger, nullable=False)  # bytes, compressed
+    status = Column(String, nullable=False, default="pending", index=True)  # pending, uploaded
+    upload_session = Column(String, nullable=True)  # transport session to resume an interrupted upload
+    uploaded_bytes = Column(BigInteger, nullable=False, default=0)
+    remote_id = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    uploaded_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,38 +1,43 @@
 """Candidate models."""
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime, ForeignKey, Index
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
 
 from ..db.base import Base
+from ..db.soft_delete import SoftDeleteMixin, live_index
 
 
-class Candidate(Base):
+class Candidate(SoftDeleteMixin, Base):
     """Candidate model."""
     
     __tablename__ = "candidates"
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
-    email = Column(String, index=True, nullable=False)
+    email = Column(String, nullable=False)
     phone_number = Column(String, nullable=True)
     location = Column(String, nullable=True)
     years_of_experience = Column(Integer, nullable=True)
     current_salary = Column(Float, nullable=True)
     expected_salary = Column(Float, nullable=True)
     resume_url = Column(String, nullable=True)
+    resume_file_id = Column(Integer, ForeignKey("resume_files.id"), nullable=True, index=True)
     status = Column(String, nullable=False, default="eligible")  # eligible, rejected, hired
     source = Column(String, nullable=True)  # linkedin, naukri, referral
     objective_rating = Column(Float, nullable=True)
+    predicted_salary = Column(Float, nullable=True)
+    scored_at = Column(DateTime(timezone=True), nullable=True)  # when the scoring model last ran on this row
+    scoring_version = Column(Integer, nullable=True)
     remarks = Column(Text, nullable=True)
     uploaded_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     upload_date = Column(DateTime(timezone=True), server_default=func.now(), index=True)
-    deleted_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
     uploader = relationship("User", back_populates="uploaded_candidates")
+    resume_file = relationship("ResumeFile", back_populates="candidates")
     buckets = relationship("CandidateBucket", back_populates="candidate", cascade="all, delete-orphan")
     skills = relationship("CandidateSkill", back_populates="candidate", cascade="all, delete-orphan")
     interviews = relationship("InterviewRound", back_populates="candidate", cascade="all, delete-orphan")
@@ -40,9 +45,16 @@ class Candidate(Base):
     notes = relationship("CandidateNote", back_populates="candidate", cascade="all, delete-orphan")
     
     __table_args__ = (
-        Index("idx_candidates_status", "status"),
+        # Unique among live candidates; creation relies on it (ON CONFLICT DO NOTHING)
+        live_index("idx_candidates_email", "email", unique=True),
+        # One index per public sort key (core/sorting.py), ending in the id tie-breaker
+        live_index("idx_candidates_live_created_at", "created_at", "id"),
+        live_index("idx_candidates_status_created_at", "status", "created_at", "id"),
+        live_index("idx_candidates_name", "name", "id"),
+        live_index("idx_candidates_objective_rating", "objective_rating", "id"),
         Index("idx_candidates_uploaded_by", "uploaded_by"),
         Index("idx_candidates_created_at", "created_at"),
+        Index("idx_candidates_updated_at", "updated_at"),
     )
 
 
@@ -61,7 +73,7 @@ class CandidateBucket(Base):
     
     __table_args__ = (
         Index("idx_candidate_buckets_candidate", "candidate_id"),
-        Index("idx_candidate_buckets_bucket", "bucket_id"),
+        Index("idx_candidate_buckets_bucket", "bucket_id", "candidate_id"),
         Index("idx_candidate_buckets_unique", "candidate_id", "bucket_id", unique=True),
     )
 
@@ -88,7 +100,7 @@ class CandidateSkill(Base):
     )
 
 
-class CandidateNote(Base):
+class CandidateNote(SoftDeleteMixin, Base):
     """Notes for candidates."""
     
     __tablename__ = "candidate_notes"
@@ -98,7 +110,6 @@ class CandidateNote(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     note = Column(Text, nullable=False)
     is_internal = Column(Boolean, default=True, nullable=False)
-    deleted_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -107,7 +118,8 @@ class CandidateNote(Base):
     user = relationship("User")
     
     __table_args__ = (
-        Index("idx_candidate_notes_candidate", "candidate_id"),
+        live_index("idx_candidate_notes_candidate", "candidate_id"),
         Index("idx_candidate_notes_user", "user_id"),
+        Index("idx_candidate_notes_updated_at", "updated_at"),
     )
 
@@ -0,0 +1,23 @@
+"""Change log model."""
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from sqlalchemy.sql import func
+
+from ..db.base import Base
+
+
+class ChangeLog(Base):
+    """One write to a synced resource (including its deletion); ``id`` is the change feed's sequence."""
+    
+    __tablename__ = "change_log"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    resource_type = Column(String, nullable=False)  # candidate, interview, feedback
+    resource_id = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    
+    __table_args__ = (
+        # Latest version of one resource (ETags)
+        Index("idx_change_log_resource", "resource_type", "resource_id", "id"),
+        # Sequence numbers are never reused, even after the newest rows are deleted
+        {"sqlite_autoincrement": True},
+    )
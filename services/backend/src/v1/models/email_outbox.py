@@ -0,0 +1,35 @@
+"""Email outbox model."""
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, text
+from sqlalchemy.sql import func
+
+from ..db.base import Base
+
+
+class EmailOutbox(Base):
+    """An email waiting for, or done with, delivery by the dispatcher."""
+    
+    __tablename__ = "email_outbox"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)  # interview_invite, rejection_notice, upload_confirmation, etc.
+    to_address = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    body = Column(Text, nullable=False)
+    related_resource_type = Column(String, nullable=True)  # candidate, interview, etc.
+    related_resource_id = Column(Integer, nullable=True)
+    status = Column(String, nullable=False, default="pending")  # pending, sent, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())  # also the claim lease
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        # The dispatcher's queue: only pending rows, in the order they fall due
+        Index(
+            "idx_email_outbox_due",
+            "next_attempt_at",
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+    )
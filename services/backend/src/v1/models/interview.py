@@ -4,9 +4,10 @@ from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from ..db.base import Base
+from ..db.soft_delete import SoftDeleteMixin, live_index
 
 
-class InterviewRound(Base):
+class InterviewRound(SoftDeleteMixin, Base):
     """Interview round model."""
     
     __tablename__ = "interview_rounds"
@@ -15,8 +16,8 @@ class InterviewRound(Base):
     candidate_id = Column(Integer, ForeignKey("candidates.id"), nullable=False, index=True)
     round_number = Column(Integer, nullable=False)  # 0-4
     round_name = Column(String, nullable=False)  # Phone Screen, Technical, Task Based, Behavioural
-    status = Column(String, nullable=False, default="scheduled", index=True)  # scheduled, completed, cancelled
-    scheduled_date = Column(DateTime(timezone=True), nullable=True, index=True)
+    status = Column(String, nullable=False, default="scheduled")  # scheduled, completed, cancelled
+    scheduled_date = Column(DateTime(timezone=True), nullable=True)
     duration = Column(Integer, nullable=True)  # minutes
     interviewer_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     meeting_link = Column(String, nullable=True)
@@ -27,7 +28,6 @@ class InterviewRound(Base):
     current_ctc = Column(Float, nullable=True)
     expected_ctc = Column(Float, nullable=True)
     notice_period = Column(Integer, nullable=True)  # days
-    deleted_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -37,8 +37,22 @@ class InterviewRound(Base):
     feedback = relationship("InterviewFeedback", back_populates="interview_round", uselist=False)
     
     __table_args__ = (
-        Index("idx_interview_rounds_candidate_round", "candidate_id", "round_number", unique=True),
-        Index("idx_interview_rounds_scheduled_date", "scheduled_date"),
+        # Unique among live rounds only, so a deleted round can be scheduled again
+        live_index("idx_interview_rounds_candidate_round", "candidate_id", "round_number", unique=True),
+        # One index per public sort key (core/sorting.py), ending in the id tie-breaker
+        live_index("idx_interview_rounds_live_created_at", "created_at", "id"),
+        live_index("idx_interview_rounds_status_created_at", "status", "created_at", "id"),
+        live_index("idx_interview_rounds_interviewer_created_at", "interviewer_id", "created_at", "id"),
+        live_index("idx_interview_rounds_scheduled_date", "scheduled_date", "id"),
+        # Busy-slot range scans per interviewer (core/scheduling.py), answered from the index alone
+        live_index(
+            "idx_interview_rounds_interviewer_schedule",
+            "interviewer_id",
+            "scheduled_date",
+            postgresql_include=["duration", "status"],
+        ),
+        Index("idx_interview_rounds_created_at", "created_at"),
+        Index("idx_interview_rounds_updated_at", "updated_at"),
     )
 
 
@@ -55,6 +69,7 @@ class InterviewFeedback(Base):
     code_cleanliness_score = Column(Integer, nullable=False)  # 0-100
     communication_score = Column(Integer, nullable=False)  # 0-100
     overall_rating = Column(Float, nullable=False)  # calculated
+    calibrated_rating = Column(Float, nullable=True)  # overall_rating corrected for interviewer and round
     feedback_text = Column(Text, nullable=True)
     decision = Column(String, nullable=False)  # eligible, rejected
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -67,5 +82,7 @@ class InterviewFeedback(Base):
     __table_args__ = (
         Index("idx_interview_feedback_round", "interview_round_id"),
         Index("idx_interview_feedback_interviewer", "interviewer_id"),
+        Index("idx_interview_feedback_created_at", "created_at"),
+        Index("idx_interview_feedback_updated_at", "updated_at"),
     )
 
@@ -0,0 +1,24 @@
+"""Resume file model."""
+from sqlalchemy import Column, Integer, String, DateTime, BigInteger
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from ..db.base import Base
+
+
+class ResumeFile(Base):
+    """Stored resume file, addressed by the SHA-256 of its content."""
+    
+    __tablename__ = "resume_files"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String(64), unique=True, nullable=False, index=True)  # SHA-256 hex
+    size = Column(BigInteger, nullable=False)  # bytes
+    content_type = Column(String, nullable=False)
+    original_filename = Column(String, nullable=True)
+    drive_file_id = Column(String, nullable=True)  # set once replicated to Google Drive
+    drive_replicated_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    candidates = relationship("Candidate", back_populates="resume_file")
@@ -6,9 +6,10 @@ from datetime import datetime
 from typing import Optional
 
 from ..db.base import Base
+from ..db.soft_delete import SoftDeleteMixin
 
 
-class User(Base):
+class User(SoftDeleteMixin, Base):
     """User model for authentication and authorization."""
     
     __tablename__ = "users"
@@ -21,7 +22,6 @@ class User(Base):
     oauth_id = Column(String, nullable=True)
     password_hash = Column(String, nullable=True)  # For non-OAuth users
     is_active = Column(Boolean, default=True, nullable=False)
-    deleted_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
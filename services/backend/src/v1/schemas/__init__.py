@@ -6,6 +6,12 @@ from .candidate import (
     CandidateUpdate,
     CandidateResponse,
     CandidateListResponse,
+    CandidateAssociations,
+    CandidateAssociationsUpdate,
+    CandidateRejection,
+    CandidateStatusTransition,
+    CandidateTransitionResponse,
+    ScoringModelSummary,
 )
 from .interview import (
     InterviewRound,
@@ -15,9 +21,17 @@ from .interview import (
     InterviewFeedback,
     InterviewFeedbackCreate,
     InterviewFeedbackResponse,
+    InterviewSlot,
+    InterviewAvailability,
+    InterviewAssignment,
+    InterviewAssignmentSkip,
+    InterviewAssignmentResponse,
 )
 from .auth import Token, TokenData, LoginResponse
 from .common import PaginationParams, PaginationResponse
+from .resume import ResumeFileResponse, ResumeDownloadURL, ResumeUploadResult, ExtractionSummary, BatchUploadResponse
+from .audit import AuditLogResponse, AuditLogListResponse
+from .change import Change, ChangeFeed
 
 __all__ = [
     "User",
@@ -28,6 +42,12 @@ __all__ = [
     "CandidateUpdate",
     "CandidateResponse",
     "CandidateListResponse",
+    "CandidateAssociations",
+    "CandidateAssociationsUpdate",
+    "CandidateRejection",
+    "CandidateStatusTransition",
+    "CandidateTransitionResponse",
+    "ScoringModelSummary",
     "InterviewRound",
     "InterviewRoundCreate",
     "InterviewRoundUpdate",
@@ -35,10 +55,24 @@ __all__ = [
     "InterviewFeedback",
     "InterviewFeedbackCreate",
     "InterviewFeedbackResponse",
+    "InterviewSlot",
+    "InterviewAvailability",
+    "InterviewAssignment",
+    "InterviewAssignmentSkip",
+    "InterviewAssignmentResponse",
     "Token",
     "TokenData",
     "LoginResponse",
     "PaginationParams",
     "PaginationResponse",
+    "ResumeFileResponse",
+    "ResumeDownloadURL",
+    "ResumeUploadResult",
+    "ExtractionSummary",
+    "BatchUploadResponse",
+    "AuditLogResponse",
+    "AuditLogListResponse",
+    "Change",
+    "ChangeFeed",
 ]
 
@@ -0,0 +1,26 @@
+"""Audit log schemas."""
+from pydantic import BaseModel
+from typing import Optional, List, Any
+from datetime import datetime
+
+
+class AuditLogResponse(BaseModel):
+    """Audit log entry schema."""
+    id: int
+    user_id: Optional[int] = None
+    action: str
+    resource_type: str
+    resource_id: Optional[int] = None
+    changes: Optional[Any] = None
+    ip_address: Optional[str] = None
+    user_agent: Optional[str] = None
+    created_at: datetime
+    archived: bool = False  # served from an archive file rather than the hot table
+    
+    class Config:
+        from_attributes = True
+
+
+class AuditLogListResponse(BaseModel):
+    """Audit log search results, newest first."""
+    data: List[AuditLogResponse]
@@ -1,5 +1,5 @@
 """Candidate schemas."""
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List
 from datetime import datetime
 
@@ -45,6 +45,7 @@ class CandidateUpdate(BaseModel):
 class CandidateResponse(CandidateBase):
     """Candidate response schema."""
     id: int
+    predicted_salary: Optional[float] = None
     resume_url: Optional[str] = None
     uploaded_by: int
     upload_date: datetime
@@ -52,6 +53,8 @@ class CandidateResponse(CandidateBase):
     updated_at: Optional[datetime]
     bucket_ids: List[int] = []
     skill_ids: List[int] = []
+    resume_preview_url: Optional[str] = None
+    resume_thumbnail_url: Optional[str] = None
     
     class Config:
         from_attributes = True
@@ -65,3 +68,58 @@ class CandidateListResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+class CandidateAssociationsUpdate(BaseModel):
+    """Buckets and skills to add to or remove from a candidate."""
+    add_bucket_ids: List[int] = []
+    remove_bucket_ids: List[int] = []
+    add_skill_ids: List[int] = []
+    remove_skill_ids: List[int] = []
+
+
+class CandidateAssociations(BaseModel):
+    """A candidate's bucket and skill ids."""
+    bucket_ids: List[int]
+    skill_ids: List[int]
+
+
+class CandidateRejection(BaseModel):
+    """Batch rejection request."""
+    candidate_ids: List[int] = Field(min_length=1, max_length=500)
+    reason: Optional[str] = None
+    stage: str = Field(default="resume_screening", pattern="^(resume_screening|interview_round)$")
+    round_number: Optional[int] = None
+    notes: Optional[str] = None
+
+
+class CandidateStatusTransition(CandidateRejection):
+    """Batch status transition request; the rejection fields apply when moving to rejected."""
+    status: str = Field(pattern="^(eligible|rejected|hired)$")
+
+
+class CandidateTransitionSkip(BaseModel):
+    """A candidate left unchanged by a batch transition."""
+    id: int
+    reason: str
+
+
+class CandidateTransitionResponse(BaseModel):
+    """Batch status transition result."""
+    updated: List[int]
+    skipped: List[CandidateTransitionSkip]
+
+
+class Candidate(CandidateResponse):
+    """Full candidate schema."""
+    pass
+
+
+class ScoringModelSummary(BaseModel):
+    """A trained version of the candidate scoring models."""
+    version: int
+    trained_at: str
+    skills: int
+    rating_samples: int
+    rating_rmse: Optional[float] = None
+    salary_samples: int
+    salary_rmse_log: Optional[float] = None
@@ -0,0 +1,19 @@
+"""Change feed schemas."""
+from pydantic import BaseModel
+from typing import Optional, List
+
+
+class Change(BaseModel):
+    """The latest change of one resource."""
+    sequence: int
+    resource_type: str  # candidate, interview, feedback
+    resource_id: int
+    action: str  # upsert, delete
+    data: Optional[dict] = None  # the resource's current representation (upsert only)
+
+
+class ChangeFeed(BaseModel):
+    """A page of the change feed."""
+    changes: List[Change]
+    cursor: int  # pass back as ``since`` for the next page
+    has_more: bool  # another page is available right away
@@ -11,6 +11,35 @@ class PaginationParams(BaseModel):
     page_size: int = Field(default=20, ge=1, le=100, description="Items per page")
     sort_by: Optional[str] = Field(default="created_at", description="Field to sort by")
     sort_order: str = Field(default="desc", pattern="^(asc|desc)$", description="Sort order")
+    count: Optional[str] = Field(
+        default=None,
+        pattern="^(auto|exact|estimate|cached)$",
+        description="How the total is counted (defaults to LIST_COUNT_STRATEGY)",
+    )
+
+
+def calculate_pagination(
+    total: int,
+    page: int,
+    page_size: int,
+    total_exact: bool = True,
+    has_next: Optional[bool] = None,
+) -> dict:
+    """Calculate pagination metadata.
+
+    ``total`` may be an estimate (``total_exact`` is then false); pass
+    ``has_next`` from the page itself so it stays accurate regardless.
+    """
+    total_pages = (total + page_size - 1) // page_size
+    return {
+        "total": total,
+        "total_exact": total_exact,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": total_pages,
+        "has_next": page < total_pages if has_next is None else has_next,
+        "has_prev": page > 1,
+    }
 
 
 class PaginationResponse(BaseModel, Generic[T]):
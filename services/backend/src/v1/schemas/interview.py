@@ -1,6 +1,6 @@
 """Interview schemas."""
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -19,7 +19,8 @@ class InterviewRoundBase(BaseModel):
 
 
 class InterviewRoundCreate(InterviewRoundBase):
-    """Interview round creation schema."""
+    """Interview round creation schema; the least loaded interviewer is assigned when none is given."""
+    interviewer_id: Optional[int] = None
     status: str = "scheduled"
 
 
@@ -71,9 +72,52 @@ class InterviewFeedbackResponse(InterviewFeedbackBase):
     id: int
     interviewer_id: int
     overall_rating: float
+    calibrated_rating: Optional[float] = None
     created_at: datetime
     updated_at: Optional[datetime]
     
     class Config:
         from_attributes = True
 
+
+class InterviewSlot(BaseModel):
+    """A time slot (UTC)."""
+    start: datetime
+    end: datetime
+
+
+class InterviewAvailability(BaseModel):
+    """Free slots of an interview panel over a date range."""
+    free_slots: List[InterviewSlot]
+    earliest: Optional[InterviewSlot] = None
+
+
+class InterviewAssignment(BaseModel):
+    """Bulk round creation with automatic interviewer assignment."""
+    candidate_ids: List[int] = Field(min_length=1, max_length=500)
+    round_number: int = Field(ge=0, le=4)
+    round_name: str
+    scheduled_date: Optional[datetime] = None
+    duration: Optional[int] = None
+
+
+class InterviewAssignmentSkip(BaseModel):
+    """A candidate left out of a bulk assignment, with the reason."""
+    candidate_id: int
+    reason: str
+
+
+class InterviewAssignmentResponse(BaseModel):
+    """Result of a bulk assignment."""
+    created: List[InterviewRoundResponse]
+    skipped: List[InterviewAssignmentSkip]
+
+
+class InterviewRound(InterviewRoundResponse):
+    """Full interview round schema."""
+    pass
+
+
+class InterviewFeedback(InterviewFeedbackResponse):
+    """Full interview feedback schema."""
+    pass
@@ -0,0 +1,55 @@
+"""Resume schemas."""
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+
+class ResumeFileResponse(BaseModel):
+    """Stored resume file schema."""
+    id: int
+    content_hash: str
+    size: int
+    content_type: str
+    original_filename: Optional[str] = None
+    drive_file_id: Optional[str] = None
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class ResumeDownloadURL(BaseModel):
+    """Signed, expiring resume download URL."""
+    url: str
+    expires_at: datetime
+
+
+class ResumeUploadResult(BaseModel):
+    """Outcome of one file in a batch upload."""
+    filename: Optional[str] = None
+    resume_file_id: int
+    content_hash: str
+    size: int
+    duplicate: bool  # identical content was already stored
+    parsed: dict
+    candidate_id: Optional[int] = None  # set when a candidate profile was created
+
+
+class ExtractionSummary(BaseModel):
+    """Cost and throughput of the field extraction for one upload."""
+    resumes: int
+    cached: int  # answered from the extraction cache
+    extracted: int  # by the model
+    heuristic: int  # by the heuristic parser
+    requests: int
+    failed_requests: int  # failed or timed out; their resumes fell back to the heuristic parser
+    prompt_tokens: int
+    completion_tokens: int
+    cost_usd: float
+    seconds: float
+
+
+class BatchUploadResponse(BaseModel):
+    """Batch upload response."""
+    data: List[ResumeUploadResult]
+    extraction: ExtractionSummary
@@ -0,0 +1 @@
+"""External service integrations."""
@@ -0,0 +1,456 @@
+"""Incremental candidate profile backups.
+
+Each run writes the candidate profiles (with buckets, skills, interviews,
+feedback and notes) that changed since the previous run's high-water mark to
+one gzip-compressed NDJSON segment, so a run costs in proportion to the day's
+changes rather than to the size of the database. Segments are uploaded in
+resumable chunks through a pluggable transport: Google Drive in production, a
+local directory for development and restore drills. A full snapshot is rebuilt
+by replaying the segments in order, later copies of a profile replacing
+earlier ones.
+"""
+import gzip
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Optional
+
+import orjson
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..core.serialization import group_ids
+from ..models.backup import BackupSegment
+from ..models.candidate import Candidate, CandidateBucket, CandidateNote, CandidateSkill
+from ..models.interview import InterviewFeedback, InterviewRound
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PREFIX = "profiles-"
+SEGMENT_SUFFIX = ".ndjson.gz"
+
+
+class TransientUploadError(Exception):
+    """A chunk upload failed in a way that is worth retrying."""
+
+
+class UploadSessionExpired(Exception):
+    """The destination no longer knows the upload session; the upload must restart."""
+
+
+class BackupTransport(ABC):
+    """Destination for backup segments that supports resumable uploads.
+
+    Upload methods return ``(committed_bytes, remote_id)``; ``remote_id`` is
+    set once the destination holds the complete segment.
+    """
+
+    @abstractmethod
+    def start_upload(self, name: str, size: int) -> str:
+        """Open an upload session for a segment and return its id."""
+
+    @abstractmethod
+    def upload_chunk(self, session: str, offset: int, data: bytes, total: int) -> tuple[int, Optional[str]]:
+        """Send ``data`` starting at ``offset``."""
+
+    @abstractmethod
+    def committed_bytes(self, session: str, total: int) -> tuple[int, Optional[str]]:
+        """Ask the destination how much of an interrupted upload it holds."""
+
+    @abstractmethod
+    def list_segments(self) -> list[str]:
+        """Names of all uploaded segments, oldest first."""
+
+    @abstractmethod
+    def download(self, name: str, path: str) -> None:
+        """Copy an uploaded segment to a local path."""
+
+
+class LocalDirectoryTransport(BackupTransport):
+    """Stores segments in a local directory; partial uploads live under ``.uploads``."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.uploads = os.path.join(root, ".uploads")
+
+    def _paths(self, session: str) -> tuple[str, str]:
+        _, name = session.split("-", 1)
+        return os.path.join(self.uploads, session), os.path.join(self.root, name)
+
+    def start_upload(self, name: str, size: int) -> str:
+        os.makedirs(self.uploads, exist_ok=True)
+        session = f"{uuid.uuid4().hex}-{name}"
+        open(os.path.join(self.uploads, session), "wb").close()
+        return session
+
+    def upload_chunk(self, session: str, offset: int, data: bytes, total: int) -> tuple[int, Optional[str]]:
+        partial, final = self._paths(session)
+        committed, remote_id = self.committed_bytes(session, total)
+        if offset != committed or remote_id is not None:
+            return committed, remote_id
+        with open(partial, "ab") as file:
+            file.write(data)
+        committed += len(data)
+        if committed < total:
+            return committed, None
+        os.replace(partial, final)
+        return total, os.path.basename(final)
+
+    def committed_bytes(self, session: str, total: int) -> tuple[int, Optional[str]]:
+        partial, final = self._paths(session)
+        if os.path.exists(partial):
+            return os.path.getsize(partial), None
+        if os.path.exists(final):
+            return total, os.path.basename(final)
+        raise UploadSessionExpired(session)
+
+    def list_segments(self) -> list[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+        )
+
+    def download(self, name: str, path: str) -> None:
+        with open(os.path.join(self.root, name), "rb") as source, open(path, "wb") as target:
+            while chunk := source.read(1024 * 1024):
+                target.write(chunk)
+
+
+class GoogleDriveTransport(BackupTransport):
+    """Uploads segments to a Google Drive folder with the resumable upload protocol."""
+
+    UPLOAD_URL = "https://www.googleapis.com/upload/drive/v3/files?uploadType=resumable&fields=id"
+
+    def __init__(self, service_account_key: str, folder_id: Optional[str]):
+        self.service_account_key = service_account_key
+        self.folder_id = folder_id
+        self._credentials = None
+        self._service = None
+        self._file_ids: dict[str, str] = {}
+
+    def _get_credentials(self):
+        if self._credentials is None:
+            from google.oauth2 import service_account
+
+            self._credentials = service_account.Credentials.from_service_account_file(
+                self.service_account_key,
+                scopes=["https://www.googleapis.com/auth/drive.file"],
+            )
+        return self._credentials
+
+    def _drive(self):
+        if self._service is None:
+            from googleapiclient.discovery import build
+
+            self._service = build("drive", "v3", credentials=self._get_credentials(), cache_discovery=False)
+        return self._service
+
+    def _request(self, uri: str, method: str, body, headers: dict):
+        import httplib2
+        from google_auth_httplib2 import AuthorizedHttp
+
+        try:
+            return AuthorizedHttp(self._get_credentials()).request(uri, method, body=body, headers=headers)
+        except (httplib2.HttpLib2Error, OSError) as exc:
+            raise TransientUploadError(str(exc)) from exc
+
+    @staticmethod
+    def _upload_status(response, content: bytes, total: int) -> tuple[int, Optional[str]]:
+        if response.status in (200, 201):
+            return total, json.loads(content)["id"]
+        if response.status == 308:
+            # "Range: bytes=0-N" lists what Drive has persisted so far
+            committed = response.get("range")
+            return (int(committed.rsplit("-", 1)[1]) + 1 if committed else 0), None
+        if response.status in (404, 410):
+            raise UploadSessionExpired(f"Drive upload session returned {response.status}")
+        raise TransientUploadError(f"Drive upload returned {response.status}")
+
+    def start_upload(self, name: str, size: int) -> str:
+        metadata = {"name": name}
+        if self.folder_id:
+            metadata["parents"] = [self.folder_id]
+        response, _ = self._request(self.UPLOAD_URL, "POST", json.dumps(metadata), {
+            "Content-Type": "application/json; charset=UTF-8",
+            "X-Upload-Content-Type": "application/gzip",
+            "X-Upload-Content-Length": str(size),
+        })
+        if response.status != 200:
+            raise TransientUploadError(f"Starting Drive upload returned {response.status}")
+        return response["location"]
+
+    def upload_chunk(self, session: str, offset: int, data: bytes, total: int) -> tuple[int, Optional[str]]:
+        response, content = self._request(session, "PUT", data, {
+            "Content-Length": str(len(data)),
+            "Content-Range": f"bytes {offset}-{offset + len(data) - 1}/{total}",
+        })
+        return self._upload_status(response, content, total)
+
+    def committed_bytes(self, session: str, total: int) -> tuple[int, Optional[str]]:
+        response, content = self._request(session, "PUT", b"", {
+            "Content-Length": "0",
+            "Content-Range": f"bytes */{total}",
+        })
+        return self._upload_status(response, content, total)
+
+    def list_segments(self) -> list[str]:
+        query = f"name contains '{SEGMENT_PREFIX}' and trashed = false"
+        if self.folder_id:
+            query += f" and '{self.folder_id}' in parents"
+        self._file_ids = {}
+        page_token = None
+        while True:
+            page = self._drive().files().list(
+                q=query, fields="nextPageToken, files(id, name)", pageToken=page_token
+            ).execute(num_retries=settings.BACKUP_MAX_RETRIES)
+            for file in page.get("files", []):
+                if file["name"].endswith(SEGMENT_SUFFIX):
+                    self._file_ids[file["name"]] = file["id"]
+            page_token = page.get("nextPageToken")
+            if not page_token:
+                return sorted(self._file_ids)
+
+    def download(self, name: str, path: str) -> None:
+        from googleapiclient.http import MediaIoBaseDownload
+
+        if name not in self._file_ids:
+            self.list_segments()
+        request = self._drive().files().get_media(fileId=self._file_ids[name])
+        with open(path, "wb") as target:
+            downloader = MediaIoBaseDownload(target, request, chunksize=settings.BACKUP_CHUNK_SIZE_MB * 1024 * 1024)
+            done = False
+            while not done:
+                _, done = downloader.next_chunk(num_retries=settings.BACKUP_MAX_RETRIES)
+
+
+def get_backup_transport() -> BackupTransport:
+    """Return the configured backup transport."""
+    if settings.BACKUP_TRANSPORT == "local":
+        return LocalDirectoryTransport(settings.BACKUP_LOCAL_PATH)
+    if not settings.GOOGLE_SERVICE_ACCOUNT_KEY:
+        raise RuntimeError("GOOGLE_SERVICE_ACCOUNT_KEY is required for Google Drive backups")
+    return GoogleDriveTransport(settings.GOOGLE_SERVICE_ACCOUNT_KEY, settings.GOOGLE_DRIVE_FOLDER_ID)
+
+
+# Segment writing
+
+def changed_candidate_ids(db: Session, since: Optional[datetime]) -> list[int]:
+    """Ids of candidates whose profile changed after ``since`` (all candidates if ``None``).
+
+    Soft-deleted rows are included so that deletions reach the backup too.
+    """
+    if since is None:
+        query = db.query(Candidate.id).execution_options(include_deleted=True).order_by(Candidate.id)
+        return [candidate_id for (candidate_id,) in query]
+
+    def changed(model):
+        return or_(model.created_at > since, model.updated_at > since)
+
+    queries = [
+        db.query(Candidate.id).filter(changed(Candidate)),
+        db.query(InterviewRound.candidate_id).filter(changed(InterviewRound)),
+        db.query(InterviewRound.candidate_id)
+        .join(InterviewFeedback, InterviewFeedback.interview_round_id == InterviewRound.id)
+        .filter(changed(InterviewFeedback)),
+        db.query(CandidateNote.candidate_id).filter(changed(CandidateNote)),
+        db.query(CandidateBucket.candidate_id).filter(CandidateBucket.created_at > since),
+        db.query(CandidateSkill.candidate_id).filter(CandidateSkill.created_at > since),
+    ]
+    query = queries[0].union(*queries[1:]).execution_options(include_deleted=True)
+    return sorted(candidate_id for (candidate_id,) in query)
+
+
+def load_profiles(db: Session, candidate_ids: list[int]) -> list[dict]:
+    """Load full profiles for a batch of candidates with one query per table."""
+    candidates = Candidate.__table__
+    interviews = InterviewRound.__table__
+    feedback = InterviewFeedback.__table__
+    notes = CandidateNote.__table__
+
+    profiles = [
+        dict(row._mapping)
+        for row in db.query(candidates).filter(candidates.c.id.in_(candidate_ids)).order_by(candidates.c.id)
+    ]
+    bucket_ids = group_ids(db, CandidateBucket.candidate_id, CandidateBucket.bucket_id, candidate_ids)
+    skill_ids = group_ids(db, CandidateSkill.candidate_id, CandidateSkill.skill_id, candidate_ids)
+
+    interview_rows = [
+        dict(row._mapping)
+        for row in db.query(interviews)
+        .filter(interviews.c.candidate_id.in_(candidate_ids))
+        .order_by(interviews.c.candidate_id, interviews.c.round_number)
+    ]
+    feedback_by_round = {
+        row.interview_round_id: dict(row._mapping)
+        for row in db.query(feedback).filter(
+            feedback.c.interview_round_id.in_([interview["id"] for interview in interview_rows])
+        )
+    } if interview_rows else {}
+    interviews_by_candidate: dict[int, list[dict]] = {}
+    for interview in interview_rows:
+        interview["feedback"] = feedback_by_round.get(interview["id"])
+        interviews_by_candidate.setdefault(interview["candidate_id"], []).append(interview)
+
+    notes_by_candidate: dict[int, list[dict]] = {}
+    for row in db.query(notes).filter(notes.c.candidate_id.in_(candidate_ids)).order_by(notes.c.id):
+        notes_by_candidate.setdefault(row.candidate_id, []).append(dict(row._mapping))
+
+    for profile in profiles:
+        profile["bucket_ids"] = bucket_ids.get(profile["id"], [])
+        profile["skill_ids"] = skill_ids.get(profile["id"], [])
+        profile["interviews"] = interviews_by_candidate.get(profile["id"], [])
+        profile["notes"] = notes_by_candidate.get(profile["id"], [])
+    return profiles
+
+
+def _staged_path(name: str) -> str:
+    return os.path.join(settings.BACKUP_STAGING_PATH, name)
+
+
+def write_segment(db: Session, since: Optional[datetime], high_water_mark: datetime) -> Optional[BackupSegment]:
+    """Write profiles changed after ``since`` to a staged segment; ``None`` if nothing changed."""
+    candidate_ids = changed_candidate_ids(db, since)
+    if not candidate_ids:
+        return None
+
+    name = f"{SEGMENT_PREFIX}{high_water_mark:%Y%m%dT%H%M%S%f}{SEGMENT_SUFFIX}"
+    os.makedirs(settings.BACKUP_STAGING_PATH, exist_ok=True)
+    temp_path = _staged_path(name) + ".tmp"
+    with gzip.open(temp_path, "wb") as segment:
+        batch_size = settings.BACKUP_BATCH_SIZE
+        for start in range(0, len(candidate_ids), batch_size):
+            for profile in load_profiles(db, candidate_ids[start:start + batch_size]):
+                segment.write(orjson.dumps(profile, option=orjson.OPT_APPEND_NEWLINE))
+    os.replace(temp_path, _staged_path(name))
+
+    segment = BackupSegment(
+        name=name,
+        changed_since=since,
+        high_water_mark=high_water_mark,
+        profile_count=len(candidate_ids),
+        size=os.path.getsize(_staged_path(name)),
+        status="pending",
+        uploaded_bytes=0,
+    )
+    db.add(segment)
+    db.commit()
+    return segment
+
+
+# Upload
+
+def upload_segment(db: Session, transport: BackupTransport, segment: BackupSegment) -> None:
+    """Upload a staged segment in chunks, resuming where a previous attempt stopped.
+
+    Progress is committed after every chunk, so an interrupted run picks up
+    from the last acknowledged byte. Transient failures are retried with
+    exponential backoff after re-reading the committed offset.
+    """
+    chunk_size = settings.BACKUP_CHUNK_SIZE_MB * 1024 * 1024
+    offset = segment.uploaded_bytes
+    remote_id = None
+    failures = 0
+    resync = segment.upload_session is not None and offset > 0
+
+    with open(_staged_path(segment.name), "rb") as file:
+        while remote_id is None:
+            try:
+                if segment.upload_session is None:
+                    segment.upload_session = transport.start_upload(segment.name, segment.size)
+                    offset = 0
+                elif resync:
+                    offset, remote_id = transport.committed_bytes(segment.upload_session, segment.size)
+                    resync = False
+                    continue
+                file.seek(offset)
+                offset, remote_id = transport.upload_chunk(
+                    segment.upload_session, offset, file.read(chunk_size), segment.size
+                )
+            except UploadSessionExpired:
+                logger.warning("Upload session for %s expired; restarting upload", segment.name)
+                segment.upload_session = None
+                offset = 0
+            except TransientUploadError as exc:
+                failures += 1
+                if failures > settings.BACKUP_MAX_RETRIES:
+                    raise
+                logger.warning("Uploading %s failed (%s); retry %d", segment.name, exc, failures)
+                time.sleep(min(2 ** failures, 60))
+                resync = True
+                continue
+            failures = 0
+            segment.uploaded_bytes = offset
+            db.commit()
+
+    segment.status = "uploaded"
+    segment.remote_id = remote_id
+    segment.uploaded_at = datetime.utcnow()
+    segment.upload_session = None
+    db.commit()
+    os.unlink(_staged_path(segment.name))
+
+
+def run_backup(db: Session, transport: BackupTransport) -> Optional[BackupSegment]:
+    """Back up profiles changed since the last run and upload the segment.
+
+    Segments left pending by an interrupted run are uploaded first. The scan
+    starts ``BACKUP_OVERLAP_SECONDS`` before the previous high-water mark so
+    transactions that committed late are not missed; replay is idempotent, so
+    the overlap only costs a few duplicate profiles.
+    """
+    for segment in db.query(BackupSegment).filter(BackupSegment.status == "pending").order_by(BackupSegment.id):
+        if not os.path.exists(_staged_path(segment.name)):
+            logger.warning("Staged backup segment %s is missing; it will be rewritten", segment.name)
+            db.delete(segment)
+            db.commit()
+            continue
+        upload_segment(db, transport, segment)
+
+    last_mark = db.query(func.max(BackupSegment.high_water_mark)).scalar()
+    since = last_mark - timedelta(seconds=settings.BACKUP_OVERLAP_SECONDS) if last_mark else None
+    segment = write_segment(db, since, datetime.utcnow())
+    if segment is not None:
+        upload_segment(db, transport, segment)
+    return segment
+
+
+# Restore
+
+def rebuild_snapshot(transport: BackupTransport, output_path: str, include_deleted: bool = False) -> int:
+    """Replay every segment into a full gzip NDJSON snapshot; return the profile count.
+
+    Profiles are keyed by id in a temporary SQLite file, so memory use does
+    not grow with the number of candidates.
+    """
+    count = 0
+    with tempfile.TemporaryDirectory() as workdir:
+        index = sqlite3.connect(os.path.join(workdir, "profiles.db"))
+        index.execute("CREATE TABLE profiles (id INTEGER PRIMARY KEY, body BLOB NOT NULL)")
+        for name in transport.list_segments():
+            local_path = os.path.join(workdir, name)
+            transport.download(name, local_path)
+            with gzip.open(local_path, "rb") as segment:
+                index.executemany(
+                    "INSERT OR REPLACE INTO profiles (id, body) VALUES (?, ?)",
+                    ((orjson.loads(line)["id"], line) for line in segment),
+                )
+            index.commit()
+            os.unlink(local_path)
+
+        with gzip.open(output_path, "wb") as snapshot:
+            for (body,) in index.execute("SELECT body FROM profiles ORDER BY id"):
+                if not include_deleted and orjson.loads(body)["deleted_at"] is not None:
+                    continue
+                snapshot.write(body)
+                count += 1
+        index.close()
+    return count
@@ -0,0 +1,301 @@
+"""Email delivery from the outbox.
+
+``EmailDispatcher`` drains ``email_outbox`` in the background: it claims up
+to ``EMAIL_BATCH_SIZE`` due emails (``FOR UPDATE SKIP LOCKED`` on PostgreSQL,
+so several workers never claim the same row), pushes them back by
+``EMAIL_CLAIM_SECONDS`` as a lease and commits, then sends them outside any
+transaction and records the outcome with one statement per batch.
+
+Sending goes through a pluggable transport that keeps its connection open
+while there is mail to send: one SMTP session, or one pooled keep-alive HTTP
+client for SendGrid. A token bucket holds each worker to
+``EMAIL_RATE_PER_SECOND``. A failed email is retried after
+``EMAIL_RETRY_BASE_SECONDS``, doubling per attempt, and marked ``failed``
+after ``EMAIL_MAX_ATTEMPTS`` or when the destination refuses it outright.
+Delivery is at least once: an email sent by a worker that dies before
+recording it is sent again when its lease runs out.
+"""
+import asyncio
+import logging
+import smtplib
+import ssl
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from typing import Optional
+
+import httpx
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..core.rate_limit import InMemoryRateLimiter
+from ..db.base import SessionLocal
+from ..db.bulk import update_by_id
+from ..models.email_outbox import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+
+class PermanentDeliveryError(Exception):
+    """The destination refused the email; retrying will not help."""
+
+
+@dataclass(frozen=True)
+class OutgoingEmail:
+    """A claimed outbox row."""
+    id: int
+    to_address: str
+    subject: str
+    body: str
+    attempts: int
+
+
+class EmailTransport(ABC):
+    """Sends emails over a connection that is reused until ``close``."""
+
+    @abstractmethod
+    def send(self, email: OutgoingEmail) -> None:
+        """Deliver one email; raise ``PermanentDeliveryError`` if it can never succeed."""
+
+    def close(self) -> None:
+        """Release the connection; the next ``send`` opens a new one."""
+
+
+class SMTPTransport(EmailTransport):
+    """Sends over one SMTP session (also used for SES through its SMTP endpoint)."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        starttls: bool = False,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self._smtp: Optional[smtplib.SMTP] = None
+
+    def _connection(self) -> smtplib.SMTP:
+        if self._smtp is None:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=30)
+            if self.starttls:
+                smtp.starttls(context=ssl.create_default_context())
+            if self.username:
+                smtp.login(self.username, self.password or "")
+            self._smtp = smtp
+        return self._smtp
+
+    def send(self, email: OutgoingEmail) -> None:
+        message = EmailMessage()
+        message["From"] = settings.EMAIL_FROM
+        message["To"] = email.to_address
+        message["Subject"] = email.subject
+        message.set_content(email.body)
+        try:
+            try:
+                self._connection().send_message(message)
+            except smtplib.SMTPServerDisconnected:
+                # The server dropped the idle session; reconnect once
+                self._smtp = None
+                self._connection().send_message(message)
+        except smtplib.SMTPRecipientsRefused as exc:
+            codes = [code for code, _ in exc.recipients.values()]
+            if all(code >= 500 for code in codes):
+                raise PermanentDeliveryError(str(exc.recipients)) from exc
+            raise
+        except smtplib.SMTPResponseException as exc:
+            if exc.smtp_code >= 500:
+                raise PermanentDeliveryError(f"{exc.smtp_code} {exc.smtp_error!r}") from exc
+            raise
+
+    def close(self) -> None:
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+
+class SendGridTransport(EmailTransport):
+    """Sends through the SendGrid v3 API with a pooled keep-alive HTTP client."""
+
+    BASE_URL = "https://api.sendgrid.com/v3"
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+        self._client: Optional[httpx.Client] = None
+
+    def send(self, email: OutgoingEmail) -> None:
+        if self._client is None:
+            self._client = httpx.Client(
+                base_url=self.BASE_URL,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=30,
+            )
+        response = self._client.post("/mail/send", json={
+            "personalizations": [{"to": [{"email": email.to_address}]}],
+            "from": {"email": settings.EMAIL_FROM},
+            "subject": email.subject,
+            "content": [{"type": "text/plain", "value": email.body}],
+        })
+        if response.status_code == 429 or response.status_code >= 500:
+            response.raise_for_status()
+        if response.status_code >= 400:
+            raise PermanentDeliveryError(f"SendGrid returned {response.status_code}: {response.text[:500]}")
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+
+def get_email_transport() -> EmailTransport:
+    """Return the configured email transport."""
+    if settings.EMAIL_SERVICE == "smtp":
+        return SMTPTransport(
+            settings.SMTP_HOST,
+            settings.SMTP_PORT,
+            settings.SMTP_USERNAME,
+            settings.SMTP_PASSWORD,
+            settings.SMTP_STARTTLS,
+        )
+    if settings.EMAIL_SERVICE == "ses":
+        return SMTPTransport(
+            f"email-smtp.{settings.AWS_SES_REGION}.amazonaws.com",
+            587,
+            settings.SMTP_USERNAME,
+            settings.SMTP_PASSWORD,
+            starttls=True,
+        )
+    if not settings.SENDGRID_API_KEY:
+        raise RuntimeError("SENDGRID_API_KEY is required for the sendgrid email service")
+    return SendGridTransport(settings.SENDGRID_API_KEY)
+
+
+def claim_batch(db: Session, limit: int, now: Optional[datetime] = None) -> list[OutgoingEmail]:
+    """Claim up to ``limit`` due emails by moving them past the lease, and commit."""
+    now = now or datetime.utcnow()
+    query = db.query(
+        EmailOutbox.id, EmailOutbox.to_address, EmailOutbox.subject, EmailOutbox.body, EmailOutbox.attempts
+    ).filter(
+        EmailOutbox.status == "pending",
+        EmailOutbox.next_attempt_at <= now,
+    ).order_by(EmailOutbox.next_attempt_at, EmailOutbox.id).limit(limit)
+    if db.get_bind().dialect.name == "postgresql":
+        query = query.with_for_update(skip_locked=True)
+    emails = [OutgoingEmail(*row) for row in query]
+    if emails:
+        db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_([email.id for email in emails]))
+            .values(next_attempt_at=now + timedelta(seconds=settings.EMAIL_CLAIM_SECONDS))
+        )
+    db.commit()
+    return emails
+
+
+def record_results(
+    db: Session,
+    sent: list[int],
+    failed: list[tuple[OutgoingEmail, str, bool]],
+    now: Optional[datetime] = None,
+) -> None:
+    """Mark sent emails and reschedule (or give up on) failed ones, then commit.
+
+    ``failed`` holds ``(email, error, permanent)``.
+    """
+    now = now or datetime.utcnow()
+    if sent:
+        db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(sent))
+            .values(status="sent", sent_at=now, attempts=EmailOutbox.attempts + 1, last_error=None)
+        )
+    if failed:
+        attempts = [email.attempts + 1 for email, _, _ in failed]
+        update_by_id(db, EmailOutbox, [email.id for email, _, _ in failed], {
+            "attempts": attempts,
+            "status": [
+                "failed" if permanent or attempt >= settings.EMAIL_MAX_ATTEMPTS else "pending"
+                for (_, _, permanent), attempt in zip(failed, attempts)
+            ],
+            "next_attempt_at": [
+                now + timedelta(seconds=settings.EMAIL_RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+                for attempt in attempts
+            ],
+            "last_error": [error[:1000] for _, error, _ in failed],
+        })
+    db.commit()
+
+
+class EmailDispatcher:
+    """Drains the outbox through one transport, at a shaped rate."""
+
+    def __init__(self, transport: EmailTransport):
+        self.transport = transport
+        self.limiter = InMemoryRateLimiter(settings.EMAIL_RATE_BURST, settings.EMAIL_RATE_PER_SECOND)
+
+    async def _send(self, email: OutgoingEmail) -> Optional[tuple[str, bool]]:
+        """Send one email; return ``(error, permanent)`` if it failed."""
+        while wait := await self.limiter.acquire("email"):
+            await asyncio.sleep(wait)
+        try:
+            await asyncio.to_thread(self.transport.send, email)
+        except PermanentDeliveryError as exc:
+            return str(exc), True
+        except Exception as exc:
+            # The connection may be broken; start the next email on a fresh one
+            await asyncio.to_thread(self.transport.close)
+            return repr(exc), False
+        return None
+
+    async def dispatch_batch(self) -> int:
+        """Claim, send and record one batch; return the number of emails claimed."""
+        db = SessionLocal()
+        try:
+            emails = await asyncio.to_thread(claim_batch, db, settings.EMAIL_BATCH_SIZE)
+            if not emails:
+                return 0
+            sent, failed = [], []
+            for email in emails:
+                outcome = await self._send(email)
+                if outcome is None:
+                    sent.append(email.id)
+                else:
+                    failed.append((email, *outcome))
+            await asyncio.to_thread(record_results, db, sent, failed)
+        finally:
+            db.close()
+        if failed:
+            logger.warning("Email batch: %d sent, %d failed (last error: %s)", len(sent), len(failed), failed[-1][1])
+        return len(emails)
+
+    async def run(self) -> None:
+        """Dispatch batches back to back while mail is due, then poll; until cancelled."""
+        try:
+            while True:
+                try:
+                    claimed = await self.dispatch_batch()
+                except Exception:
+                    logger.exception("Email dispatch failed")
+                    claimed = 0
+                if claimed < settings.EMAIL_BATCH_SIZE:
+                    # Queue drained: do not hold the connection while idle
+                    await asyncio.to_thread(self.transport.close)
+                    await asyncio.sleep(settings.EMAIL_DISPATCH_INTERVAL)
+        finally:
+            self.transport.close()
+
+
+async def run_email_dispatcher() -> None:
+    """Deliver queued emails until cancelled (only when ``EMAIL_ENABLED``)."""
+    if not settings.EMAIL_ENABLED:
+        return
+    await EmailDispatcher(get_email_transport()).run()
@@ -0,0 +1,218 @@
+"""Resume field extraction with the language model, batched and cached.
+
+The resumes of an upload are sent ``AI_EXTRACTION_BATCH_SIZE`` to a request,
+with at most ``AI_EXTRACTION_CONCURRENCY`` requests in flight. Results are
+cached on disk under ``AI_EXTRACTION_CACHE_PATH`` by model and resume content
+hash, so re-uploading a resume costs no request. A request that fails, returns
+unusable output or exceeds ``AI_EXTRACTION_TIMEOUT`` falls back to the
+heuristic parser for its resumes; fallbacks are not cached, so they are tried
+again next time. Each call reports cache hits, requests, tokens, estimated
+cost and duration.
+
+With ``AI_EXTRACTION_ENABLED`` off, every resume goes to the heuristic parser.
+``scripts/openai_stub.py`` serves the same API locally for development.
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+import httpx
+
+from ..config import settings
+from ..core.resume_parser import EMAIL_RE, extract_text, parse_text
+
+logger = logging.getLogger(__name__)
+
+EXTRACTED_FIELDS = ("name", "email", "phone_number", "location", "years_of_experience")
+
+# Bump when the prompt or the field cleaning changes, so cached results are not reused
+PROMPT_VERSION = 1
+
+SYSTEM_PROMPT = (
+    "You extract candidate details from resumes. The user message is a JSON object whose "
+    '"resumes" list holds {"index", "text"} items. Reply with a JSON object {"resumes": [...]} '
+    'holding, for every input, {"index", "name", "email", "phone_number", "location", '
+    '"years_of_experience"}. Use null for anything the resume does not state; '
+    "years_of_experience is a whole number of years of professional experience."
+)
+
+
+@dataclass(frozen=True)
+class ExtractionItem:
+    """A stored resume to extract fields from."""
+    content_hash: str
+    path: str
+    content_type: str
+
+
+@dataclass
+class ExtractionStats:
+    """What one extraction call did and cost."""
+    resumes: int = 0
+    cached: int = 0
+    extracted: int = 0  # by the model
+    heuristic: int = 0  # by the heuristic parser (disabled, failed or timed out)
+    requests: int = 0
+    failed_requests: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+    seconds: float = 0.0
+
+
+def clean_fields(entry: dict) -> dict:
+    """Keep the known fields of a model answer, with types checked."""
+    fields = {}
+    for name in EXTRACTED_FIELDS:
+        value = entry.get(name)
+        if name == "years_of_experience":
+            value = value if isinstance(value, int) and 0 <= value <= 60 else None
+        elif isinstance(value, str) and value.strip():
+            value = value.strip()
+        else:
+            value = None
+        fields[name] = value
+    if fields["email"]:
+        match = EMAIL_RE.fullmatch(fields["email"].lower())
+        fields["email"] = match.group(0) if match else None
+    return fields
+
+
+def _read(item: ExtractionItem) -> tuple[str, dict]:
+    """Resume text for the model and the heuristic fields to fall back on."""
+    try:
+        text = extract_text(item.path, item.content_type)
+    except Exception:
+        text = ""
+    return text[:settings.AI_EXTRACTION_MAX_CHARS], parse_text(text)
+
+
+class ResumeExtractor:
+    """Batched, cached resume extraction client."""
+
+    def __init__(self, cache_root: str):
+        self.cache_root = cache_root
+
+    @property
+    def enabled(self) -> bool:
+        return settings.AI_EXTRACTION_ENABLED
+
+    def cache_path(self, content_hash: str) -> str:
+        model = re.sub(r"[^\w.-]", "_", settings.OPENAI_MODEL)
+        return os.path.join(self.cache_root, f"{model}-v{PROMPT_VERSION}", content_hash[:2], f"{content_hash}.json")
+
+    def _load(self, content_hash: str) -> Optional[dict]:
+        try:
+            with open(self.cache_path(content_hash), "rb") as file:
+                return json.loads(file.read())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _store(self, content_hash: str, fields: dict) -> None:
+        path = self.cache_path(content_hash)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(fields, file)
+        os.replace(temp_path, path)
+
+    async def extract(self, items: list[ExtractionItem]) -> tuple[list[dict], ExtractionStats]:
+        """Candidate fields for each item, in order, and the stats of the call."""
+        started = time.perf_counter()
+        stats = ExtractionStats(resumes=len(items))
+
+        # Identical resumes in one upload are extracted once
+        unique = list({item.content_hash: item for item in items}.values())
+        fields: dict[str, dict] = {}
+        missing = []
+        for item in unique:
+            cached = self._load(item.content_hash) if self.enabled else None
+            if cached is None:
+                missing.append(item)
+            else:
+                fields[item.content_hash] = cached
+        stats.cached = len(unique) - len(missing)
+
+        read = await asyncio.gather(*(asyncio.to_thread(_read, item) for item in missing))
+        fallback = {item.content_hash: heuristic for item, (_, heuristic) in zip(missing, read)}
+        if self.enabled and missing:
+            texts = [text for text, _ in read]
+            size = settings.AI_EXTRACTION_BATCH_SIZE
+            semaphore = asyncio.Semaphore(settings.AI_EXTRACTION_CONCURRENCY)
+            headers = {"Authorization": f"Bearer {settings.OPENAI_API_KEY}"} if settings.OPENAI_API_KEY else {}
+            # The wait_for around each request is the only deadline; httpx's own 5s default would cut it short
+            async with httpx.AsyncClient(
+                base_url=settings.OPENAI_BASE_URL, headers=headers, timeout=None
+            ) as client:
+                answers = await asyncio.gather(*(
+                    self._request(client, semaphore, texts[start:start + size], stats)
+                    for start in range(0, len(missing), size)
+                ))
+            for start, answer in zip(range(0, len(missing), size), answers):
+                for item, entry in zip(missing[start:start + size], answer or []):
+                    if entry is None:
+                        continue
+                    # The model wins, but a contact the heuristics found is kept if the model missed it
+                    merged = {**fallback[item.content_hash], **{k: v for k, v in entry.items() if v is not None}}
+                    self._store(item.content_hash, merged)
+                    fields[item.content_hash] = merged
+                    stats.extracted += 1
+        for item in missing:
+            if item.content_hash not in fields:
+                fields[item.content_hash] = fallback[item.content_hash]
+                stats.heuristic += 1
+
+        stats.cost_usd = round(
+            (stats.prompt_tokens * settings.OPENAI_INPUT_COST_PER_MTOK
+             + stats.completion_tokens * settings.OPENAI_OUTPUT_COST_PER_MTOK) / 1_000_000,
+            6,
+        )
+        stats.seconds = round(time.perf_counter() - started, 3)
+        logger.info("Resume extraction: %s", json.dumps(asdict(stats)))
+        return [dict(fields[item.content_hash]) for item in items], stats
+
+    async def _request(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        texts: list[str],
+        stats: ExtractionStats,
+    ) -> Optional[list[Optional[dict]]]:
+        """One model request for a batch of resume texts; ``None`` entries fall back."""
+        payload = {
+            "model": settings.OPENAI_MODEL,
+            "response_format": {"type": "json_object"},
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": json.dumps({
+                    "resumes": [{"index": index, "text": text} for index, text in enumerate(texts)],
+                })},
+            ],
+        }
+        async with semaphore:
+            stats.requests += 1
+            try:
+                response = await asyncio.wait_for(
+                    client.post("/chat/completions", json=payload),
+                    settings.AI_EXTRACTION_TIMEOUT,
+                )
+                response.raise_for_status()
+                body = response.json()
+                usage = body.get("usage") or {}
+                stats.prompt_tokens += usage.get("prompt_tokens", 0)
+                stats.completion_tokens += usage.get("completion_tokens", 0)
+                entries = json.loads(body["choices"][0]["message"]["content"])["resumes"]
+                by_index = {entry.get("index"): entry for entry in entries if isinstance(entry, dict)}
+            except (asyncio.TimeoutError, httpx.HTTPError, KeyError, IndexError, TypeError, ValueError) as exc:
+                stats.failed_requests += 1
+                logger.warning("Resume extraction request for %d resumes failed: %r", len(texts), exc)
+                return None
+        return [clean_fields(by_index[index]) if index in by_index else None for index in range(len(texts))]
+
+
+resume_extractor = ResumeExtractor(settings.AI_EXTRACTION_CACHE_PATH)
@@ -0,0 +1,238 @@
+"""Resume previews.
+
+First-page text snippets and low-resolution thumbnails are rendered lazily, the
+first time someone asks for them, in a process pool so request handlers never
+do the rendering themselves. Rendered artifacts are cached on disk under
+``PREVIEW_CACHE_PATH`` by resume content hash; the cache is bounded by
+``PREVIEW_CACHE_MAX_MB`` and evicts least recently used artifacts first.
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from typing import Optional
+
+from ..config import settings
+from ..core.resume_parser import PDF, extract_text
+from ..core.security import create_signature
+
+logger = logging.getLogger(__name__)
+
+# Artifact kind -> (file suffix, media type)
+PREVIEW_KINDS = {
+    "text": (".txt", "text/plain; charset=utf-8"),
+    "thumbnail": (".png", "image/png"),
+}
+
+# Artifacts remembered as impossible to render; forgetting one only costs a re-render
+MAX_UNAVAILABLE = 10_000
+
+
+def render_preview(
+    source_path: str,
+    content_type: str,
+    targets: dict[str, str],
+    snippet_chars: int,
+    thumbnail_width: int,
+) -> dict[str, Optional[int]]:
+    """Render a resume's preview artifacts to ``targets`` (kind -> path).
+
+    Runs in a worker process. Returns the size of each artifact written, or
+    ``None`` for kinds the file format cannot produce (thumbnails need PDF and
+    PyMuPDF).
+    """
+    sizes = {}
+
+    text = extract_text(source_path, content_type, max_chars=snippet_chars).strip()
+    sizes["text"] = _write_atomic(targets["text"], text.encode("utf-8"))
+
+    sizes["thumbnail"] = None
+    if content_type == PDF:
+        try:
+            import fitz
+        except ImportError:
+            fitz = None
+        if fitz is not None:
+            with fitz.open(source_path) as document:
+                if document.page_count:
+                    page = document[0]
+                    zoom = thumbnail_width / page.rect.width
+                    pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+                    sizes["thumbnail"] = _write_atomic(targets["thumbnail"], pixmap.tobytes("png"))
+
+    return sizes
+
+
+def _write_atomic(path: str, data: bytes) -> int:
+    """Write a file via rename so readers never see a partial artifact."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(data)
+    os.replace(temp_path, path)
+    return len(data)
+
+
+class PreviewCache:
+    """Size-bounded LRU cache of rendered preview artifacts on disk."""
+
+    def __init__(self, root: str, max_bytes: int, workers: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self._index: Optional[OrderedDict[str, int]] = None  # path -> size, oldest first
+        self._size = 0
+        self._unavailable: OrderedDict[str, None] = OrderedDict()  # LRU, bounded by MAX_UNAVAILABLE
+        self._pending: dict[str, Future] = {}
+        self._lock = threading.RLock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def path_for(self, content_hash: str, kind: str) -> str:
+        suffix, _ = PREVIEW_KINDS[kind]
+        return os.path.join(self.root, content_hash[:2], content_hash + suffix)
+
+    def _load_index(self) -> OrderedDict:
+        """Index artifacts already on disk, least recently modified first."""
+        if self._index is None:
+            entries = []
+            for directory, _, filenames in os.walk(self.root):
+                for filename in filenames:
+                    if filename.endswith(".tmp"):
+                        continue
+                    path = os.path.join(directory, filename)
+                    try:
+                        stat_result = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat_result.st_mtime, path, stat_result.st_size))
+            entries.sort()
+            self._index = OrderedDict((path, size) for _, path, size in entries)
+            self._size = sum(self._index.values())
+        return self._index
+
+    def _add(self, path: str, size: int) -> None:
+        index = self._load_index()
+        self._size += size - index.pop(path, 0)
+        index[path] = size
+
+    def _evict(self) -> None:
+        index = self._load_index()
+        while self._size > self.max_bytes and index:
+            path, size = index.popitem(last=False)
+            self._size -= size
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    def lookup(self, content_hash: str, kind: str) -> Optional[str]:
+        """Return the path of a rendered artifact and mark it recently used."""
+        path = self.path_for(content_hash, kind)
+        with self._lock:
+            index = self._load_index()
+            if path in index:
+                index.move_to_end(path)
+                return path
+            # Possibly rendered by another worker process sharing the directory
+            try:
+                size = os.stat(path).st_size
+            except FileNotFoundError:
+                return None
+            self._add(path, size)
+            self._evict()
+            return path if path in index else None
+
+    def unavailable(self, content_hash: str, kind: str) -> bool:
+        """Whether rendering already showed this artifact cannot be produced."""
+        path = self.path_for(content_hash, kind)
+        with self._lock:
+            if path not in self._unavailable:
+                return False
+            self._unavailable.move_to_end(path)
+            return True
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def generate(self, content_hash: str, source_path: str, content_type: str) -> Future:
+        """Schedule rendering of all artifacts for a resume; concurrent calls share one job."""
+        with self._lock:
+            future = self._pending.get(content_hash)
+            if future is None:
+                targets = {kind: self.path_for(content_hash, kind) for kind in PREVIEW_KINDS}
+                future = self._executor().submit(
+                    render_preview,
+                    source_path,
+                    content_type,
+                    targets,
+                    settings.PREVIEW_SNIPPET_CHARS,
+                    settings.PREVIEW_THUMBNAIL_WIDTH,
+                )
+                self._pending[content_hash] = future
+                future.add_done_callback(partial(self._finish, content_hash))
+            return future
+
+    def _finish(self, content_hash: str, future: Future) -> None:
+        """Record rendered artifacts in the index and evict down to the size bound."""
+        with self._lock:
+            self._pending.pop(content_hash, None)
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                logger.warning("Preview rendering failed for %s: %s", content_hash, future.exception())
+                return
+            for kind, size in future.result().items():
+                path = self.path_for(content_hash, kind)
+                if size is None:
+                    self._unavailable[path] = None
+                    self._unavailable.move_to_end(path)
+                    if len(self._unavailable) > MAX_UNAVAILABLE:
+                        self._unavailable.popitem(last=False)
+                else:
+                    self._add(path, size)
+            self._evict()
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+preview_cache = PreviewCache(
+    settings.PREVIEW_CACHE_PATH,
+    max_bytes=settings.PREVIEW_CACHE_MAX_MB * 1024 * 1024,
+    workers=settings.PREVIEW_WORKERS,
+)
+
+
+def preview_message(content_hash: str, expires: int) -> str:
+    """Message signed into resume preview URLs."""
+    return f"preview:{content_hash}:{expires}"
+
+
+def preview_window() -> int:
+    """Index of the current ``RESUME_URL_EXPIRE_SECONDS`` window; preview URLs change with it."""
+    return int(time.time()) // settings.RESUME_URL_EXPIRE_SECONDS
+
+
+def preview_urls(content_hash: Optional[str]) -> dict[str, Optional[str]]:
+    """Build signed preview URLs for a resume without touching the cache.
+
+    Expiry is rounded up to the end of the next ``RESUME_URL_EXPIRE_SECONDS``
+    window, so a resume keeps the same URLs (and browsers keep their cached
+    thumbnails) across list requests within a window.
+    """
+    if content_hash is None:
+        return {"resume_preview_url": None, "resume_thumbnail_url": None}
+    expires = (preview_window() + 2) * settings.RESUME_URL_EXPIRE_SECONDS
+    query = f"expires={expires}&signature={create_signature(preview_message(content_hash, expires))}"
+    base = f"/api/{settings.API_VERSION}/resumes/previews/{content_hash}"
+    return {
+        "resume_preview_url": f"{base}/text?{query}",
+        "resume_thumbnail_url": f"{base}/thumbnail?{query}",
+    }
@@ -0,0 +1,168 @@
+"""Resume storage.
+
+Resumes are stored on the local filesystem under ``RESUME_STORAGE_PATH`` by the
+SHA-256 of their content, so uploading the same file twice stores it once and
+downloads never leave the server. Google Drive is only a replication target,
+written asynchronously after upload.
+"""
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..db.base import SessionLocal
+from ..core.cache import CANDIDATES_TAG, response_cache
+from ..core.changes import record_changes
+from ..models.resume import ResumeFile
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StoredFile:
+    """Result of storing a file."""
+    content_hash: str
+    size: int
+    path: str
+    created: bool  # False when identical content was already stored
+
+
+class LocalStorageBackend:
+    """Content-addressed storage on the local filesystem."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path_for(self, content_hash: str) -> str:
+        """Return the path of a stored file (two-level fan-out keeps directories small)."""
+        return os.path.join(self.root, content_hash[:2], content_hash[2:4], content_hash)
+
+    def exists(self, content_hash: str) -> bool:
+        return os.path.exists(self.path_for(content_hash))
+
+    def temp_file(self):
+        """Open a temporary file on the storage filesystem so ``commit_temp`` can rename it."""
+        staging = os.path.join(self.root, "tmp")
+        os.makedirs(staging, exist_ok=True)
+        return tempfile.NamedTemporaryFile(dir=staging, delete=False)
+
+    def commit_temp(self, temp_path: str, content_hash: str, size: int) -> StoredFile:
+        """Move a fully written temp file to its content address, deduplicating."""
+        target = self.path_for(content_hash)
+        if os.path.exists(target):
+            os.unlink(temp_path)
+            return StoredFile(content_hash, size, target, created=False)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(temp_path, target)
+        return StoredFile(content_hash, size, target, created=True)
+
+
+class GoogleDriveReplica:
+    """Uploads stored resumes to a Google Drive folder with a service account."""
+
+    def __init__(self, service_account_key: str, folder_id: Optional[str]):
+        self.service_account_key = service_account_key
+        self.folder_id = folder_id
+        self._service = None
+
+    def _drive(self):
+        if self._service is None:
+            from google.oauth2 import service_account
+            from googleapiclient.discovery import build
+
+            credentials = service_account.Credentials.from_service_account_file(
+                self.service_account_key,
+                scopes=["https://www.googleapis.com/auth/drive.file"],
+            )
+            self._service = build("drive", "v3", credentials=credentials, cache_discovery=False)
+        return self._service
+
+    def upload(self, path: str, name: str, content_type: str) -> tuple[str, Optional[str]]:
+        """Upload a file with a resumable session; return its Drive id and web link."""
+        from googleapiclient.http import MediaFileUpload
+
+        body = {"name": name}
+        if self.folder_id:
+            body["parents"] = [self.folder_id]
+        media = MediaFileUpload(path, mimetype=content_type, resumable=True)
+        created = (
+            self._drive()
+            .files()
+            .create(body=body, media_body=media, fields="id,webViewLink")
+            .execute(num_retries=3)
+        )
+        return created["id"], created.get("webViewLink")
+
+
+storage = LocalStorageBackend(settings.RESUME_STORAGE_PATH)
+
+
+def get_drive_replica() -> Optional[GoogleDriveReplica]:
+    """Return the Drive replica if replication is enabled and configured."""
+    if not settings.GOOGLE_DRIVE_STORAGE_ENABLED or not settings.GOOGLE_SERVICE_ACCOUNT_KEY:
+        return None
+    return GoogleDriveReplica(settings.GOOGLE_SERVICE_ACCOUNT_KEY, settings.GOOGLE_DRIVE_FOLDER_ID)
+
+
+def get_or_create_resume_file(
+    db: Session,
+    stored: StoredFile,
+    content_type: str,
+    original_filename: Optional[str],
+) -> ResumeFile:
+    """Return the ``ResumeFile`` row for stored content, creating it on first upload."""
+    resume_file = db.query(ResumeFile).filter(ResumeFile.content_hash == stored.content_hash).first()
+    if resume_file:
+        return resume_file
+    resume_file = ResumeFile(
+        content_hash=stored.content_hash,
+        size=stored.size,
+        content_type=content_type,
+        original_filename=original_filename,
+    )
+    try:
+        with db.begin_nested():
+            db.add(resume_file)
+    except IntegrityError:
+        # A concurrent upload of the same content won the insert
+        resume_file = db.query(ResumeFile).filter(ResumeFile.content_hash == stored.content_hash).one()
+    return resume_file
+
+
+def replicate_to_drive(resume_file_id: int) -> None:
+    """Copy a stored resume to Google Drive if it is not there yet (run as a background task)."""
+    replica = get_drive_replica()
+    if replica is None:
+        return
+    db = SessionLocal()
+    try:
+        resume_file = db.query(ResumeFile).filter(ResumeFile.id == resume_file_id).first()
+        if not resume_file or resume_file.drive_file_id:
+            return
+        file_id, web_link = replica.upload(
+            storage.path_for(resume_file.content_hash),
+            resume_file.original_filename or resume_file.content_hash,
+            resume_file.content_type,
+        )
+        resume_file.drive_file_id = file_id
+        resume_file.drive_replicated_at = datetime.utcnow()
+        candidate_ids = []
+        if web_link:
+            for candidate in resume_file.candidates:
+                candidate.resume_url = web_link
+                candidate_ids.append(candidate.id)
+            record_changes(db, "candidate", candidate_ids)
+        db.commit()
+        if candidate_ids:
+            response_cache.invalidate(CANDIDATES_TAG)
+    except Exception:
+        logger.exception("Replicating resume file %s to Google Drive failed", resume_file_id)
+        db.rollback()
+    finally:
+        db.close()